@@ -1,92 +1,67 @@
 #!/usr/bin/env python3
-import sys
 import os
-from pathlib import Path
-from typing import Any, Dict, Tuple
-from pathlib import Path
+import sys
 
 # Ensure local lib directory is importable
-LIB_DIR = Path(__file__).resolve().parent
-if str(LIB_DIR) not in sys.path:
-    sys.path.insert(0, str(LIB_DIR))
+LIB_DIR = os.path.dirname(os.path.realpath(__file__))
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+
+# --- Lazy entry points ---
+# Importing cli/core/features/interactive pulls in argparse, pathlib, subprocess
+# and the scaffolding modules. Each path imports only what it uses so that
+# -h, --doctor and subcommands start fast (see --startup-report).
+
+def parse_args(argv):
+    from cli import parse_args as _parse_args
+
+    return _parse_args(argv)
+
+
+def collect_interactive_inputs(args):
+    from interactive import collect_interactive_inputs as _collect
+
+    return _collect(args)
+
+
+def execute(args) -> int:
+    from core import execute as _execute
+
+    return _execute(args)
+
+
+def doctor(as_json: bool = False, use_cache: bool = True) -> int:
+    from features import doctor as _doctor
 
-from cli import parse_args  # noqa: E402
-from interactive import collect_interactive_inputs  # noqa: E402
-from core import execute  # noqa: E402
-from features import doctor  # noqa: E402
+    return _doctor(as_json=as_json, use_cache=use_cache)
 
 
 # --- Profile loading utilities ---
 
-def _load_profile(from_file: str | None) -> Tuple[str | None, Dict[str, Any]]:
+def _load_profile(from_file: str | None, preset: str | None = None) -> tuple[str | None, dict | None]:
     """Load a preferences profile from a provided path or default XDG locations.
-    Supports TOML (.toml) and JSON (.json). Returns (path, data) or (None, {}).
+    Supports TOML (.toml) and JSON (.json). Returns (path, data) or (None, {});
+    data is None when the requested preset does not exist. Lookups and parsed
+    profiles are cached (see profiles.py).
     """
-    candidates: list[Path] = []
-    if from_file:
-        candidates.append(Path(from_file).expanduser())
-    else:
-        xdg = os.environ.get("XDG_CONFIG_HOME")
-        if xdg:
-            candidates.append(Path(xdg) / "aur-init" / "config.toml")
-            candidates.append(Path(xdg) / "aur-init" / "config.json")
-        home = Path.home() / ".config" / "aur-init"
-        candidates.append(home / "config.toml")
-        candidates.append(home / "config.json")
-
-    for p in candidates:
-        try:
-            if p.is_file():
-                if p.suffix.lower() == ".toml":
-                    try:
-                        import tomllib  # Python 3.11+
-                    except Exception:
-                        print(f"Warning: cannot read TOML without tomllib: {p}", file=sys.stderr)
-                        return (None, {})
-                    with p.open("rb") as f:
-                        data = tomllib.load(f)
-                    return (str(p), data)
-                elif p.suffix.lower() == ".json":
-                    import json
-
-                    with p.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    return (str(p), data)
-        except Exception as e:
-            print(f"Warning: failed to load profile {p}: {e}", file=sys.stderr)
-            return (None, {})
-    return (None, {})
-
-
-def _apply_profile_defaults(args: Any, profile: Dict[str, Any]) -> None:
+    from profiles import load, select
+
+    path, settings = load(from_file)
+    return path, select(settings, preset, path or "profile")
+
+
+def _apply_profile_defaults(args, profile: dict) -> None:
     """Apply profile values to args only when args currently hold parser defaults.
     This preserves CLI overrides. Also attach derived fields like url_base.
     """
-    # Known parser defaults (must match lib/cli.py)
-    defaults: Dict[str, Any] = {
-        "type": "",
-        "maintainer": "vince <you@example.com>",
-        "description": "TODO: describe your package",
-        "url": None,
-        "license": "MIT",
-        "vcs": "",
-        "vcs_url": "",
-        "git_init": False,
-        "gen_srcinfo": False,
-        "add_ci": False,
-        "with_tests": False,
-        "with_man": False,
-        "with_completions": False,
-        "rust_lock": False,
-        "dry_run": False,
-        "strict": True,
-        "explain": False,
-        "doctor": False,
-        "force": False,
-    }
+    from cli import parser_defaults
+
+    # Parser defaults, minus options that only make sense on the command line
+    defaults = {k: v for k, v in parser_defaults().items() if k not in ("from_file", "preset", "startup_report")}
 
     # Simple copy helper: set only if current equals default
-    def set_if_default(attr: str, value: Any):
+    def set_if_default(attr: str, value):
         if not hasattr(args, attr):
             return
         current = getattr(args, attr)
@@ -103,21 +78,159 @@ def _apply_profile_defaults(args: Any, profile: Dict[str, Any]) -> None:
             continue
         set_if_default(key, val)
 
-    # Nested rust options
+    # Nested rust options, for types that build with cargo
     rust_section = profile.get("rust")
-    if isinstance(rust_section, dict) and hasattr(args, "type") and args.type == "rust":
-        if "rust_lock" in rust_section:
-            set_if_default("rust_lock", bool(rust_section["rust_lock"]))
+    if isinstance(rust_section, dict) and "rust_lock" in rust_section and _lockfile(getattr(args, "type", "")) == "cargo":
+        set_if_default("rust_lock", bool(rust_section["rust_lock"]))
+
+
+def _lockfile(type_name: str) -> str:
+    from typedefs import get_type
+
+    try:
+        return get_type(type_name).lockfile
+    except KeyError:
+        return ""
+
+
+def _run_batch(argv) -> int:
+    from cli import parse_batch_args
+    from batch import load_specs, run_batch
+    from pathlib import Path
+
+    opts = parse_batch_args(argv)
+    try:
+        specs = load_specs(Path(opts.manifest))
+    except (OSError, ValueError) as e:
+        print(f"Failed to read manifest: {e}", file=sys.stderr)
+        return 2
+    # Parser defaults plus profile values form the base every spec overrides
+    base = parse_args(["_"])
+    _, profile = _load_profile(opts.from_file, opts.preset)
+    if profile is None:
+        return 2
+    if profile:
+        _apply_profile_defaults(base, profile)
+    return run_batch(specs, base, jobs=opts.jobs, output_dir=opts.output_dir)
+
+
+def _run_updpkgsums(argv) -> int:
+    from cli import parse_updpkgsums_args
+    from checksums import DigestCache, default_cache_path, update_pkgbuild_sums
+    from pathlib import Path
+
+    opts = parse_updpkgsums_args(argv)
+    cache = DigestCache(default_cache_path() if opts.use_cache else None)
+    rc = 0
+    for d in opts.dirs:
+        root = Path(d)
+        if not (root / "PKGBUILD").is_file():
+            print(f"No PKGBUILD in {root}", file=sys.stderr)
+            rc = 1
+            continue
+        changed = update_pkgbuild_sums(root, jobs=opts.jobs or None, cache=cache)
+        print(f"{'updated' if changed else 'unchanged'} {root / 'PKGBUILD'}")
+    cache.save()
+    return rc
+
+
+def _run_srcinfo(argv) -> int:
+    from cli import parse_srcinfo_args
+    from srcinfo import find_package_dirs, regenerate_tree
+    from pathlib import Path
+
+    opts = parse_srcinfo_args(argv)
+    dirs = [Path(d) for d in opts.dirs]
+    if opts.all_root:
+        dirs += find_package_dirs(Path(opts.all_root))
+    elif not dirs:
+        dirs = [Path(".")]
+    missing = [d for d in dirs if not (d / "PKGBUILD").is_file()]
+    for d in missing:
+        print(f"No PKGBUILD in {d}", file=sys.stderr)
+    if missing:
+        return 1
+    return regenerate_tree(dirs, jobs=opts.jobs or None, check=opts.check, use_cache=opts.use_cache)
+
+
+def _run_lint(argv) -> int:
+    from cli import parse_lint_args
+    from lint import lint_tree, report
+    from srcinfo import find_package_dirs
+    from pathlib import Path
+
+    opts = parse_lint_args(argv)
+    dirs = []
+    for d in opts.dirs:
+        found = find_package_dirs(Path(d))
+        if not found:
+            print(f"No PKGBUILD in {d}", file=sys.stderr)
+            return 2
+        dirs += found
+    return report(lint_tree(dirs, jobs=opts.jobs, type_name=opts.type_name), len(dirs), as_json=opts.json)
+
+
+def _run_serve(argv) -> int:
+    from cli import parse_serve_args
+    from daemon import serve
+
+    opts = parse_serve_args(argv)
+    return serve(opts.socket)
+
+
+def _run_bench(argv) -> int:
+    from cli import parse_bench_args
+    from bench import bench_main
+
+    return bench_main(parse_bench_args(argv))
+
+
+def _run_completions(argv) -> int:
+    from cli import parse_completions_args
+    from completions import generate
+
+    opts = parse_completions_args(argv)
+    sys.stdout.write(generate(opts.shell))
+    return 0
+
+
+# Subcommands (use `aur-init -- NAME` to scaffold a package with that name)
+SUBCOMMANDS = {
+    "batch": _run_batch,
+    "updpkgsums": _run_updpkgsums,
+    "srcinfo": _run_srcinfo,
+    "lint": _run_lint,
+    "serve": _run_serve,
+    "bench": _run_bench,
+    "completions": _run_completions,
+}
 
 
 def main(argv):
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    if "--startup-report" in argv:
+        from startup import startup_report
+
+        return startup_report([a for a in argv if a != "--startup-report"])
     args = parse_args(argv)
     # Load preferences profile (from flag or default paths) and merge into args
-    profile_path, profile = _load_profile(getattr(args, "from_file", None))
+    profile_path, profile = _load_profile(getattr(args, "from_file", None), getattr(args, "preset", None))
+    if profile is None:
+        return 2
     if profile:
         _apply_profile_defaults(args, profile)
+    return run(args, profile_path)
+
+
+def _run_doctor(args) -> int:
+    return doctor(as_json=getattr(args, "json", False), use_cache=not getattr(args, "no_cache", False))
+
+
+def run(args, profile_path: str | None = None) -> int:
+    """Run doctor, the interactive form or a scaffold for parsed, profile-merged args."""
     if getattr(args, "doctor", False):
-        return doctor()
+        return _run_doctor(args)
     # Interactive mode handling and required-field validation
     try:
         if getattr(args, "interactive", False):
@@ -127,7 +240,7 @@ def main(argv):
             args = collect_interactive_inputs(args)
             # If user chose doctor interactively, run it now
             if getattr(args, "doctor", False):
-                return doctor()
+                return _run_doctor(args)
         elif not args.pkgname:
             print("pkgname is required. Provide it positionally or use --interactive.", file=sys.stderr)
             return 2
@@ -157,6 +270,8 @@ def main(argv):
                 parts.append("rust-lock")
             if getattr(args, "force", False):
                 parts.append("force")
+            if getattr(args, "update", False):
+                parts.append("update")
             # Policy flags
             parts.append("strict" if getattr(args, "strict", True) else "no-strict")
             print("[aur-init] " + " ".join(parts), file=sys.stderr)
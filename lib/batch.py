@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+# Flags that only make sense for a single interactive/CLI invocation
+NON_BATCH_KEYS = {"interactive", "doctor", "from_file", "output_tar"}
+
+# Per-worker state, set once by _init_worker
+_BASE: Dict[str, Any] = {}
+
+
+def load_specs(path: Path) -> List[Dict[str, Any]]:
+    """Read package specs from a TOML or JSON Lines manifest.
+
+    TOML manifests hold an optional ``[defaults]`` table and one ``[[package]]``
+    table per package; defaults are merged under each package. JSONL manifests
+    hold one JSON object per line.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".toml":
+        import tomllib
+
+        with path.open("rb") as f:
+            data = tomllib.load(f)
+        defaults = data.get("defaults", {})
+        packages = data.get("package", [])
+        if not isinstance(defaults, dict) or not isinstance(packages, list):
+            raise ValueError(f"{path}: expected a [defaults] table and [[package]] tables")
+        return [{**defaults, **pkg} for pkg in packages]
+    if suffix in (".jsonl", ".ndjson"):
+        import json
+
+        specs: List[Dict[str, Any]] = []
+        with path.open("r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{lineno}: {e}") from None
+                if not isinstance(obj, dict):
+                    raise ValueError(f"{path}:{lineno}: expected a JSON object")
+                specs.append(obj)
+        return specs
+    raise ValueError(f"Unsupported manifest format: {path} (use .toml or .jsonl)")
+
+
+def _init_worker(base: Dict[str, Any], output_dir: str):
+    global _BASE
+    _BASE = base
+    os.chdir(output_dir)
+
+
+def _run_one(spec: Dict[str, Any]) -> Tuple[str, int, str]:
+    """Scaffold one package and return (pkgname, rc, captured stderr)."""
+    from core import execute
+
+    pkgname = str(spec.get("pkgname") or "")
+    if not pkgname:
+        return ("<unnamed>", 2, "spec has no pkgname\n")
+    unknown = sorted(k for k in spec if k not in _BASE or k in NON_BATCH_KEYS)
+    if unknown:
+        return (pkgname, 2, f"unknown key(s) in spec: {', '.join(unknown)}\n")
+    args = SimpleNamespace(**{**_BASE, **spec})
+    out = io.StringIO()
+    err = io.StringIO()
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            rc = execute(args)
+    except Exception as e:
+        err.write(f"{type(e).__name__}: {e}\n")
+        rc = 1
+    return (pkgname, rc, err.getvalue())
+
+
+def run_batch(specs: List[Dict[str, Any]], base_args: Any, jobs: int = 0, output_dir: str = ".") -> int:
+    """Run core.execute for every spec in a process pool and report per package.
+
+    Returns 0 when every package was scaffolded, 1 if any of them failed.
+    """
+    base = {k: v for k, v in vars(base_args).items() if k != "pkgname"}
+    base["pkgname"] = ""
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, max(len(specs), 1))
+    output_dir = str(Path(output_dir).resolve())
+
+    start = time.perf_counter()
+    failed = 0
+    if jobs == 1:
+        cwd = os.getcwd()
+        try:
+            _init_worker(base, output_dir)
+            results = map(_run_one, specs)
+            failed = _report(results)
+        finally:
+            os.chdir(cwd)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(base, output_dir)) as pool:
+            failed = _report(pool.map(_run_one, specs, chunksize=max(1, len(specs) // (jobs * 4))))
+    elapsed = time.perf_counter() - start
+    print(
+        f"[aur-init] batch: {len(specs) - failed} ok, {failed} failed in {elapsed:.2f}s (jobs={jobs})",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def _report(results) -> int:
+    failed = 0
+    for pkgname, rc, err in results:
+        if rc == 0:
+            print(f"ok   {pkgname}")
+            continue
+        failed += 1
+        print(f"FAIL {pkgname} (rc={rc})")
+        for line in err.strip().splitlines():
+            print(f"     {line}")
+    return failed
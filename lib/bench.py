@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+import fnmatch
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parent
+# The bash wrapper, present in a source checkout (not in the zipapp)
+WRAPPER = LIB_DIR.parent / "aur-init"
+
+TYPES = ["", "python", "node", "go", "cmake", "rust"]
+VCS = ["", "git"]
+
+# A benchmark is slower than baseline when current/baseline - 1 exceeds this
+DEFAULT_THRESHOLD = 0.25
+
+
+def _quiet():
+    """Context manager silencing stdout/stderr of the measured code."""
+    from contextlib import ExitStack
+
+    stack = ExitStack()
+    stack.enter_context(redirect_stdout(io.StringIO()))
+    stack.enter_context(redirect_stderr(io.StringIO()))
+    return stack
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """Time fn like timeit.autorange: grow the loop until it takes min_time, then repeat.
+
+    Returns per-call best/median in microseconds and the loop size used.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    samples.sort()
+    return {
+        "best_us": round(samples[0] * 1e6, 3),
+        "median_us": round(samples[len(samples) // 2] * 1e6, 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _exec_args(**kw):
+    from cli import parse_args
+
+    args = parse_args(["bench-pkg"])
+    for k, v in kw.items():
+        setattr(args, k, v)
+    return args
+
+
+# --- Benchmark definitions: name -> factory returning the callable to time ---
+
+def _bench_render_template():
+    from render import find_templates_dir, render_template, build_block, package_block, pkgver_block, check_block
+
+    tmpl = find_templates_dir() / "common/PKGBUILD.tmpl"
+    values = {
+        "MAINTAINER": "A <a@example.com>",
+        "PKGNAME": "bench-pkg",
+        "PKGVER": "0.3.0",
+        "PKGDESC": "bench",
+        "ARCH_LINE": "arch=('x86_64')",
+        "PKGURL": "https://example.com/bench-pkg",
+        "PKGLICENSE": "MIT",
+        "DEPENDS_LINE": "",
+        "MAKEDEPENDS_LINE": "makedepends=('go')",
+        "SOURCE_AND_SHA": "source=('main.go')\nsha256sums=('SKIP')",
+        "BUILD_BLOCK": build_block("go", False),
+        "CHECK_BLOCK": check_block(True),
+        "PACKAGE_BLOCK": package_block("go", False),
+        "PKGVER_BLOCK": pkgver_block(False),
+    }
+    return lambda: render_template(tmpl, values)
+
+
+def _bench_blocks(name):
+    import render
+
+    fn = getattr(render, name)
+
+    def run():
+        for t in TYPES:
+            fn(t, False)
+            fn(t, True)
+
+    return run
+
+
+def _bench_compute_source_and_sha():
+    from render import compute_source_and_sha
+
+    return lambda: compute_source_and_sha(["bin/p", "src/p/main.py", "scripts/tests/test.sh"], "git", "https://x.git", "p")
+
+
+def _bench_execute(t, vcs):
+    from core import execute
+
+    workdir = tempfile.mkdtemp(prefix="aur-init-bench-")
+    args = _exec_args(
+        type=t, vcs=vcs, vcs_url="https://example.com/x.git" if vcs else "", force=True, gen_srcinfo=True
+    )
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            with _quiet():
+                rc = execute(args)
+        finally:
+            os.chdir(cwd)
+        if rc != 0:
+            raise RuntimeError(f"execute failed for type={t!r} vcs={vcs!r}")
+
+    run.cleanup = workdir
+    return run
+
+
+def _bench_cold_start(argv):
+    from startup import ENTRY
+
+    cmd = [sys.executable, ENTRY, *argv]
+    workdir = tempfile.mkdtemp(prefix="aur-init-bench-")
+
+    def run():
+        subprocess.run(cmd, cwd=workdir, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    run.cleanup = workdir
+    return run
+
+
+def _bench_launcher(kind: str, argv):
+    """Cold start through the bash wrapper or a freshly built zipapp, daemon forwarding off."""
+    workdir = tempfile.mkdtemp(prefix="aur-init-bench-")
+    if kind == "wrapper":
+        cmd = [str(WRAPPER), *argv]
+    else:
+        from zipbuild import build_zipapp
+
+        pyz = Path(workdir) / "dist" / "aur-init.pyz"
+        build_zipapp(pyz, interpreter=sys.executable)
+        (pyz.parent / "templates").symlink_to(LIB_DIR.parent / "templates")
+        cmd = [str(pyz), *argv]
+    # Both run this interpreter: the wrapper's python3 comes first on PATH
+    env = dict(os.environ, AUR_INIT_NO_DAEMON="1",
+               PATH=os.pathsep.join([os.path.dirname(sys.executable), os.environ.get("PATH", "")]))
+
+    def run():
+        subprocess.run(cmd, cwd=workdir, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    run.cleanup = workdir
+    return run
+
+
+def _bench_batch(n=50):
+    """Whole batch run; reported per package."""
+    from batch import run_batch
+
+    workdir = tempfile.mkdtemp(prefix="aur-init-bench-")
+    specs = [{"pkgname": f"b{i}", "type": TYPES[i % len(TYPES)]} for i in range(n)]
+    base = _exec_args(force=True)
+
+    def run():
+        with _quiet():
+            run_batch(specs, base, jobs=0, output_dir=workdir)
+
+    run.cleanup = workdir
+    run.per = n
+    return run
+
+
+def benchmarks() -> dict:
+    """Ordered mapping of benchmark name -> factory."""
+    table = {
+        "render.render_template": _bench_render_template,
+        "render.build_block": lambda: _bench_blocks("build_block"),
+        "render.package_block": lambda: _bench_blocks("package_block"),
+        "render.compute_source_and_sha": _bench_compute_source_and_sha,
+    }
+    for t in TYPES:
+        for vcs in VCS:
+            table[f"core.execute[{t or 'generic'},{vcs or 'novcs'}]"] = (lambda t=t, vcs=vcs: _bench_execute(t, vcs))
+    table["startup.cold[-h]"] = lambda: _bench_cold_start(["-h"])
+    table["startup.cold[--dry-run]"] = lambda: _bench_cold_start(["--dry-run", "bench-pkg"])
+    if WRAPPER.is_file():
+        # Installed launchers: the bash wrapper against the precompiled zipapp
+        for kind in ("wrapper", "zipapp"):
+            table[f"startup.{kind}[-h]"] = (lambda kind=kind: _bench_launcher(kind, ["-h"]))
+            table[f"startup.{kind}[--dry-run]"] = (lambda kind=kind: _bench_launcher(kind, ["--dry-run", "bench-pkg"]))
+    table["batch.throughput[per-package]"] = _bench_batch
+    return table
+
+
+def run_benchmarks(pattern: str = "*", quick: bool = False) -> dict:
+    import shutil
+
+    results = {}
+    # Keep the user's caches out of the runs (update bases, type snapshots,
+    # profile lookups), and the user's warm caches out of the timings
+    cache = tempfile.mkdtemp(prefix="aur-init-bench-cache-")
+    saved = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = cache
+    try:
+        for name, factory in benchmarks().items():
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            fn = factory()
+            try:
+                res = measure(fn, repeat=3 if quick else 5, min_time=0.02 if quick else 0.2)
+            finally:
+                if getattr(fn, "cleanup", None):
+                    shutil.rmtree(fn.cleanup, ignore_errors=True)
+            per = getattr(fn, "per", 1)
+            if per != 1:
+                res["best_us"] = round(res["best_us"] / per, 3)
+                res["median_us"] = round(res["median_us"] / per, 3)
+            results[name] = res
+            print(f"  {res['best_us']:12.1f} us  {name}", file=sys.stderr)
+    finally:
+        if saved is None:
+            os.environ.pop("XDG_CACHE_HOME", None)
+        else:
+            os.environ["XDG_CACHE_HOME"] = saved
+        shutil.rmtree(cache, ignore_errors=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[str, float, float, float]]:
+    """Return (name, baseline_us, current_us, ratio) for every regression beyond threshold."""
+    regressions = []
+    base = baseline.get("results", {})
+    for name, res in current.get("results", {}).items():
+        if name not in base:
+            continue
+        b = base[name]["best_us"]
+        c = res["best_us"]
+        ratio = c / b if b else float("inf")
+        if ratio - 1 > threshold:
+            regressions.append((name, b, c, ratio))
+    return regressions
+
+
+def bench_main(opts) -> int:
+    results = run_benchmarks(opts.filter, quick=opts.quick)
+    text = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if opts.output == "-":
+        sys.stdout.write(text)
+    elif opts.output:
+        Path(opts.output).write_text(text)
+    if opts.save_baseline:
+        Path(opts.save_baseline).write_text(text)
+        print(f"Saved baseline to {opts.save_baseline}", file=sys.stderr)
+    if not opts.baseline:
+        return 0
+    try:
+        baseline = json.loads(Path(opts.baseline).read_text())
+    except (OSError, ValueError) as e:
+        print(f"Cannot read baseline {opts.baseline}: {e}", file=sys.stderr)
+        return 2
+    base = baseline.get("results", {})
+    print(f"\nComparison against {opts.baseline} (threshold +{opts.threshold:.0%}):", file=sys.stderr)
+    for name, res in results["results"].items():
+        if name in base:
+            ratio = res["best_us"] / base[name]["best_us"] if base[name]["best_us"] else float("inf")
+            print(f"  {ratio:6.2f}x  {name}", file=sys.stderr)
+    regressions = compare(results, baseline, opts.threshold)
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} benchmark(s) slower than baseline:", file=sys.stderr)
+        for name, b, c, ratio in regressions:
+            print(f"  {name}: {b:.1f} us -> {c:.1f} us ({ratio:.2f}x)", file=sys.stderr)
+        return 1
+    return 0
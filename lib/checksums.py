@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from pkgbuild import parse_pkgbuild, replace_array, is_local_source, is_vcs_source, local_source_path
+
+# Files at least this large are hashed through mmap instead of buffered reads
+MMAP_THRESHOLD = 1 << 20
+READ_CHUNK = 1 << 20
+
+
+def sha256_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        h = hashlib.sha256()
+        if size >= MMAP_THRESHOLD:
+            import mmap
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                h.update(chunk)
+    return h.hexdigest()
+
+
+class DigestCache:
+    """(path, size, mtime_ns, inode) -> sha256 digest, optionally persisted as JSON."""
+
+    def __init__(self, store: Path | None = None):
+        self.store = store
+        self.entries: dict[str, list] = {}
+        self.dirty = False
+        if store is not None:
+            try:
+                with store.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.entries = data
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def _key(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def get(self, path: Path, st: os.stat_result) -> str | None:
+        hit = self.entries.get(str(path))
+        if hit is not None and hit[:3] == self._key(st):
+            return hit[3]
+        return None
+
+    def put(self, path: Path, st: os.stat_result, digest: str):
+        self.entries[str(path)] = self._key(st) + [digest]
+        self.dirty = True
+
+    def save(self):
+        if self.store is None or not self.dirty:
+            return
+        try:
+            self.store.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.store.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.store)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: cannot write checksum cache {self.store}: {e}", file=sys.stderr)
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "aur-init" / "sha256.json"
+
+
+# Process-wide in-memory cache used when no persistent cache is given
+_MEMORY_CACHE = DigestCache()
+
+
+def hash_files(paths, jobs: int | None = None, cache: DigestCache | None = None) -> dict[Path, str | None]:
+    """Hash files concurrently; missing files map to None.
+
+    Files whose (path, size, mtime_ns, inode) match the cache are not re-read.
+    """
+    cache = cache if cache is not None else _MEMORY_CACHE
+    result: dict[Path, str | None] = {}
+    todo: list[tuple[Path, os.stat_result]] = []
+    for p in paths:
+        p = Path(p).resolve()
+        try:
+            st = p.stat()
+        except OSError:
+            result[p] = None
+            continue
+        digest = cache.get(p, st)
+        if digest is None:
+            todo.append((p, st))
+        result[p] = digest
+    if len(todo) == 1:
+        p, st = todo[0]
+        result[p] = sha256_file(p)
+        cache.put(p, st, result[p])
+    elif todo:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # hashlib releases the GIL on large buffers, so threads scale here
+        with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as pool:
+            for (p, st), digest in zip(todo, pool.map(lambda item: sha256_file(item[0]), todo)):
+                result[p] = digest
+                cache.put(p, st, digest)
+    return result
+
+
+def local_sums(root: Path, sources, jobs: int | None = None, cache: DigestCache | None = None) -> list[str]:
+    """sha256sums entries for sources: digests for local files, 'SKIP' otherwise."""
+    local = [root / local_source_path(s) for s in sources if is_local_source(s)]
+    digests = hash_files(local, jobs=jobs, cache=cache)
+    sums = []
+    for s in sources:
+        digest = digests.get((root / local_source_path(s)).resolve()) if is_local_source(s) else None
+        sums.append(digest or "SKIP")
+    return sums
+
+
+def update_pkgbuild_sums(root: Path, jobs: int | None = None, cache: DigestCache | None = None) -> bool:
+    """Rewrite sha256sums in root/PKGBUILD for its local sources. Returns True if changed.
+
+    VCS entries stay 'SKIP'; remote URLs keep their existing checksum (or 'SKIP').
+    """
+    pkgbuild = root / "PKGBUILD"
+    text = pkgbuild.read_text()
+    fields = parse_pkgbuild(text)
+    sources = fields.get("source") or []
+    old = fields.get("sha256sums") or []
+    new = local_sums(root, sources, jobs=jobs, cache=cache)
+    for i, s in enumerate(sources):
+        if is_local_source(s):
+            if new[i] == "SKIP":
+                print(f"Warning: {pkgbuild}: local source not found: {s}", file=sys.stderr)
+        elif not is_vcs_source(s) and len(old) == len(sources):
+            # Plain remote URL: keep whatever checksum was recorded
+            new[i] = old[i]
+    if new == old:
+        return False
+    pkgbuild.write_text(replace_array(text, "sha256sums", new))
+    return True
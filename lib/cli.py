@@ -1,9 +1,27 @@
 #!/usr/bin/env python3
 import argparse
 
+from typedefs import TypeChoices
+
 def parse_args(argv):
     if not argv:
         argv = ["-h"]
+    return _build_parser().parse_args(argv)
+
+
+_DEFAULTS: dict | None = None
+
+
+def parser_defaults() -> dict:
+    """Default value of every main-parser option (dest -> default)."""
+    global _DEFAULTS
+    if _DEFAULTS is None:
+        _DEFAULTS = vars(_build_parser().parse_args(["_"]))
+        del _DEFAULTS["pkgname"]
+    return _DEFAULTS
+
+
+def _build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(
         prog="aur-init",
         description=(
@@ -25,7 +43,7 @@ def parse_args(argv):
 
     # Project metadata
     meta = ap.add_argument_group("Project metadata")
-    meta.add_argument("-t", "--type", dest="type", choices=["", "python", "node", "go", "cmake", "rust"], default="", help="Template type")
+    meta.add_argument("-t", "--type", dest="type", choices=TypeChoices(), default="", help="Template type (templates/types/*.toml)")
     meta.add_argument("-m", "--maintainer", default="vince <you@example.com>", help="Maintainer identity")
     meta.add_argument("-d", "--description", default="TODO: describe your package", help="Short package description")
     meta.add_argument("-u", "--url", default=None, help="Upstream project URL")
@@ -35,11 +53,15 @@ def parse_args(argv):
     vcs = ap.add_argument_group("Source/VCS")
     vcs.add_argument("--vcs", choices=["", "git"], default="", help="Use a VCS package style (e.g., -git)")
     vcs.add_argument("--vcs-url", dest="vcs_url", default="", metavar="URL", help="Repository URL when --vcs is set")
+    vcs.add_argument("--vcs-mirror", dest="vcs_mirror", action="store_true", help="With --vcs, fetch --vcs-url into a local bare mirror cache and use its real version as pkgver")
+    vcs.add_argument("--source-url", dest="source_url", action="append", default=None, metavar="URL", help="Add a remote source (e.g. a release tarball); it is downloaded once into a cache to fill in sha256sums (repeatable)")
+    vcs.add_argument("--source-cache-size", dest="source_cache_size", default="1G", metavar="SIZE", help="Size cap of the --source-url download cache; least recently used files are evicted (default: %(default)s)")
     vcs.add_argument("--git-init", action="store_true", help="Initialize a git repo in the scaffolded project")
 
     # Features
     feats = ap.add_argument_group("Features")
-    feats.add_argument("--srcinfo", dest="gen_srcinfo", action="store_true", help="Generate .SRCINFO via makepkg --printsrcinfo")
+    feats.add_argument("--srcinfo", dest="gen_srcinfo", action="store_true", help="Generate .SRCINFO (rendered in-process; makepkg not required)")
+    feats.add_argument("--verify-srcinfo", dest="verify_srcinfo", action="store_true", help="With --srcinfo, fail if the output differs from makepkg --printsrcinfo")
     feats.add_argument("--ci", dest="add_ci", action="store_true", help="Add GitHub Actions workflow (.SRCINFO + namcap)")
     feats.add_argument("--tests", dest="with_tests", action="store_true", help="Include minimal test scaffolding and check()")
     feats.add_argument("--with-man", dest="with_man", action="store_true", help="Scaffold a minimal man page (man/$pkgname.1)")
@@ -49,17 +71,173 @@ def parse_args(argv):
     # Modes & UX
     ux = ap.add_argument_group("Modes & UX")
     ux.add_argument("--dry-run", dest="dry_run", action="store_true", help="Do not write; print PKGBUILD and optionally .SRCINFO")
+    ux.add_argument("--output-tar", dest="output_tar", default=None, metavar="FILE", help="Write the project as a tar archive (pkgname/...) to FILE instead of a directory; '-' for stdout, .gz/.xz/.bz2 compress")
     ux.add_argument("--strict", dest="strict", action="store_true", default=True, help="Enable strict validations (fail on missing metadata)")
     ux.add_argument("--no-strict", dest="strict", action="store_false", help="Relax validations (allow some defaults)")
     ux.add_argument("--explain", dest="explain", action="store_true", help="Print short hints for PKGBUILD fields with ArchWiki links")
-    ux.add_argument("--doctor", dest="doctor", action="store_true", help="Check local prerequisites: makepkg, fakeroot, git, namcap")
+    ux.add_argument("--doctor", dest="doctor", action="store_true", help="Check local prerequisites: makepkg, fakeroot, git, namcap and toolchain versions")
+    ux.add_argument("--json", action="store_true", help="With --doctor, print the report as JSON")
+    ux.add_argument("--no-cache", dest="no_cache", action="store_true", help="With --doctor, re-probe every tool instead of using cached results")
     ux.add_argument("-f", "--force", action="store_true", help="Overwrite an existing non-empty target directory")
+    ux.add_argument("--update", action="store_true", help="Regenerate an existing project, rewriting only files whose content changed (local edits are merged)")
     ux.add_argument("-i", "--interactive", action="store_true", help="Run an interactive form to choose options")
+    ux.add_argument("--startup-report", dest="startup_report", action="store_true", help="Run the rest of the command in a fresh interpreter and print per-module import cost")
+    ux.add_argument("--timings", action="store_true", help="Print a per-phase timing and counter report to stderr")
+    ux.add_argument("--trace", default=None, metavar="FILE", help="Write a Chrome trace (Perfetto / chrome://tracing) of the run to FILE")
 
     # Profiles & Config
     prof = ap.add_argument_group("Profiles & Config")
     prof.add_argument("--from-file", dest="from_file", default=None, metavar="PATH", help="Load default preferences from a TOML/JSON file")
+    prof.add_argument("--preset", default=None, metavar="NAME", help="Use the named [presets.NAME] table of the profile (presets may inherit = another)")
+
+    return ap
+
+
+def parse_batch_args(argv):
+    return _build_batch_parser().parse_args(argv)
+
+
+def _build_batch_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init batch",
+        description="Scaffold many packages from a manifest (TOML or JSON Lines) in a worker pool.",
+        epilog=(
+            "Manifest formats:\n"
+            "  TOML:  optional [defaults] table plus one [[package]] table per package\n"
+            "  JSONL: one JSON object per line (blank lines and '#' comments are ignored)\n"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("manifest", metavar="SPECS", help="Path to specs.toml or specs.jsonl")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N", help="Worker processes (default: CPU count)")
+    ap.add_argument("-C", "--output-dir", dest="output_dir", default=".", metavar="DIR", help="Directory to scaffold packages into")
+    ap.add_argument("--from-file", dest="from_file", default=None, metavar="PATH", help="Load default preferences from a TOML/JSON file")
+    ap.add_argument("--preset", default=None, metavar="NAME", help="Use the named preset of the profile")
+    return ap
+
+
+def parse_updpkgsums_args(argv):
+    return _build_updpkgsums_parser().parse_args(argv)
+
+
+def _build_updpkgsums_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init updpkgsums",
+        description="Update sha256sums for local sources in existing PKGBUILDs (VCS sources stay SKIP).",
+    )
+    ap.add_argument("dirs", nargs="*", default=["."], metavar="DIR", help="Package directories containing a PKGBUILD")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N", help="Hashing threads (default: automatic)")
+    ap.add_argument("--no-cache", dest="use_cache", action="store_false", help="Do not read or write the digest cache")
+    return ap
+
+
+def parse_srcinfo_args(argv):
+    return _build_srcinfo_parser().parse_args(argv)
+
+
+def _build_srcinfo_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init srcinfo",
+        description=(
+            "Regenerate .SRCINFO for existing packages. It is rendered in-process, as with\n"
+            "--srcinfo; PKGBUILDs that need a shell to evaluate (command substitutions, split\n"
+            "packages, per-architecture arrays, ...) fall back to makepkg --printsrcinfo.\n"
+            "--check compares against makepkg --printsrcinfo whenever makepkg is installed.\n"
+            "Directories whose PKGBUILD and .SRCINFO are unchanged since the last run are skipped."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("dirs", nargs="*", metavar="DIR", help="Package directories containing a PKGBUILD (default: .)")
+    ap.add_argument("--all", dest="all_root", default=None, metavar="ROOT", help="Process every directory under ROOT that contains a PKGBUILD")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N", help="Packages processed in parallel (default: number of CPUs)")
+    ap.add_argument("--check", action="store_true", help="Write nothing; compare each .SRCINFO with makepkg --printsrcinfo (the native renderer without makepkg) and exit 1 if any is stale")
+    ap.add_argument("--no-cache", dest="use_cache", action="store_false", help="Ignore the recorded PKGBUILD hashes and regenerate everywhere")
+    return ap
 
-    return ap.parse_args(argv)
+
+def parse_lint_args(argv):
+    return _build_lint_parser().parse_args(argv)
+
+
+def _build_lint_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init lint",
+        description=(
+            "Check PKGBUILDs statically: missing local sources, SKIP checksums on non-VCS sources,\n"
+            "source/checksum count mismatches, unexpanded placeholders and arch vs language type.\n"
+            "Every directory under each DIR that contains a PKGBUILD is checked."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("dirs", nargs="*", default=["."], metavar="DIR", help="Package directories or trees of them (default: .)")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N", help="Worker processes (default: number of CPUs)")
+    ap.add_argument("--json", action="store_true", help="Print findings as JSON")
+    ap.add_argument("--type", dest="type_name", default=None, metavar="TYPE", help="Check arch against TYPE instead of inferring it from the dependencies")
+    return ap
+
+
+def parse_serve_args(argv):
+    return _build_serve_parser().parse_args(argv)
+
+
+def _build_serve_parser() -> argparse.ArgumentParser:
+    from client import default_socket_path
+
+    ap = argparse.ArgumentParser(
+        prog="aur-init serve",
+        description=(
+            "Run a resident aur-init daemon on a Unix socket. It keeps profiles and compiled\n"
+            "templates in memory and serves scaffold, dry-run and render requests (JSON lines).\n"
+            "The aur-init wrapper forwards to it automatically while the socket exists."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("--socket", default=default_socket_path(), metavar="PATH", help="Unix socket path (default: %(default)s)")
+    return ap
+
+
+def parse_bench_args(argv):
+    return _build_bench_parser().parse_args(argv)
+
+
+def _build_bench_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init bench",
+        description="Benchmark the scaffolding hot paths and compare against a saved baseline.",
+    )
+    ap.add_argument("-k", "--filter", default="*", metavar="GLOB", help="Only run benchmarks whose name matches GLOB")
+    ap.add_argument("-o", "--output", default=None, metavar="FILE", help="Write results as JSON ('-' for stdout)")
+    ap.add_argument("--baseline", default=None, metavar="FILE", help="Compare with a saved baseline; exit 1 on regressions")
+    ap.add_argument("--save-baseline", dest="save_baseline", default=None, metavar="FILE", help="Save these results as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, metavar="FRAC", help="Allowed slowdown before failing (default: %(default)s = +25%%)")
+    ap.add_argument("--quick", action="store_true", help="Shorter timing loops (noisier; for smoke runs)")
+    return ap
+
+
+def parse_completions_args(argv):
+    return _build_completions_parser().parse_args(argv)
+
+
+def _build_completions_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="aur-init completions",
+        description=(
+            "Print a static completion script for aur-init, generated from its option parsers.\n"
+            "The script runs no Python at tab time; see README for where to install it."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("shell", choices=["bash", "zsh", "fish"], help="Shell to generate the script for")
+    return ap
 
 
+# Subcommand -> parser builder, in the order completions list them
+SUBCOMMAND_PARSERS = {
+    "batch": _build_batch_parser,
+    "updpkgsums": _build_updpkgsums_parser,
+    "srcinfo": _build_srcinfo_parser,
+    "lint": _build_lint_parser,
+    "serve": _build_serve_parser,
+    "bench": _build_bench_parser,
+    "completions": _build_completions_parser,
+}
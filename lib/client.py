@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import json
+import os
+import socket
+import sys
+
+# Thin client for `aur-init serve`. Kept to stdlib socket/json so forwarding a
+# request costs little more than interpreter start-up.
+
+# Flags that need a TTY or the local process; these always run locally
+LOCAL_ONLY = {"-i", "--interactive", "--startup-report", "--output-tar"}
+# Environment that changes what a scaffold produces; sent with every request and
+# applied by the daemon, so a forwarded run matches a direct one
+FORWARDED_ENV = ("PATH", "HOME", "XDG_CACHE_HOME", "XDG_CONFIG_HOME", "SOURCE_DATE_EPOCH")
+
+
+def default_socket_path() -> str:
+    override = os.environ.get("AUR_INIT_SOCKET")
+    if override:
+        return override
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "aur-init.sock")
+    return f"/tmp/aur-init-{os.getuid()}.sock"
+
+
+def request(sock_path: str, payload: dict, timeout: float | None = None) -> dict:
+    """Send one JSON request and return the decoded JSON response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(sock_path)
+        s.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _run_locally(argv) -> int:
+    # In-process: no second interpreter start, and it works from the zipapp too
+    from aur_init import main as run
+
+    return run(argv)
+
+
+def main(argv) -> int:
+    if (argv and argv[0] == "serve") or any(a.split("=", 1)[0] in LOCAL_ONLY for a in argv):
+        return _run_locally(argv)
+    sock = default_socket_path()
+    try:
+        env = {k: os.environ.get(k) for k in FORWARDED_ENV}
+        resp = request(sock, {"op": "scaffold", "argv": argv, "cwd": os.getcwd(), "env": env})
+    except (OSError, ValueError):
+        # No daemon (or a stale socket): behave exactly like a direct call
+        return _run_locally(argv)
+    sys.stdout.write(resp.get("stdout", ""))
+    sys.stderr.write(resp.get("stderr", ""))
+    if "error" in resp:
+        print(f"aur-init daemon: {resp['error']}", file=sys.stderr)
+    return int(resp.get("rc", 1))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+import argparse
+import re
+
+# Static completion scripts for aur-init itself (`aur-init completions SHELL`),
+# generated from the argparse parsers in cli.py: the main parser with its
+# argument groups, plus one parser per subcommand. Every option, its aliases,
+# --type/--vcs style choices and what kind of value it takes are written out as
+# literal shell code, so tab completion runs no Python at all. The packaging
+# step regenerates them, which keeps them in step with the parsers.
+
+SHELLS = ("bash", "zsh", "fish")
+PROG = "aur-init"
+# metavar -> kind of value completed for it
+FILE_METAVARS = {"FILE", "PATH", "SPECS"}
+DIR_METAVARS = {"DIR", "ROOT"}
+# "(default: %(default)s)" in help text; defaults like the daemon socket path
+# depend on the machine generating the script, so they are left out
+DEFAULT_HELP_RE = re.compile(r"\s*\((?:default: )?%\(default\)s[^)]*\)")
+
+
+def _help(parser: argparse.ArgumentParser, action: argparse.Action) -> str:
+    if not action.help:
+        return ""
+    action = argparse.Action(action.option_strings, action.dest, help=DEFAULT_HELP_RE.sub("", action.help))
+    text = argparse.HelpFormatter(parser.prog)._expand_help(action)
+    return " ".join(text.split())
+
+
+def _kind(action: argparse.Action) -> str:
+    """What the action's value completes to: flag, choices, file, dir or text."""
+    if action.option_strings and action.nargs == 0:
+        return "flag"
+    if action.choices is not None or action.metavar == "TYPE":
+        return "choices"
+    if action.metavar in FILE_METAVARS:
+        return "file"
+    if action.metavar in DIR_METAVARS:
+        return "dir"
+    return "text"
+
+
+def _choices(action: argparse.Action) -> list[str]:
+    # "" (the plain PKGBUILD / no VCS) is the default and cannot be typed anyway
+    if action.choices is None:
+        from typedefs import type_names
+
+        return [n for n in type_names() if n]  # a free-form TYPE (lint --type)
+    return [str(c) for c in action.choices if str(c)]
+
+
+def describe(parser: argparse.ArgumentParser) -> dict:
+    """{"groups": [(title, [option])], "positionals": [positional]} for parser.
+
+    An option is {"flags", "help", "kind", "choices", "metavar", "repeat", "excludes"};
+    "excludes" lists the flags of options writing the same dest (--strict/--no-strict).
+    """
+    by_dest: dict[str, list[str]] = {}
+    for action in parser._actions:
+        if action.option_strings and action.help != argparse.SUPPRESS:
+            by_dest.setdefault(action.dest, []).extend(action.option_strings)
+    groups = []
+    positionals = []
+    for group in parser._action_groups:
+        options = []
+        for action in group._group_actions:
+            if action.help == argparse.SUPPRESS:
+                continue
+            kind = _kind(action)
+            entry = {
+                "help": _help(parser, action),
+                "kind": kind,
+                "choices": _choices(action) if kind == "choices" else [],
+                "metavar": action.metavar or action.dest.upper(),
+            }
+            if not action.option_strings:
+                entry["name"] = action.dest
+                entry["many"] = action.nargs in ("*", "+")
+                positionals.append(entry)
+                continue
+            entry["flags"] = list(action.option_strings)
+            entry["repeat"] = isinstance(action, argparse._AppendAction)
+            entry["excludes"] = [f for f in by_dest[action.dest] if f not in action.option_strings]
+            options.append(entry)
+        if options:
+            groups.append((group.title, options))
+    return {"groups": groups, "positionals": positionals}
+
+
+def _subcommands() -> dict:
+    """name -> (summary, description) for every subcommand parser."""
+    from cli import SUBCOMMAND_PARSERS
+
+    out = {}
+    for name, build in SUBCOMMAND_PARSERS.items():
+        parser = build()
+        # First sentence, without the details after a colon
+        summary = " ".join((parser.description or "").split()).split(". ")[0].split(": ")[0].rstrip(".")
+        out[name] = (summary, describe(parser))
+    return out
+
+
+def _main() -> dict:
+    from cli import _build_parser
+
+    return describe(_build_parser())
+
+
+def _options(desc: dict) -> list[dict]:
+    return [o for _, options in desc["groups"] for o in options]
+
+
+# --- bash ---
+
+def _bash_words(words: list[str]) -> str:
+    return " ".join(words)
+
+
+def _bash_body(desc: dict, indent: str, first_positional: str = "") -> list[str]:
+    """Case arms completing one parser's option values, options and positionals."""
+    lines = [f"{indent}case \"$prev\" in"]
+    for o in _options(desc):
+        if o["kind"] == "flag":
+            continue
+        pattern = "|".join(o["flags"])
+        if o["kind"] == "choices":
+            action = f"COMPREPLY=($(compgen -W \"{_bash_words(o['choices'])}\" -- \"$cur\"))"
+        elif o["kind"] == "file":
+            action = "compopt -o filenames 2>/dev/null; COMPREPLY=($(compgen -f -- \"$cur\"))"
+        elif o["kind"] == "dir":
+            action = "compopt -o filenames 2>/dev/null; COMPREPLY=($(compgen -d -- \"$cur\"))"
+        else:
+            action = ":"
+        lines.append(f"{indent}    {pattern}) {action}; return ;;")
+    lines.append(f"{indent}esac")
+    words = [f for o in _options(desc) for f in o["flags"]]
+    lines.append(f"{indent}if [[ \"$cur\" == -* ]]; then")
+    lines.append(f"{indent}    COMPREPLY=($(compgen -W \"{_bash_words(words)}\" -- \"$cur\"))")
+    lines.append(f"{indent}    return")
+    lines.append(f"{indent}fi")
+    if first_positional:
+        lines.append(f"{indent}{first_positional}")
+    for p in desc["positionals"][:1]:
+        if p["kind"] == "choices":
+            lines.append(f"{indent}COMPREPLY=($(compgen -W \"{_bash_words(p['choices'])}\" -- \"$cur\"))")
+        elif p["kind"] in ("file", "dir"):
+            flag = "-f" if p["kind"] == "file" else "-d"
+            lines.append(f"{indent}compopt -o filenames 2>/dev/null; COMPREPLY=($(compgen {flag} -- \"$cur\"))")
+    return lines
+
+
+def bash_script() -> str:
+    subs = _subcommands()
+    main = _main()
+    out = [
+        f"# bash completion for {PROG}",
+        f"# Generated from the option parsers by `{PROG} completions bash`; do not edit.",
+        "",
+        "_aur_init() {",
+        "    local cur=\"${COMP_WORDS[COMP_CWORD]}\" prev=\"${COMP_WORDS[COMP_CWORD-1]}\"",
+        "    local sub=",
+        "    COMPREPLY=()",
+        "    if (( COMP_CWORD > 1 )); then",
+        "        case \"${COMP_WORDS[1]}\" in",
+        f"            {'|'.join(subs)}) sub=\"${{COMP_WORDS[1]}}\" ;;",
+        "        esac",
+        "    fi",
+        "    case \"$sub\" in",
+    ]
+    for name, (_, desc) in subs.items():
+        out.append(f"    {name})")
+        out += _bash_body(desc, " " * 8)
+        out.append("        ;;")
+    out.append("    *)")
+    for title, options in main["groups"]:
+        out.append(f"        # {title}: {' '.join(o['flags'][-1] for o in options)}")
+    # The first word is a package name or a subcommand
+    first = f"if (( COMP_CWORD == 1 )); then COMPREPLY=($(compgen -W \"{_bash_words(list(subs))}\" -- \"$cur\")); fi"
+    out += _bash_body(main, " " * 8, first)
+    out += [
+        "        ;;",
+        "    esac",
+        "}",
+        f"complete -F _aur_init {PROG}",
+        "",
+    ]
+    return "\n".join(out)
+
+
+# --- zsh ---
+
+def _zsh_quote(text: str) -> str:
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+def _zsh_desc(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]")
+
+
+def _zsh_action(kind: str, choices: list[str]) -> str:
+    if kind == "choices":
+        return f"({' '.join(choices)})"
+    if kind == "file":
+        return "_files"
+    if kind == "dir":
+        return "_files -/"
+    return " "
+
+
+def _zsh_option(o: dict) -> str:
+    flags = o["flags"]
+    if "-h" in flags or "--help" in flags:
+        excl = "(- *)"
+    else:
+        excl = f"({' '.join(flags + o['excludes'])})" if len(flags) > 1 or o["excludes"] else ""
+    spec = f"[{_zsh_desc(o['help'])}]"
+    if o["kind"] != "flag":
+        spec += f":{o['metavar'].lower()}:{_zsh_action(o['kind'], o['choices'])}"
+    prefix = "*" if o["repeat"] else ""
+    if len(flags) == 1:
+        return _zsh_quote(f"{excl}{prefix}{flags[0]}{spec}")
+    return f"{_zsh_quote(excl + prefix)}{{{','.join(flags)}}}{_zsh_quote(spec)}"
+
+
+def _zsh_arguments(desc: dict, extra: list[str]) -> list[str]:
+    lines = ["    _arguments -s -S \\"]
+    for o in _options(desc):
+        lines.append(f"        {_zsh_option(o)} \\")
+    for p in desc["positionals"]:
+        spec = f"{'*' if p['many'] else ''}:{p['metavar'].lower()}:{_zsh_action(p['kind'], p['choices'])}"
+        lines.append(f"        {_zsh_quote(spec)} \\")
+    lines += [f"        {e} \\" for e in extra]
+    lines[-1] = lines[-1][: -len(" \\")]
+    return lines
+
+
+def zsh_script() -> str:
+    subs = _subcommands()
+    main = _main()
+    out = [
+        f"#compdef {PROG}",
+        f"# zsh completion for {PROG}",
+        f"# Generated from the option parsers by `{PROG} completions zsh`; do not edit.",
+        "",
+        "_aur-init_commands() {",
+        "    local -a commands",
+        "    commands=(",
+    ]
+    out += [f"        {_zsh_quote(f'{name}:{_zsh_desc(summary)}')}" for name, (summary, _) in subs.items()]
+    out += [
+        "    )",
+        "    _describe -t commands 'aur-init subcommand' commands",
+        "}",
+        "",
+    ]
+    for name, (_, desc) in subs.items():
+        out.append(f"_aur-init_{name}() {{")
+        out += _zsh_arguments(desc, [])
+        out += ["}", ""]
+    out += [
+        "_aur-init() {",
+        "    case $words[2] in",
+        f"        {'|'.join(subs)})",
+        "            local cmd=$words[2]",
+        "            shift words",
+        "            (( CURRENT-- ))",
+        "            _aur-init_$cmd",
+        "            return",
+        "            ;;",
+        "    esac",
+    ]
+    for title, options in main["groups"]:
+        out.append(f"    # {title}: {' '.join(o['flags'][-1] for o in options)}")
+    # The first word is a package name or a subcommand
+    main = {"groups": main["groups"], "positionals": []}
+    out += _zsh_arguments(main, [_zsh_quote("1:package name or subcommand:_aur-init_commands")])
+    out += ["}", "", '_aur-init "$@"', ""]
+    return "\n".join(out)
+
+
+# --- fish ---
+
+def _fish_quote(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _fish_cond(cond: str) -> str:
+    # Double quotes so $aur_init_subcommands expands when the script is sourced
+    return f'"{cond}"'
+
+
+def _fish_option(o: dict, cond: str) -> str:
+    parts = [f"complete -c {PROG}", f"-n {_fish_cond(cond)}"]
+    for f in o["flags"]:
+        if f.startswith("--"):
+            parts.append(f"-l {f[2:]}")
+        else:
+            parts.append(f"-s {f[1:]}")
+    if o["kind"] == "choices":
+        parts.append(f"-x -a {_fish_quote(' '.join(o['choices']))}")
+    elif o["kind"] == "file":
+        parts.append("-r -F")
+    elif o["kind"] == "dir":
+        parts.append("-x -a '(__fish_complete_directories)'")
+    elif o["kind"] == "text":
+        parts.append("-x")
+    if o["help"]:
+        parts.append(f"-d {_fish_quote(o['help'])}")
+    return " ".join(parts)
+
+
+def _fish_positionals(desc: dict, cond: str) -> list[str]:
+    out = []
+    for p in desc["positionals"][:1]:
+        base = f"complete -c {PROG} -n {_fish_cond(cond)}"
+        if p["kind"] == "choices":
+            out.append(f"{base} -a {_fish_quote(' '.join(p['choices']))}")
+        elif p["kind"] == "file":
+            out.append(f"{base} -F")
+        elif p["kind"] == "dir":
+            out.append(f"{base} -a '(__fish_complete_directories)'")
+    return out
+
+
+def fish_script() -> str:
+    subs = _subcommands()
+    main = _main()
+    top = "not __fish_seen_subcommand_from $aur_init_subcommands"
+    out = [
+        f"# fish completion for {PROG}",
+        f"# Generated from the option parsers by `{PROG} completions fish`; do not edit.",
+        "",
+        f"set -l aur_init_subcommands {' '.join(subs)}",
+        f"complete -c {PROG} -f",
+        "",
+        "# Subcommands",
+    ]
+    for name, (summary, _) in subs.items():
+        out.append(f"complete -c {PROG} -n {_fish_cond(top)} -a {name} -d {_fish_quote(summary)}")
+    for title, options in main["groups"]:
+        out += ["", f"# {title}"]
+        out += [_fish_option(o, top) for o in options]
+    for name, (_, desc) in subs.items():
+        cond = f"__fish_seen_subcommand_from {name}"
+        out += ["", f"# aur-init {name}"]
+        out += [_fish_option(o, cond) for o in _options(desc)]
+        out += _fish_positionals(desc, cond)
+    out.append("")
+    return "\n".join(out)
+
+
+def generate(shell: str) -> str:
+    """The completion script for shell (one of SHELLS)."""
+    return {"bash": bash_script, "zsh": zsh_script, "fish": fish_script}[shell]()
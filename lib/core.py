@@ -1,204 +1,374 @@
 #!/usr/bin/env python3
+import os
 import sys
 from pathlib import Path
 
 from render import (
     find_templates_dir,
     render_template,
+    arch_list,
     compute_arch_line,
     join_single_quoted,
-    compute_source_and_sha,
+    escape_double_quoted,
+    escape_single_quoted,
+    source_entries,
+    format_source_and_sha,
     build_block,
     check_block,
     package_block,
     pkgver_block,
 )
 from scaffold import (
-    ensure_dir,
     write_file,
     scaffold_common_files,
     scaffold_template,
     maybe_scaffold_tests,
+    maybe_scaffold_man,
+    maybe_scaffold_completions,
+    maybe_generate_rust_lock,
 )
 from features import (
-    maybe_git_init,
+    git_init_repo,
+    git_commit,
     maybe_gen_srcinfo,
     maybe_add_ci,
 )
+from executables import which
+from srcinfo import render_srcinfo
+from plan import Plan, write_disk, write_tar
+from steps import TIMEOUTS, Step, report_failures, run_steps
+from timings import phase
+from typedefs import get_type
+from update import record_base
 
 
 def execute(args) -> int:
     """Run the main aur-init workflow using fully prepared args.
 
     Exits early with non-zero codes on validation errors. Returns 0 on success.
+    With args.timings / args.trace, phases are timed and reported afterwards.
+    """
+    timings = getattr(args, "timings", False)
+    trace = getattr(args, "trace", None)
+    if not (timings or trace):
+        return _execute(args)
+    from timings import recording
+
+    with recording() as rec:
+        with rec.phase("core.execute"):
+            rc = _execute(args)
+    if timings:
+        rec.summary()
+    if trace:
+        rec.write_trace(trace)
+        print(f"Trace written to {trace} (open in https://ui.perfetto.dev)", file=sys.stderr)
+    return rc
+
+
+def _execute(args) -> int:
+    pkgname = args.pkgname
+    output_tar = getattr(args, "output_tar", None)
+    update = getattr(args, "update", False)
+    rc, files = build_plan(args, check_target=not (output_tar or update))
+    if rc != 0:
+        return rc
+
+    if getattr(args, "dry_run", False):
+        # Print PKGBUILD to stdout and optionally .SRCINFO; list the rest on stderr
+        print(files.text("PKGBUILD"))
+        if ".SRCINFO" in files:
+            print("# .SRCINFO\n" + files.text(".SRCINFO"))
+        for rel in sorted(files.files):
+            data, mode = files.files[rel]
+            print(f"# would write {mode:04o} {len(data):>6} {pkgname}/{rel}", file=sys.stderr)
+        return 0
+
+    if output_tar:
+        skipped = [flag for flag, on in (("--git-init", args.git_init), ("--rust-lock", getattr(args, "rust_lock", False))) if on]
+        if skipped:
+            print(f"{', '.join(skipped)} need a directory; ignored with --output-tar", file=sys.stderr)
+        with phase("write"):
+            write_tar(files, output_tar, pkgname)
+        return 0
+
+    if update:
+        from update import apply, report
+
+        skipped = [flag for flag, on in (("--git-init", args.git_init), ("--rust-lock", getattr(args, "rust_lock", False))) if on]
+        if skipped:
+            print(f"{', '.join(skipped)} only apply to new projects; ignored with --update", file=sys.stderr)
+        with phase("write"):
+            result = apply(files, Path.cwd() / pkgname)
+        report(result, pkgname)
+        return 1 if result["conflict"] else 0
+
+    failures = []
+
+    def post(root: Path):
+        # Steps that need the files on disk run in the staged directory, concurrently
+        failures.extend(run_steps(post_steps(args, root, files, Path.cwd() / pkgname)))
+
+    with phase("write"):
+        write_disk(files, Path.cwd() / pkgname, post=post)
+        record_base(Path.cwd() / pkgname, files.files)
+
+    print(f"✅ AUR package project initialized in {pkgname}/")
+    return report_failures(failures)
+
+
+def post_steps(args, root: Path, files: Plan, target: Path | None = None) -> list[Step]:
+    """The post-scaffold step graph: Cargo.lock and git init run in parallel, the commit after git init.
+
+    .SRCINFO and the CI workflow are part of the plan already; Cargo.lock is not
+    committed (the generated .gitignore ignores *.lock), so the commit does not wait for cargo.
+    With --force into a target that already is a git repository, git init and the
+    commit are skipped so its history is left alone.
+    """
+    steps = []
+    if getattr(args, "rust_lock", False) and get_type(args.type).lockfile == "cargo":
+        steps.append(Step("rust-lock", lambda t: maybe_generate_rust_lock(root, True, t), timeout=TIMEOUTS["rust-lock"]))
+    if args.git_init:
+        if target is not None and os.path.lexists(target / ".git"):
+            print(f"{target.name}/ is already a git repository; skipping repo initialization", file=sys.stderr)
+        elif which("git") is None:
+            print("git not found; skipping repo initialization", file=sys.stderr)
+        else:
+            steps.append(Step("git-init", lambda t: git_init_repo(root, t), timeout=TIMEOUTS["git-init"]))
+            steps.append(Step("git-commit", lambda t: git_commit(root, args.pkgname, files.files, args.maintainer, t),
+                              after=("git-init",), timeout=TIMEOUTS["git-commit"]))
+    return steps
+
+
+def build_plan(args, check_target: bool = True) -> tuple[int, Plan | None]:
+    """Generate every project file in memory. Returns (rc, plan); plan is None unless rc == 0.
+
+    Nothing is written; the plan is validated before it is returned.
     """
     pkgname = args.pkgname
     t = args.type
     vcs = args.vcs
     vcs_url = args.vcs_url
 
-    # Basic pkgname validation (letters, digits, @._+-)
+    with phase("validate"):
+        # Basic pkgname validation (letters, digits, @._+-)
+        import re
+        if not re.fullmatch(r"[a-z0-9@._+-][a-z0-9@._+\-]*", pkgname):
+            print("Invalid pkgname: only lowercase letters, digits and @._+- are allowed", file=sys.stderr)
+            return 2, None
+
+        target = Path.cwd() / pkgname
+        if check_target and target.exists() and any(target.iterdir()) and not args.force:
+            print(f"Target directory '{pkgname}' exists and is not empty. Use --force to overwrite.", file=sys.stderr)
+            return 1, None
+
+        maintainer = args.maintainer
+        pkgdesc = args.description
+        pkgurl = args.url or f"https://example.com/{pkgname}"
+        pkglicense = args.license
+        pkgver = "0.3.0"
+
+        try:
+            typedef = get_type(t)
+        except KeyError:
+            print(f"Unknown --type: {t}", file=sys.stderr)
+            return 1, None
+        depends = list(typedef.depends)
+        makedepends = list(typedef.makedepends)
+        local_sources = [] if vcs else typedef.local_sources(pkgname)
+
+        if vcs and not vcs_url:
+            print("--vcs-url is required when --vcs is specified", file=sys.stderr)
+            return 1, None
+        if vcs and vcs != "git":
+            print(f"Unsupported --vcs: {vcs}", file=sys.stderr)
+            return 1, None
+
+        if vcs and getattr(args, "vcs_mirror", False):
+            pkgver = _mirror_pkgver(vcs_url, pkgver)
+
+        tpl_dir = find_templates_dir()
+        tmpl = tpl_dir / "common/PKGBUILD.tmpl"
+        if not tmpl.exists():
+            print(f"Template not found: {tmpl}. Ensure templates are installed at '{tpl_dir}' (dev: templates/; install: /usr/share/aur-init/templates)", file=sys.stderr)
+            return 1, None
+
+    # Scaffolding helpers write into the plan instead of the disk while it is active
+    with Plan(target) as files:
+        with phase("scaffold"):
+            scaffold_common_files(target, pkgname)
+            scaffold_template(target, t, pkgname)
+            maybe_scaffold_tests(target, args.with_tests)
+            maybe_scaffold_man(target, pkgname, getattr(args, "with_man", False))
+            maybe_scaffold_completions(target, pkgname, getattr(args, "with_completions", False))
+
+        with phase("render"):
+            # PKGBUILD rendering
+            arch_line = compute_arch_line(t)
+            dep_line = f"depends=({join_single_quoted(depends)})" if depends else ""
+            makedep_line = f"makedepends=({join_single_quoted(makedepends)})" if makedepends else ""
+            # Ensure optional assets are shipped when requested
+            if args.with_tests:
+                local_sources.append("scripts/tests/test.sh")
+            if getattr(args, "with_man", False):
+                # Look for man page in common locations
+                for manpath in (f"man/{pkgname}.1", f"{pkgname}.1", f"docs/{pkgname}.1"):
+                    if manpath in files or (target / manpath).exists():
+                        local_sources.append(manpath)
+                        break
+            if getattr(args, "with_completions", False):
+                for compl in (f"completions/{pkgname}.bash", f"completions/bash/{pkgname}", f"completions/zsh/_{pkgname}", f"completions/fish/{pkgname}.fish"):
+                    if compl in files or (target / compl).exists():
+                        local_sources.append(compl)
+
+            remote = []
+            if getattr(args, "source_url", None):
+                rc, remote = _fetch_remote(args.source_url, getattr(args, "source_cache_size", None))
+                if rc != 0:
+                    return rc, None
+            with phase("checksums"):
+                sources, sums = source_entries(local_sources, vcs, vcs_url, pkgname, root=target, plan=files, remote=remote)
+
+            rendered = render_template(
+                tmpl,
+                {
+                    "MAINTAINER": maintainer,
+                    "PKGNAME": pkgname,
+                    "PKGVER": pkgver,
+                    # Quoted in the template; escaped so bash (and makepkg) read back the raw values
+                    "PKGDESC": escape_double_quoted(pkgdesc),
+                    "ARCH_LINE": arch_line,
+                    "PKGURL": escape_double_quoted(pkgurl),
+                    "PKGLICENSE": escape_single_quoted(pkglicense),
+                    "DEPENDS_LINE": dep_line,
+                    "MAKEDEPENDS_LINE": makedep_line,
+                    "SOURCE_AND_SHA": format_source_and_sha(sources, sums),
+                    "BUILD_BLOCK": build_block(t, bool(vcs)),
+                    "CHECK_BLOCK": check_block(args.with_tests),
+                    "PACKAGE_BLOCK": package_block(t, bool(vcs)),
+                    "PKGVER_BLOCK": pkgver_block(bool(vcs)),
+                },
+            )
+        # Strict mode checks
+        if getattr(args, "strict", True):
+            missing = []
+            if not pkgurl:
+                missing.append("url")
+            if not pkglicense:
+                missing.append("license")
+            # Types that declare require_depends expect at least one runtime dependency
+            if typedef.require_depends and not depends:
+                missing.append("depends")
+            if missing:
+                print(f"Strict mode: missing required metadata: {', '.join(missing)}", file=sys.stderr)
+                return 2, None
+
+        # Explain mode: print brief rationale with ArchWiki links
+        if getattr(args, "explain", False):
+            # stdout may carry the tar stream (--output-tar -)
+            out = sys.stderr if getattr(args, "output_tar", None) == "-" else sys.stdout
+            print("# Explain: Key PKGBUILD fields (see ArchWiki: PKGBUILD)", file=out)
+            print("# pkgname/pkver/pkgrel: mandatory identity/version fields — https://wiki.archlinux.org/title/PKGBUILD", file=out)
+            print("# url/license: upstream home and license — https://wiki.archlinux.org/title/PKGBUILD#license", file=out)
+            print("# depends/makedepends: runtime vs build deps — https://wiki.archlinux.org/title/PKGBUILD#depends", file=out)
+            print("# source/sha256sums: sources and checksums — https://wiki.archlinux.org/title/PKGBUILD#source", file=out)
+            print("# prepare/build/check/package: phases separation — https://wiki.archlinux.org/title/PKGBUILD#Package_guidelines", file=out)
+            if vcs:
+                print("# pkgver(): derive version from VCS — https://wiki.archlinux.org/title/VCS_package_guidelines", file=out)
+
+        with phase("srcinfo"):
+            # .SRCINFO is rendered natively from the same fields as the PKGBUILD
+            srcinfo = None
+            if getattr(args, "gen_srcinfo", False):
+                srcinfo = render_srcinfo(
+                    pkgname,
+                    {
+                        "pkgdesc": pkgdesc,
+                        "pkgver": pkgver,
+                        "pkgrel": "1",
+                        "url": pkgurl,
+                        "arch": arch_list(t),
+                        "license": [pkglicense],
+                        "makedepends": makedepends,
+                        "depends": depends,
+                        "source": sources,
+                        "sha256sums": sums,
+                    },
+                )
+                if getattr(args, "verify_srcinfo", False) and not _verify_srcinfo(rendered, srcinfo):
+                    return 1, None
+
+        write_file(target / "PKGBUILD", rendered, 0o600)
+
+        # Features
+        with phase("features"):
+            maybe_gen_srcinfo(target, args.gen_srcinfo, srcinfo)
+            maybe_add_ci(target, args.add_ci)
+
+    try:
+        files.validate()
+    except ValueError as e:
+        print(f"Invalid file plan: {e}", file=sys.stderr)
+        return 1, None
+    return 0, files
+
+
+def _mirror_pkgver(url: str, default: str) -> str:
+    """pkgver from the bare mirror of url, or default (with a warning) when that fails."""
     import re
-    if not re.fullmatch(r"[a-z0-9@._+-][a-z0-9@._+\-]*", pkgname):
-        print("Invalid pkgname: only lowercase letters, digits and @._+- are allowed", file=sys.stderr)
-        return 2
-
-    target = Path.cwd() / pkgname
-    if target.exists() and any(target.iterdir()) and not args.force:
-        print(f"Target directory '{pkgname}' exists and is not empty. Use --force to overwrite.", file=sys.stderr)
-        return 1
-
-    ensure_dir(target)
-
-    maintainer = args.maintainer
-    pkgdesc = args.description
-    pkgurl = args.url or f"https://example.com/{pkgname}"
-    pkglicense = args.license
-
-    depends: list[str] = []
-    makedepends: list[str] = []
-    local_sources: list[str] = []
-
-    if t == "python":
-        depends.append("python")
-        if not vcs:
-            local_sources += [f"bin/{pkgname}", f"src/{pkgname}/main.py"]
-    elif t == "node":
-        depends.append("nodejs")
-        if not vcs:
-            local_sources += [f"bin/{pkgname}", "src/main.js"]
-    elif t == "go":
-        makedepends.append("go")
-        if not vcs:
-            local_sources += ["main.go"]
-    elif t == "cmake":
-        makedepends += ["cmake", "make", "gcc"]
-        if not vcs:
-            local_sources += ["CMakeLists.txt", "src/main.cpp"]
-    elif t == "rust":
-        makedepends += ["rust", "cargo"]
-        if not vcs:
-            local_sources += ["Cargo.toml", "src/main.rs"]
-    elif t == "":
-        pass
-    else:
-        print(f"Unknown --type: {t}", file=sys.stderr)
-        return 1
-
-    if vcs and not vcs_url:
-        print("--vcs-url is required when --vcs is specified", file=sys.stderr)
-        return 1
-    if vcs and vcs != "git":
-        print(f"Unsupported --vcs: {vcs}", file=sys.stderr)
-        return 1
-
-    # Scaffold files (skipped for dry-run)
-    if not getattr(args, "dry_run", False):
-        scaffold_common_files(target, pkgname)
-        scaffold_template(target, t, pkgname)
-        maybe_scaffold_tests(target, args.with_tests)
-        # Optional docs and completions
-        from scaffold import maybe_scaffold_man, maybe_scaffold_completions, maybe_generate_rust_lock
-        maybe_scaffold_man(target, pkgname, getattr(args, "with_man", False))
-        maybe_scaffold_completions(target, pkgname, getattr(args, "with_completions", False))
-        if t == "rust":
-            maybe_generate_rust_lock(target, getattr(args, "rust_lock", False))
-
-    # PKGBUILD rendering
-    tpl_dir = find_templates_dir()
-    tmpl = tpl_dir / "common/PKGBUILD.tmpl"
-    if not tmpl.exists():
-        print(f"Template not found: {tmpl}. Ensure templates are installed at '{tpl_dir}' (dev: templates/; install: /usr/share/aur-init/templates)", file=sys.stderr)
-        return 1
-    arch_line = compute_arch_line(t)
-    dep_line = f"depends=({join_single_quoted(depends)})" if depends else ""
-    makedep_line = f"makedepends=({join_single_quoted(makedepends)})" if makedepends else ""
-    # Ensure optional assets are shipped when requested
-    if args.with_tests:
-        local_sources.append("scripts/tests/test.sh")
-    if getattr(args, "with_man", False):
-        # Look for man page in common locations
-        for manpath in (f"man/{pkgname}.1", f"{pkgname}.1", f"docs/{pkgname}.1"):
-            if (target / manpath).exists():
-                local_sources.append(manpath)
-                break
-    if getattr(args, "with_completions", False):
-        for compl in (f"completions/{pkgname}.bash", f"completions/bash/{pkgname}", f"completions/zsh/_{pkgname}", f"completions/fish/{pkgname}.fish"):
-            if (target / compl).exists():
-                local_sources.append(compl)
-        
-    src_sha = compute_source_and_sha(local_sources, vcs, vcs_url, pkgname)
-
-    rendered = render_template(
-        tmpl,
-        {
-            "MAINTAINER": maintainer,
-            "PKGNAME": pkgname,
-            "PKGVER": "0.3.0",
-            "PKGDESC": pkgdesc,
-            "ARCH_LINE": arch_line,
-            "PKGURL": pkgurl,
-            "PKGLICENSE": pkglicense,
-            "DEPENDS_LINE": dep_line,
-            "MAKEDEPENDS_LINE": makedep_line,
-            "SOURCE_AND_SHA": src_sha,
-            "BUILD_BLOCK": build_block(t, bool(vcs)),
-            "CHECK_BLOCK": check_block(args.with_tests),
-            "PACKAGE_BLOCK": package_block(t, bool(vcs)),
-            "PKGVER_BLOCK": pkgver_block(bool(vcs)),
-        },
-    )
-    # Strict mode checks
-    if getattr(args, "strict", True):
-        missing = []
-        if not pkgurl:
-            missing.append("url")
-        if not pkglicense:
-            missing.append("license")
-        # For language types, we expect at least one runtime dependency
-        if t in {"python", "node"} and not depends:
-            missing.append("depends")
-        if missing:
-            print(f"Strict mode: missing required metadata: {', '.join(missing)}", file=sys.stderr)
-            return 2
-
-    # Explain mode: print brief rationale with ArchWiki links
-    if getattr(args, "explain", False):
-        print("# Explain: Key PKGBUILD fields (see ArchWiki: PKGBUILD)")
-        print("# pkgname/pkver/pkgrel: mandatory identity/version fields — https://wiki.archlinux.org/title/PKGBUILD")
-        print("# url/license: upstream home and license — https://wiki.archlinux.org/title/PKGBUILD#license")
-        print("# depends/makedepends: runtime vs build deps — https://wiki.archlinux.org/title/PKGBUILD#depends")
-        print("# source/sha256sums: sources and checksums — https://wiki.archlinux.org/title/PKGBUILD#source")
-        print("# prepare/build/check/package: phases separation — https://wiki.archlinux.org/title/PKGBUILD#Package_guidelines")
-        if vcs:
-            print("# pkgver(): derive version from VCS — https://wiki.archlinux.org/title/VCS_package_guidelines")
 
-    if getattr(args, "dry_run", False):
-        # Print PKGBUILD to stdout and optionally .SRCINFO
-        print(rendered)
-        if getattr(args, "gen_srcinfo", False):
-            import tempfile, subprocess, shutil
-            with tempfile.TemporaryDirectory() as td:
-                td_path = Path(td)
-                (td_path / "PKGBUILD").write_text(rendered)
-                makepkg = shutil.which("makepkg")
-                if makepkg:
-                    try:
-                        out = subprocess.check_output([makepkg, "--printsrcinfo"], cwd=td, text=True)
-                        print("# .SRCINFO\n" + out)
-                    except Exception as e:
-                        print(f"[dry-run] Failed to run makepkg --printsrcinfo: {e}", file=sys.stderr)
-                else:
-                    print("[dry-run] makepkg not found; cannot generate .SRCINFO", file=sys.stderr)
-        return 0
+    from mirrors import mirror_pkgver
 
-    write_file(target / "PKGBUILD", rendered, 0o600)
+    with phase("mirror"):
+        try:
+            pkgver = mirror_pkgver(url)
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: cannot mirror {url}: {e}; using pkgver {default}", file=sys.stderr)
+            return default
+    # makepkg rejects ':', '/', '-' and whitespace in pkgver
+    if not re.fullmatch(r"[^:/\-\s]+", pkgver):
+        print(f"Warning: version {pkgver!r} from {url} is not a valid pkgver; using {default}", file=sys.stderr)
+        return default
+    return pkgver
 
-    # Features
-    if not getattr(args, "dry_run", False):
-        maybe_git_init(target, args.git_init, pkgname)
-        maybe_gen_srcinfo(target, args.gen_srcinfo)
-        maybe_add_ci(target, args.add_ci)
 
-    print(f"✅ AUR package project initialized in {pkgname}/")
-    return 0
+def _fetch_remote(urls: list[str], cache_size: str | None) -> tuple[int, list[tuple[str, str]]]:
+    """(rc, [(url, sha256)]) for --source-url, downloading through the cache."""
+    from downloads import DEFAULT_MAX_BYTES, fetch, parse_size
+
+    try:
+        max_bytes = parse_size(cache_size) if cache_size else DEFAULT_MAX_BYTES
+    except ValueError:
+        print(f"Invalid --source-cache-size: {cache_size}", file=sys.stderr)
+        return 2, []
+    out = []
+    with phase("download"):
+        for url in urls:
+            if url.split("://", 1)[0] not in ("http", "https", "ftp", "file"):
+                print(f"Unsupported --source-url (need http, https, ftp or file): {url}", file=sys.stderr)
+                return 2, []
+            try:
+                out.append((url, fetch(url, max_bytes)[0]))
+            except (OSError, ValueError) as e:
+                print(f"Failed to download {url}: {e}", file=sys.stderr)
+                return 1, []
+    return 0, out
+
+
+def _verify_srcinfo(pkgbuild: str, native: str) -> bool:
+    """Differential check of the native .SRCINFO against makepkg --printsrcinfo."""
+    from srcinfo import makepkg_srcinfo, diff_srcinfo
+
+    try:
+        reference = makepkg_srcinfo(pkgbuild)
+    except Exception as e:
+        print(f"Failed to run makepkg --printsrcinfo: {e}", file=sys.stderr)
+        return False
+    if reference is None:
+        print("makepkg not found; skipping .SRCINFO differential check", file=sys.stderr)
+        return True
+    diff = diff_srcinfo(native, reference)
+    if diff:
+        print("Native .SRCINFO differs from makepkg --printsrcinfo:", file=sys.stderr)
+        print(diff, file=sys.stderr, end="")
+        return False
+    return True
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import tempfile
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import aur_init
+from render import find_templates_dir, load_template
+
+# Requests are one JSON object per line; each gets one JSON object back.
+#   {"op": "ping"}
+#   {"op": "scaffold", "argv": [...], "cwd": "/path", "env": {...}}   -> {"rc", "stdout", "stderr"}
+#   {"op": "dry-run",  "argv": [...], "cwd": "/path"}   (same, --dry-run forced)
+#   {"op": "render", "template": "common/PKGBUILD.tmpl", "values": {...}} -> {"rc", "text"}
+# The parent reads the request line and loads the profile it names before
+# forking; the request itself is handled in the child, so clients run
+# concurrently and each gets its own cwd and stdout/stderr while sharing the
+# warm parent state. "env" carries the client's client.FORWARDED_ENV values
+# (null: unset); they apply to the child, and to the parent while it loads the
+# profile, and relative --from-file paths resolve against "cwd".
+
+# Seconds the parent waits for a client to send its request line
+READ_TIMEOUT = 2.0
+
+
+class DaemonState:
+    """Profiles, template dir and compiled templates kept warm in the parent."""
+
+    def __init__(self):
+        self.templates_dir = find_templates_dir()
+        # (absolute from_file, preset, XDG_CONFIG_HOME, HOME) -> (profile_path, data, mtime_ns)
+        self.profiles: dict = {}
+        self.warm()
+
+    def warm(self):
+        # Preload the scaffolding modules and templates so forked children start hot
+        import core  # noqa: F401
+
+        tmpl = self.templates_dir / "common/PKGBUILD.tmpl"
+        if tmpl.exists():
+            load_template(tmpl)  # recompiled here when the file changed on disk
+
+    def reset(self):
+        from executables import invalidate
+
+        invalidate()
+        self.templates_dir = find_templates_dir()
+        self.profiles.clear()
+        self.warm()
+
+    def profile(self, from_file: str | None, preset: str | None = None):
+        if from_file:
+            from_file = os.path.abspath(os.path.expanduser(from_file))
+        # Auto-discovery depends on the (request's) environment
+        key = (from_file, preset, os.environ.get("XDG_CONFIG_HOME"), os.environ.get("HOME"))
+        cached = self.profiles.get(key)
+        if cached is not None:
+            path, data, mtime_ns = cached
+            # No profile found: look again (profiles.py caches absent lookups), one may appear
+            if path is not None and _mtime_ns(path) == mtime_ns:
+                return path, data
+        path, data = aur_init._load_profile(from_file, preset)
+        if data is not None:
+            self.profiles[key] = (path, data, _mtime_ns(path) if path else None)
+        return path, data
+
+    def warm_profile(self, argv: list[str], cwd: str | None, env: dict):
+        """Load the profile a scaffold argv names, so forked children inherit it."""
+        if argv and argv[0] in aur_init.SUBCOMMANDS:
+            return
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()), request_env(env):
+            try:
+                args = aur_init.parse_args(argv)
+                from_file = getattr(args, "from_file", None)
+                if from_file and cwd:
+                    from_file = os.path.join(cwd, os.path.expanduser(from_file))
+                self.profile(from_file, getattr(args, "preset", None))
+            except (SystemExit, Exception):
+                pass  # -h, usage or profile errors: the child reports them
+
+
+@contextmanager
+def request_env(env: dict):
+    """Apply the forwarded variables of a request (others are ignored), restoring them afterwards."""
+    from client import FORWARDED_ENV
+
+    env = {k: v for k, v in (env or {}).items() if k in FORWARDED_ENV}
+    saved = {k: os.environ.get(k) for k in env}
+    _set_env(env)
+    try:
+        yield
+    finally:
+        _set_env(saved)
+
+
+def _set_env(env: dict):
+    for k, v in env.items():
+        if v is None:
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = str(v)
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def handle_request(state: DaemonState, req: dict) -> dict:
+    op = req.get("op")
+    if op == "ping":
+        return {"rc": 0, "pid": os.getpid(), "profiles": len(state.profiles)}
+    if op == "render":
+        return _render(state, req)
+    if op in ("scaffold", "dry-run"):
+        argv = request_argv(req)
+        with request_env(req.get("env")):
+            return _captured(lambda: _scaffold(state, argv), req.get("cwd"))
+    return {"rc": 2, "error": f"unknown op: {op!r}"}
+
+
+def request_argv(req: dict) -> list[str]:
+    argv = [str(a) for a in req.get("argv") or []]
+    if req.get("op") == "dry-run" and "--dry-run" not in argv:
+        argv.append("--dry-run")
+    return argv
+
+
+def _scaffold(state: DaemonState, argv: list[str]) -> int:
+    if argv and argv[0] in aur_init.SUBCOMMANDS:
+        return aur_init.main(argv)
+    args = aur_init.parse_args(argv)
+    if getattr(args, "interactive", False):
+        print("--interactive is not available through the daemon", file=sys.stderr)
+        return 2
+    profile_path, profile = state.profile(getattr(args, "from_file", None), getattr(args, "preset", None))
+    if profile is None:
+        return 2
+    if profile:
+        aur_init._apply_profile_defaults(args, profile)
+    return aur_init.run(args, profile_path)
+
+
+def _render(state: DaemonState, req: dict) -> dict:
+    name = str(req.get("template") or "common/PKGBUILD.tmpl")
+    root = state.templates_dir.resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return {"rc": 1, "error": f"template not found: {name}"}
+    values = {str(k): str(v) for k, v in (req.get("values") or {}).items()}
+    err = io.StringIO()
+    with redirect_stderr(err):
+        text = load_template(path).render(values)
+    return {"rc": 0, "text": text, "stderr": err.getvalue()}
+
+
+def _captured(fn, cwd: str | None) -> dict:
+    """Run fn with fds 1/2 redirected to temp files (catches subprocess output too)."""
+    if cwd:
+        os.chdir(cwd)
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            rc = fn()
+        except SystemExit as e:  # argparse -h / usage errors
+            rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 2)
+        except Exception as e:
+            print(f"{type(e).__name__}: {e}", file=sys.stderr)
+            rc = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        out.seek(0)
+        err.seek(0)
+        return {
+            "rc": rc,
+            "stdout": out.read().decode("utf-8", "replace"),
+            "stderr": err.read().decode("utf-8", "replace"),
+        }
+
+
+def read_request(sock) -> tuple[dict, str | None]:
+    """Read one JSON request line. Returns (request, error); error is set for a malformed request."""
+    sock.settimeout(READ_TIMEOUT)
+    try:
+        with sock.makefile("rb") as f:
+            line = f.readline()
+        req = json.loads(line)
+        if not isinstance(req, dict):
+            raise ValueError("request must be a JSON object")
+    except (OSError, ValueError) as e:
+        return {}, f"bad request: {e}"
+    finally:
+        sock.settimeout(None)
+    return req, None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        req, error = self.server.pending  # read by the parent before the fork
+        if error:
+            resp = {"rc": 2, "error": error}
+        else:
+            resp = handle_request(self.server.state, req)
+        self.wfile.write(json.dumps(resp).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, sock_path: str, state: DaemonState):
+        self.state = state
+        self.pending: tuple[dict, str | None] = ({}, None)
+        super().__init__(sock_path, _Handler)
+
+    def process_request(self, request, client_address):
+        # Refresh in the parent so every forked child inherits current templates
+        # and the profile it asks for; the parent keeps both for later requests
+        self.state.warm()
+        self.pending = req, _ = read_request(request)
+        if req.get("op") in ("scaffold", "dry-run"):
+            self.state.warm_profile(request_argv(req), req.get("cwd"), req.get("env"))
+        super().process_request(request, client_address)
+
+
+def serve(sock_path: str) -> int:
+    """Serve requests on sock_path until SIGINT/SIGTERM. SIGHUP drops cached state."""
+    p = Path(sock_path)
+    if p.exists():
+        from client import request
+
+        try:
+            request(sock_path, {"op": "ping"}, timeout=1.0)
+            print(f"aur-init daemon already running on {sock_path}", file=sys.stderr)
+            return 1
+        except (OSError, ValueError):
+            p.unlink()  # stale socket from a previous run
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(sock_path, DaemonState())
+    finally:
+        os.umask(old_umask)
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGHUP, lambda signum, frame: server.state.reset())
+    print(f"aur-init daemon listening on {sock_path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            p.unlink()
+        except OSError:
+            pass
+    return 0
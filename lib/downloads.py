@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from timings import count
+
+# Content-addressed cache for remote sources (--source-url):
+#
+#   $XDG_CACHE_HOME/aur-init/downloads/blobs/<sha256>   file contents
+#   $XDG_CACHE_HOME/aur-init/downloads/index.json       url -> {sha256, size, used}
+#
+# A URL is downloaded once, hashed while it streams to disk, and then served
+# from the index. "used" is refreshed on every hit; when the blobs exceed the
+# size cap, the least recently used ones are evicted. The index is updated under
+# an flock so concurrent scaffolds (batch workers) do not lose entries.
+
+DEFAULT_MAX_BYTES = 1 << 30
+CHUNK = 1 << 20
+TIMEOUT = 60.0
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """'500M', '2G', '1048576' -> bytes; raises ValueError."""
+    t = text.strip().upper().removesuffix("B").removesuffix("I")
+    unit = t[-1:] if t[-1:] in _UNITS else ""
+    value = float(t[: len(t) - len(unit)])
+    if value < 0:
+        raise ValueError(f"negative size: {text}")
+    return int(value * _UNITS[unit])
+
+
+def cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "aur-init" / "downloads"
+
+
+class FileLock:
+    """Exclusive flock on path (created if needed) for the duration of a with block."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self):
+        import fcntl
+
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        os.close(self.fd)  # releases the lock
+        return False
+
+
+def _read_index(root: Path) -> dict:
+    try:
+        with open(root / "index.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_index(root: Path, index: dict):
+    tmp = root / f"index.json.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, root / "index.json")
+
+
+def _download(url: str, blobs: Path) -> tuple[str, int]:
+    """Stream url into blobs/<sha256>, hashing on the way. Returns (sha256, size)."""
+    import tempfile
+    import urllib.request
+
+    h = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(prefix=".part-", dir=blobs)
+    try:
+        with os.fdopen(fd, "wb") as out, urllib.request.urlopen(url, timeout=TIMEOUT) as resp:
+            while True:
+                chunk = resp.read(CHUNK)
+                if not chunk:
+                    break
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        digest = h.hexdigest()
+        os.replace(tmp, blobs / digest)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    count("downloads")
+    return digest, size
+
+
+def evict(index: dict, blobs: Path, max_bytes: int, keep: str | None = None) -> list[str]:
+    """Drop least recently used blobs (never keep) until they fit in max_bytes. Returns removed URLs."""
+    last_used: dict[str, float] = {}
+    sizes: dict[str, int] = {}
+    for entry in index.values():
+        sha = entry["sha256"]
+        last_used[sha] = max(last_used.get(sha, 0.0), entry["used"])
+        sizes[sha] = entry["size"]
+    total = sum(sizes.values())
+    removed = []
+    for sha in sorted(last_used, key=last_used.get):
+        if total <= max_bytes:
+            break
+        if sha == keep:
+            continue
+        try:
+            os.unlink(blobs / sha)
+        except FileNotFoundError:
+            pass
+        total -= sizes[sha]
+        for url in [u for u, e in index.items() if e["sha256"] == sha]:
+            del index[url]
+            removed.append(url)
+    return removed
+
+
+def fetch(url: str, max_bytes: int = DEFAULT_MAX_BYTES, root: Path | None = None) -> tuple[str, Path]:
+    """sha256 and cached path of url's content, downloading it on a miss.
+
+    Raises OSError (urllib.error.URLError included) when it cannot be fetched.
+    """
+    root = root or cache_dir()
+    blobs = root / "blobs"
+    blobs.mkdir(parents=True, exist_ok=True)
+    with FileLock(root / "index.lock"):
+        entry = _read_index(root).get(url)
+    if entry is not None and (blobs / entry["sha256"]).is_file():
+        count("download_cache_hits")
+        digest, size = entry["sha256"], entry["size"]
+    else:
+        # Downloads run outside the lock; the blob rename is atomic and idempotent
+        digest, size = _download(url, blobs)
+    with FileLock(root / "index.lock"):
+        index = _read_index(root)
+        index[url] = {"sha256": digest, "size": size, "used": time.time()}
+        evict(index, blobs, max_bytes, keep=digest)
+        try:
+            _write_index(root, index)
+        except OSError as e:
+            print(f"Warning: cannot write download index in {root}: {e}", file=sys.stderr)
+    return digest, blobs / digest
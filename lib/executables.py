@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import os
+from contextlib import contextmanager
+
+# Process-wide index of the executables on PATH, replacing shutil.which (which
+# re-walks every PATH directory on each call). PATH is listed once with
+# os.scandir; lookups are then dictionary hits plus one access() check on the
+# answer. The index is rebuilt when PATH changes, and on a miss when any PATH
+# directory's mtime changed (a tool was installed since the scan), which keeps
+# long-running processes (daemon, batch workers) correct.
+
+# (PATH value, [(dir, mtime_ns)], name -> candidate paths in PATH order)
+_INDEX: tuple[str, list, dict[str, list[str]]] | None = None
+# Injected tool set (name -> path or None) replacing PATH lookups, see fake()
+_FAKE: dict[str, str | None] | None = None
+
+
+def _scan(path_env: str) -> tuple[str, list, dict[str, list[str]]]:
+    dirs = []
+    names: dict[str, list[str]] = {}
+    for d in path_env.split(os.pathsep):
+        d = d or os.curdir
+        try:
+            mtime = os.stat(d).st_mtime_ns
+            with os.scandir(d) as it:
+                for entry in it:
+                    names.setdefault(entry.name, []).append(entry.path)
+        except OSError:
+            mtime = None
+        dirs.append((d, mtime))
+    return path_env, dirs, names
+
+
+def _stale(dirs: list) -> bool:
+    for d, mtime in dirs:
+        try:
+            if os.stat(d).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            if mtime is not None:
+                return True
+    return False
+
+
+def _is_exe(path: str) -> bool:
+    return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+
+def which(name: str) -> str | None:
+    """Full path of the executable name on PATH, or None (like shutil.which)."""
+    global _INDEX
+    if _FAKE is not None:
+        return _FAKE.get(name)
+    if os.sep in name:
+        return name if _is_exe(name) else None
+    path_env = os.environ.get("PATH", os.defpath)
+    # Work on a local snapshot: other threads may replace _INDEX meanwhile
+    index = _INDEX
+    for attempt in (0, 1):
+        if index is None or index[0] != path_env:
+            index = _INDEX = _scan(path_env)
+        for candidate in index[2].get(name, ()):
+            if _is_exe(candidate):
+                return candidate
+        # Miss (or stale hit): rescan once if a PATH directory changed since the scan
+        if attempt or not _stale(index[1]):
+            return None
+        index = None
+    return None
+
+
+def invalidate():
+    """Drop the index; the next lookup rescans PATH."""
+    global _INDEX
+    _INDEX = None
+
+
+@contextmanager
+def fake(tools: dict[str, str | None]):
+    """Make which() answer only from tools for the duration of the block (tests)."""
+    global _FAKE
+    prev = _FAKE
+    _FAKE = dict(tools)
+    try:
+        yield
+    finally:
+        _FAKE = prev
@@ -1,47 +1,94 @@
 #!/usr/bin/env python3
+import os
+import re
 import sys
-import shutil
 import subprocess
 from pathlib import Path
 
+from executables import which
 from render import find_templates_dir
 from scaffold import ensure_dir, write_file
+from timings import count, traced
 
 
-def maybe_git_init(root: Path, enabled: bool, pkgname: str):
+@traced
+def maybe_git_init(root: Path, enabled: bool, pkgname: str, files=None, author: str | None = None):
+    """Create a repo with one initial commit of every generated file.
+
+    files maps rel path -> (bytes, mode) (a Plan's files); without it the files
+    under root are used. The commit is written with git fast-import, so hooks and
+    commit signing do not run; author defaults to the maintainer string.
+    Raises subprocess.CalledProcessError when git fails.
+    """
     if not enabled:
         return
-    if shutil.which("git") is None:
+    if which("git") is None:
         print("git not found; skipping repo initialization", file=sys.stderr)
         return
-    subprocess.run(["git", "init", "-q"], cwd=root, check=False)
-    # Stage common files
-    to_add = ["PKGBUILD", ".gitignore", "README.md"]
-    if (root / ".github").exists():
-        to_add.append(".github")
-    for d in ("src", "bin"):
-        if (root / d).exists():
-            to_add.append(d)
-    for f in ("main.go", "CMakeLists.txt"):
-        if (root / f).exists():
-            to_add.append(f)
-    if (root / "scripts").exists():
-        to_add.append("scripts")
-    if to_add:
-        subprocess.run(["git", "add", *to_add], cwd=root, check=False)
-        subprocess.run(["git", "commit", "-qm", f"chore: initialize AUR package {pkgname}"], cwd=root, check=False)
-
-
-def maybe_gen_srcinfo(root: Path, enabled: bool):
-    if not enabled:
+    git_init_repo(root)
+    git_commit(root, pkgname, files, author)
+
+
+def git_init_repo(root: Path, timeout: float | None = None):
+    """`git init` in root (the first half of maybe_git_init)."""
+    count("subprocesses")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True, timeout=timeout)
+
+
+def git_commit(root: Path, pkgname: str, files=None, author: str | None = None, timeout: float | None = None):
+    """Write the initial commit and index of the repo git_init_repo created (see maybe_git_init)."""
+    from gitinit import collect_files, fast_import_stream, head_ref, parse_author, uses_sha1, write_index
+
+    if files is None:
+        files = collect_files(root)
+    if not files:
         return
-    if shutil.which("makepkg") is None:
-        print("makepkg not found; cannot generate .SRCINFO", file=sys.stderr)
+    git_dir = root / ".git"
+    stream = fast_import_stream(files, head_ref(git_dir), parse_author(author), f"chore: initialize AUR package {pkgname}")
+    count("subprocesses")
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=root, input=stream, check=True, timeout=timeout,
+                   stderr=subprocess.PIPE)
+    if not git_dir.is_dir():
         return
-    with open(root / ".SRCINFO", "w") as f:
-        subprocess.run(["makepkg", "--printsrcinfo"], cwd=root, check=False, stdout=f)
+    if uses_sha1(git_dir):
+        write_index(root, files)
+    else:
+        count("subprocesses")
+        subprocess.run(["git", "read-tree", "HEAD"], cwd=root, check=True, timeout=timeout)
+
 
+@traced
+def maybe_gen_srcinfo(root: Path, enabled: bool, content: str | None = None) -> bool:
+    """Write .SRCINFO from natively rendered content, or via makepkg when none is given.
 
+    Returns True when the file was written.
+    """
+    if not enabled:
+        return False
+    if content is None:
+        content = printsrcinfo(root)
+        if content is None:
+            return False
+    write_file(root / ".SRCINFO", content, 0o644)
+    return True
+
+
+def printsrcinfo(root: Path) -> str | None:
+    """Output of `makepkg --printsrcinfo` for root/PKGBUILD; None (reported) on failure."""
+    makepkg = which("makepkg")
+    if makepkg is None:
+        print("makepkg not found; cannot generate .SRCINFO", file=sys.stderr)
+        return None
+    count("subprocesses")
+    cp = subprocess.run([makepkg, "--printsrcinfo"], cwd=root, check=False,
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if cp.returncode != 0:
+        print(f"makepkg --printsrcinfo failed in {root}: {cp.stderr.strip()}", file=sys.stderr)
+        return None
+    return cp.stdout
+
+
+@traced
 def maybe_add_ci(root: Path, enabled: bool):
     if not enabled:
         return
@@ -49,7 +96,7 @@ def maybe_add_ci(root: Path, enabled: bool):
     tpl_dir = find_templates_dir()
     ci_tmpl = tpl_dir / "common/ci.yml.tmpl"
     if ci_tmpl.exists():
-        shutil.copy(ci_tmpl, root / ".github/workflows/aur.yml")
+        write_file(root / ".github/workflows/aur.yml", ci_tmpl.read_text(), 0o644)
     else:
         write_file(root / ".github/workflows/aur.yml", """name: AUR CI
 on: [push, pull_request]
@@ -68,29 +115,159 @@ jobs:
 """, 0o644)
 
 
-def doctor() -> int:
+# name -> (required, version command arguments)
+DOCTOR_TOOLS = {
+    "makepkg": (True, ["--version"]),
+    "fakeroot": (True, ["--version"]),
+    "git": (True, ["--version"]),
+    "namcap": (True, ["--version"]),
+    "go": (False, ["version"]),
+    "cargo": (False, ["--version"]),
+    "cmake": (False, ["--version"]),
+    "node": (False, ["--version"]),
+}
+PROBE_TIMEOUT = 5.0
+DOCTOR_CACHE_VERSION = 1
+VERSION_RE = re.compile(r"\d+(?:\.\d+)+(?:[-+.][0-9A-Za-z.]+)?")
+
+
+def _probe(name: str, args: list[str]) -> dict:
+    path = which(name)
+    res = {"found": path is not None, "path": path, "version": None, "error": None}
+    if path is None:
+        return res
+    try:
+        res["mtime_ns"] = os.stat(path).st_mtime_ns
+        count("subprocesses")
+        cp = subprocess.run([path, *args], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, timeout=PROBE_TIMEOUT, check=False)
+        out = (cp.stdout or b"").decode("utf-8", "replace")
+        m = VERSION_RE.search(out)
+        res["version"] = m.group(0) if m else None
+        if cp.returncode != 0:
+            res["error"] = f"exit {cp.returncode}"
+    except subprocess.TimeoutExpired:
+        res["error"] = f"timeout after {PROBE_TIMEOUT:g}s"
+    except OSError as e:
+        res["error"] = str(e)
+    return res
+
+
+def _doctor_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aur-init", "doctor.json")
+
+
+def _path_fingerprint() -> list:
+    """PATH entries with their mtimes: adding or removing a binary changes a directory mtime."""
+    out = []
+    for d in os.environ.get("PATH", "").split(os.pathsep):
+        try:
+            out.append([d, os.stat(d).st_mtime_ns])
+        except OSError:
+            out.append([d, None])
+    return out
+
+
+def _cached_doctor(fingerprint: list) -> dict | None:
+    import json
+
+    try:
+        with open(_doctor_cache_path(), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("version") != DOCTOR_CACHE_VERSION or cache.get("path") != fingerprint:
+        return None
+    tools = cache.get("tools") or {}
+    if set(tools) != set(DOCTOR_TOOLS):
+        return None
+    for res in tools.values():
+        # An upgraded binary (same path, new mtime) invalidates the cache
+        if res["found"] and _mtime_ns(res["path"]) != res.get("mtime_ns"):
+            return None
+    return tools
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _save_doctor(fingerprint: list, tools: dict):
+    import json
+
+    path = _doctor_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": DOCTOR_CACHE_VERSION, "path": fingerprint, "tools": tools}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot write doctor cache {path}: {e}", file=sys.stderr)
+
+
+def probe_tools(use_cache: bool = True) -> tuple[dict, bool]:
+    """Locate and version-probe every DOCTOR_TOOLS entry concurrently.
+
+    Returns (name -> result, from_cache). Results are cached by the PATH entries
+    and their mtimes plus each found binary's mtime; runs with a failed probe are
+    not cached.
+    """
+    fingerprint = _path_fingerprint()
+    if use_cache:
+        tools = _cached_doctor(fingerprint)
+        if tools is not None:
+            return tools, True
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(DOCTOR_TOOLS)) as pool:
+        futures = {name: pool.submit(_probe, name, args) for name, (_, args) in DOCTOR_TOOLS.items()}
+        tools = {name: fut.result() for name, fut in futures.items()}
+    if use_cache and not any(r["error"] for r in tools.values()):
+        _save_doctor(fingerprint, tools)
+    return tools, False
+
+
+def doctor(as_json: bool = False, use_cache: bool = True) -> int:
     """Check local prerequisites and print a report. Returns 0 if OK, 1 otherwise."""
-    checks = {
-        "makepkg": shutil.which("makepkg") is not None,
-        "fakeroot": shutil.which("fakeroot") is not None,
-        "git": shutil.which("git") is not None,
-        "namcap": shutil.which("namcap") is not None,
-    }
-    # Optional toolchains
-    optional = {
-        "go": shutil.which("go") is not None,
-        "cargo": shutil.which("cargo") is not None,
-        "cmake": shutil.which("cmake") is not None,
-        "node": shutil.which("node") is not None,
-    }
+    tools, cached = probe_tools(use_cache)
+    rc = 0 if all(tools[n]["found"] for n, (req, _) in DOCTOR_TOOLS.items() if req) else 1
+    if as_json:
+        import json
+
+        report = {
+            "ok": rc == 0,
+            "cached": cached,
+            "tools": {
+                n: {"required": req, **{k: tools[n].get(k) for k in ("found", "path", "version", "error")}}
+                for n, (req, _) in DOCTOR_TOOLS.items()
+            },
+        }
+        print(json.dumps(report, indent=2))
+        return rc
+
+    def line(name: str, ok_word: str, missing_word: str) -> str:
+        res = tools[name]
+        if not res["found"]:
+            return f"  - {name}: {missing_word}"
+        detail = res["version"] or "version unknown"
+        if res["error"]:
+            detail += f"; probe failed: {res['error']}"
+        return f"  - {name}: {ok_word} ({detail})"
+
     print("aur-init doctor:\n")
     print("Required:")
-    for k, ok in checks.items():
-        print(f"  - {k}: {'OK' if ok else 'MISSING'}")
+    for name, (req, _) in DOCTOR_TOOLS.items():
+        if req:
+            print(line(name, "OK", "MISSING"))
     print("\nOptional (based on template type):")
-    for k, ok in optional.items():
-        print(f"  - {k}: {'OK' if ok else 'missing'}")
-    rc = 0 if all(checks.values()) else 1
+    for name, (req, _) in DOCTOR_TOOLS.items():
+        if not req:
+            print(line(name, "OK", "missing"))
     if rc != 0:
         print("\nSome required tools are missing. Install base-devel and namcap:")
         print("  sudo pacman -S --needed base-devel namcap")
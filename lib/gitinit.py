@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+import struct
+import time
+from pathlib import Path
+
+# The initial commit is written by a single `git fast-import` run instead of
+# `git add` + `git commit`: no hooks, no signing, no per-file index updates.
+# The index is then written here from the same blobs so `git status` is clean.
+
+AUTHOR_RE = re.compile(r"^\s*(?P<name>[^<>]*?)\s*(?:<(?P<email>[^<>]*)>)?\s*$")
+
+
+def parse_author(maintainer: str | None) -> tuple[str, str]:
+    """Split 'Name <email>' into (name, email); missing parts become placeholders."""
+    m = AUTHOR_RE.match(maintainer or "")
+    name = (m.group("name") if m else "") or "aur-init"
+    email = (m.group("email") if m else None) or ""
+    return name, email
+
+
+def collect_files(root: Path) -> dict[str, tuple[bytes, int]]:
+    """All regular files under root except .git, as rel path -> (data, mode)."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        for fn in filenames:
+            p = Path(dirpath) / fn
+            if p.is_file() and not p.is_symlink():
+                files[p.relative_to(root).as_posix()] = (p.read_bytes(), p.stat().st_mode & 0o7777)
+    return files
+
+
+def _git_mode(mode: int) -> int:
+    return 0o100755 if mode & 0o111 else 0o100644
+
+
+def _quote(path: str) -> str:
+    if "\n" in path or path.startswith('"'):
+        return '"' + path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+    return path
+
+
+def _timestamp() -> str:
+    when = int(os.environ.get("SOURCE_DATE_EPOCH") or time.time())
+    offset = time.localtime(when).tm_gmtoff // 60
+    sign = "-" if offset < 0 else "+"
+    return f"{when} {sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+
+
+def fast_import_stream(files: dict[str, tuple[bytes, int]], ref: str, author: tuple[str, str], message: str) -> bytes:
+    """fast-import input creating one commit on ref with every file in files."""
+    out = []
+    paths = sorted(files)
+    for mark, rel in enumerate(paths, 1):
+        data = files[rel][0]
+        out.append(b"blob\nmark :%d\ndata %d\n%s\n" % (mark, len(data), data))
+    ident = f"{author[0]} <{author[1]}> {_timestamp()}".encode("utf-8")
+    msg = message.encode("utf-8")
+    out.append(b"commit %s\nauthor %s\ncommitter %s\ndata %d\n%s\n" % (ref.encode("utf-8"), ident, ident, len(msg), msg))
+    for mark, rel in enumerate(paths, 1):
+        out.append(b"M %o :%d %s\n" % (_git_mode(files[rel][1]), mark, _quote(rel).encode("utf-8")))
+    out.append(b"\ndone\n")
+    return b"".join(out)
+
+
+def head_ref(git_dir: Path) -> str:
+    """Branch HEAD points at in a fresh repo (honours init.defaultBranch)."""
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return "refs/heads/master"
+    return head[5:] if head.startswith("ref: ") else "refs/heads/master"
+
+
+def uses_sha1(git_dir: Path) -> bool:
+    try:
+        return "objectformat" not in (git_dir / "config").read_text().lower()
+    except OSError:
+        return False
+
+
+def write_index(root: Path, files: dict[str, tuple[bytes, int]]):
+    """Write a version 2 .git/index matching files (as checked out under root)."""
+    entries = []
+    for rel in sorted(files, key=lambda r: r.encode("utf-8")):
+        data, mode = files[rel]
+        st = os.stat(root / rel)
+        path = rel.encode("utf-8")
+        oid = hashlib.sha1(b"blob %d\0" % len(data) + data).digest()
+        head = struct.pack(
+            ">10I20sH",
+            int(st.st_ctime) & 0xFFFFFFFF, st.st_ctime_ns % 10**9,
+            int(st.st_mtime) & 0xFFFFFFFF, st.st_mtime_ns % 10**9,
+            st.st_dev & 0xFFFFFFFF, st.st_ino & 0xFFFFFFFF, _git_mode(mode),
+            st.st_uid & 0xFFFFFFFF, st.st_gid & 0xFFFFFFFF, st.st_size & 0xFFFFFFFF,
+            oid, min(len(path), 0xFFF),
+        )
+        entry = head + path
+        entries.append(entry + b"\0" * (8 - len(entry) % 8))
+    body = b"DIRC" + struct.pack(">II", 2, len(entries)) + b"".join(entries)
+    (root / ".git/index").write_bytes(body + hashlib.sha1(body).digest())
@@ -1,5 +1,129 @@
 #!/usr/bin/env python3
+import json
+import os
 import sys
+import threading
+
+# The form shows its first prompt straight away: questionary (which pulls in
+# prompt_toolkit) is imported on a background thread and takes over from the
+# stdlib prompts at the first prompt after it has loaded. While the user types,
+# more threads warm up what runs after the form: the scaffolding modules,
+# compiled templates and type registry, the executables index and, in Advanced
+# mode, the doctor probes (whose results land in the doctor cache).
+#
+# Answers are remembered in $XDG_CACHE_HOME/aur-init/history.json and become the
+# defaults of the prompts a later session shows, wherever the CLI and profile
+# left the parser default. Options a session does not ask about (Simple mode
+# skips the Advanced prompts) keep their parser/profile values, and their
+# remembered answers are kept for the next Advanced session.
+
+# Answers carried over to the next session; package-specific and one-shot
+# answers (pkgname, description, url, dry-run, doctor, force) are not
+SIMPLE_KEYS = ("type", "maintainer", "license", "vcs", "git_init", "with_tests")
+ADVANCED_KEYS = ("gen_srcinfo", "add_ci", "with_man", "with_completions", "rust_lock", "strict", "explain")
+HISTORY_KEYS = ("mode", *SIMPLE_KEYS, *ADVANCED_KEYS)
+# Looked up by the scaffold and the post-scaffold steps
+PREFETCH_TOOLS = ("makepkg", "git", "cargo")
+
+
+class Task:
+    """fn(*args) running on a daemon thread."""
+
+    def __init__(self, fn, *args):
+        self._done = threading.Event()
+        self._value = None
+        self._error: BaseException | None = None
+        threading.Thread(target=self._run, args=(fn, args), daemon=True).start()
+
+    def _run(self, fn, args):
+        try:
+            self._value = fn(*args)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def result(self):
+        """The return value (waiting for it); re-raises what fn raised."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+def _load_questionary():
+    try:
+        import questionary  # type: ignore
+    except Exception:
+        return None
+    return questionary
+
+
+def _warm_templates():
+    import core  # noqa: F401  (imports the scaffolding modules)
+    from render import find_templates_dir, load_template
+    from typedefs import load_registry
+
+    load_registry()
+    tmpl = find_templates_dir() / "common/PKGBUILD.tmpl"
+    if tmpl.exists():
+        load_template(tmpl)
+
+
+def _warm_executables():
+    from executables import which
+
+    for name in PREFETCH_TOOLS:
+        which(name)
+
+
+def _warm_doctor(use_cache: bool):
+    from features import probe_tools
+
+    probe_tools(use_cache)
+
+
+def history_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aur-init", "history.json")
+
+
+def load_history() -> dict:
+    """The previous session's answers (HISTORY_KEYS only); {} when there are none."""
+    try:
+        with open(history_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: v for k, v in data.items() if k in HISTORY_KEYS} if isinstance(data, dict) else {}
+
+
+def save_history(answers: dict):
+    path = history_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({k: answers[k] for k in HISTORY_KEYS if k in answers}, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot write answer history {path}: {e}", file=sys.stderr)
+
+
+def _apply_history(args, history: dict, keys):
+    """Use remembered answers for the options in keys still at their parser default."""
+    from cli import parser_defaults
+
+    defaults = parser_defaults()
+    for key, value in history.items():
+        if key in keys and key in defaults and getattr(args, key, None) == defaults[key]:
+            setattr(args, key, value)
 
 
 def collect_interactive_inputs(args):
@@ -8,6 +132,12 @@ def collect_interactive_inputs(args):
     If the optional 'questionary' package is available, use it for nicer prompts.
     Otherwise, fall back to stdlib input()-based prompts so no extra deps are required.
     """
+    # Started first so the import and warm-ups overlap with the user typing
+    questionary_task = Task(_load_questionary)
+    templates = Task(_warm_templates)
+    warm = [templates, Task(_warm_executables)]
+    history = load_history()
+
     # Helper fallbacks
     def _err(msg: str):
         print(msg, file=sys.stderr)
@@ -42,17 +172,14 @@ def collect_interactive_inputs(args):
                     return choices[i - 1]
             print("Invalid selection, try again.")
 
-    # Try to use questionary if present
-    try:
-        import questionary  # type: ignore
-        use_q = True
-    except Exception:
-        questionary = None  # type: ignore
-        use_q = False
+    # questionary once its background import has finished, stdlib prompts until then
+    def _questionary():
+        return questionary_task.result() if questionary_task.done() else None
 
     # Unified adapters
     def ask_text(prompt: str, default: str = "") -> str:
-        if use_q:
+        questionary = _questionary()
+        if questionary is not None:
             res = questionary.text(prompt, default=(default or "")).ask()
             if res is None:
                 raise KeyboardInterrupt
@@ -60,7 +187,8 @@ def collect_interactive_inputs(args):
         return _input_text(prompt, default=(default or ""))
 
     def ask_confirm(prompt: str, default: bool = False) -> bool:
-        if use_q:
+        questionary = _questionary()
+        if questionary is not None:
             res = questionary.confirm(prompt, default=bool(default)).ask()
             if res is None:
                 raise KeyboardInterrupt
@@ -68,7 +196,8 @@ def collect_interactive_inputs(args):
         return bool(_input_confirm(prompt, default=bool(default)))
 
     def ask_select(prompt: str, choices: list[str], default: str | None = None):
-        if use_q:
+        questionary = _questionary()
+        if questionary is not None:
             res = questionary.select(prompt, choices=choices, default=(default or choices[0] if choices else None)).ask()
             if res is None:
                 raise KeyboardInterrupt
@@ -77,8 +206,15 @@ def collect_interactive_inputs(args):
 
     try:
         # Choose interaction depth first
-        mode = ask_select("Mode", choices=["Simple", "Advanced"], default="Simple")
+        mode_default = history.get("mode") if history.get("mode") in ("Simple", "Advanced") else "Simple"
+        mode = ask_select("Mode", choices=["Simple", "Advanced"], default=mode_default)
         advanced = (mode == "Advanced")
+        # Remembered answers only prefill prompts this mode shows
+        _apply_history(args, history, SIMPLE_KEYS + ADVANCED_KEYS if advanced else SIMPLE_KEYS)
+        asked = list(SIMPLE_KEYS)
+        if advanced:
+            # Only Advanced mode offers "Run doctor"
+            warm.append(Task(_warm_doctor, not getattr(args, "no_cache", False)))
 
         # pkgname next, as other defaults may depend on it
         pkgname = ask_text("Package name (pkgname)", default=(args.pkgname or ""))
@@ -86,8 +222,14 @@ def collect_interactive_inputs(args):
             _err("Error: pkgname is required.")
             sys.exit(2)
 
-        type_choices = ["", "python", "node", "go", "cmake", "rust"]
-        type_choice = ask_select("Project type", choices=type_choices, default=(args.type or ""))
+        from typedefs import load_registry, type_names
+
+        # Loaded by the warm-up by now; waiting avoids a second, racing registry load
+        templates.wait()
+        type_choices = type_names()
+        type_choice = ask_select("Project type", choices=type_choices, default=(args.type if args.type in type_choices else ""))
+        typedef = load_registry().get(type_choice)  # None for a type file that failed to load
+        cargo = typedef is not None and typedef.lockfile == "cargo"
 
         maintainer = ask_text("Maintainer", default=(args.maintainer or "vince <you@example.com>"))
         description = ask_text("Description", default=(args.description or "TODO: describe your package"))
@@ -99,7 +241,7 @@ def collect_interactive_inputs(args):
         license_ = ask_text("License", default=(args.license or "MIT"))
 
         vcs_choices = ["", "git"]
-        vcs = ask_select("VCS", choices=vcs_choices, default=(args.vcs or ""))
+        vcs = ask_select("VCS", choices=vcs_choices, default=(args.vcs if args.vcs in vcs_choices else ""))
 
         vcs_url = args.vcs_url
         if vcs == "git":
@@ -116,13 +258,16 @@ def collect_interactive_inputs(args):
         if advanced:
             gen_srcinfo = ask_confirm("Generate .SRCINFO?", default=bool(args.gen_srcinfo))
             add_ci = ask_confirm("Add CI workflow?", default=bool(args.add_ci))
+            asked += ["gen_srcinfo", "add_ci", "strict", "explain"]
             if type_choice:
+                asked += ["with_man", "with_completions"]
                 with_man = ask_confirm("Scaffold a minimal man page?", default=bool(getattr(args, "with_man", False)))
                 with_compl = ask_confirm("Scaffold shell completions (bash/zsh/fish)?", default=bool(getattr(args, "with_completions", False)))
             else:
                 with_man = False
                 with_compl = False
-            if type_choice == "rust":
+            if cargo:
+                asked.append("rust_lock")
                 rust_lock = ask_confirm("For Rust, generate Cargo.lock (requires cargo)?", default=bool(getattr(args, "rust_lock", False)))
             else:
                 rust_lock = False
@@ -137,7 +282,7 @@ def collect_interactive_inputs(args):
             add_ci = bool(getattr(args, "add_ci", False))
             with_man = False
             with_compl = False
-            rust_lock = False if type_choice != "rust" else bool(getattr(args, "rust_lock", False))
+            rust_lock = cargo and bool(getattr(args, "rust_lock", False))
             dry_run = bool(getattr(args, "dry_run", False))
             strict = bool(getattr(args, "strict", True))
             explain = bool(getattr(args, "explain", False))
@@ -165,6 +310,11 @@ def collect_interactive_inputs(args):
         args.explain = bool(explain)
         args.doctor = bool(doctor_flag)
         args.force = bool(force)
+        # Answers to prompts not shown this time stay as they were
+        save_history({**history, "mode": mode, **{k: getattr(args, k) for k in asked}})
+        # The scaffold (or doctor) runs next: let the warm-ups finish rather than redo them
+        for task in warm:
+            task.wait()
         return args
     except KeyboardInterrupt:
         _err("\nAborted by user (Ctrl+C). No files were created.")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+from pathlib import Path
+
+from pkgbuild import iter_assignments, parse_pkgbuild, is_local_source, is_vcs_source, local_source_path
+
+# Static PKGBUILD checks, run in-process instead of shelling out to awk/namcap.
+# Each finding is a dict: {"path", "line", "rule", "severity", "message"} with a
+# 1-based line (0 when it applies to the whole file) and severity "error" or
+# "warning". Only errors make `aur-init lint` fail.
+
+CHECKSUM_KEYS = ("md5sums", "sha1sums", "sha224sums", "sha256sums", "sha384sums", "sha512sums", "b2sums")
+REQUIRED = ("pkgname", "pkgver", "pkgrel", "arch")
+PLACEHOLDER_RE = re.compile(r"@[A-Z][A-Z0-9_]*@")
+CONFLICT_RE = re.compile(r"^(<{7} |={7}$|>{7} |\|{7} )")
+# Values aur-init fills in when nothing better was given
+DEFAULT_VALUES = {"pkgdesc": re.compile(r"^TODO\b"), "url": re.compile(r"^https?://example\.com(/|$)")}
+
+
+def _finding(path, line: int, rule: str, severity: str, message: str) -> dict:
+    return {"path": str(path), "line": line, "rule": rule, "severity": severity, "message": message}
+
+
+def infer_type(fields: dict) -> str | None:
+    """The language type whose dependencies the PKGBUILD declares (most specific wins)."""
+    from typedefs import load_registry
+
+    depends, makedepends = set(fields.get("depends") or ()), set(fields.get("makedepends") or ())
+    best, best_size, tie = None, 0, False
+    for name, t in load_registry().items():
+        size = len(t.depends) + len(t.makedepends)
+        if not size or not (set(t.depends) <= depends and set(t.makedepends) <= makedepends):
+            continue
+        if size > best_size:
+            best, best_size, tie = name, size, False
+        elif size == best_size:
+            tie = True
+    return None if tie else best
+
+
+def lint_text(text: str, pkgdir: Path, type_name: str | None = None) -> list[dict]:
+    """Findings for PKGBUILD text whose local sources live in pkgdir."""
+    path = pkgdir / "PKGBUILD"
+    out = []
+    fields = parse_pkgbuild(text)
+    lines = {name: start + 1 for name, _, _, start, _ in reversed(list(iter_assignments(text)))}
+
+    for key in REQUIRED:
+        if not fields.get(key):
+            out.append(_finding(path, 0, "missing-field", "error", f"{key} is not set"))
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if CONFLICT_RE.match(line):
+            out.append(_finding(path, lineno, "conflict-marker", "error", "unresolved merge conflict marker (see aur-init --update)"))
+        for m in PLACEHOLDER_RE.finditer(line):
+            out.append(_finding(path, lineno, "placeholder", "error", f"unexpanded template placeholder {m.group(0)}"))
+    for key, default_re in DEFAULT_VALUES.items():
+        value = fields.get(key)
+        if isinstance(value, str) and default_re.search(value):
+            out.append(_finding(path, lines.get(key, 0), "placeholder", "warning", f"{key} still has the default value {value!r}"))
+
+    sources = fields.get("source") or []
+    if isinstance(sources, str):
+        sources = [sources]
+    for entry in sources:
+        if is_local_source(entry) and "$" not in entry and not (pkgdir / local_source_path(entry)).is_file():
+            out.append(_finding(path, lines.get("source", 0), "missing-source", "error", f"local source {local_source_path(entry)} does not exist"))
+
+    sums_present = [k for k in CHECKSUM_KEYS if k in fields]
+    if sources and not sums_present:
+        out.append(_finding(path, lines.get("source", 0), "missing-checksums", "error", "source=() has no checksum array"))
+    for key in sums_present:
+        sums = fields[key] if isinstance(fields[key], list) else [fields[key]]
+        if len(sums) != len(sources):
+            out.append(_finding(path, lines.get(key, 0), "checksum-count", "error",
+                                f"{key} has {len(sums)} entries for {len(sources)} source(s)"))
+        for entry, digest in zip(sources, sums):
+            if digest == "SKIP" and not is_vcs_source(entry):
+                out.append(_finding(path, lines.get(key, 0), "skip-checksum", "error", f"SKIP checksum for non-VCS source {entry}"))
+
+    out += _check_arch(path, fields, lines.get("arch", 0), type_name)
+    return out
+
+
+def _check_arch(path: Path, fields: dict, line: int, type_name: str | None) -> list[dict]:
+    arch = fields.get("arch") or []
+    if isinstance(arch, str):
+        arch = [arch]
+    if not arch:
+        return []
+    if "any" in arch and len(arch) > 1:
+        return [_finding(path, line, "arch", "error", "'any' cannot be combined with other architectures")]
+    name = type_name if type_name is not None else infer_type(fields)
+    if not name:
+        return []
+    from typedefs import get_type
+
+    try:
+        expected = get_type(name).arch
+    except KeyError:
+        return [_finding(path, 0, "arch", "error", f"unknown type {name!r}")]
+    if "any" in arch and "any" not in expected:
+        return [_finding(path, line, "arch", "error", f"{name} packages build native code; arch=('any') is wrong (expected {' '.join(expected)})")]
+    if "any" in expected and "any" not in arch:
+        return [_finding(path, line, "arch", "warning", f"{name} packages are usually architecture-independent; arch=('any') expected")]
+    return []
+
+
+def lint_dir(pkgdir: str, type_name: str | None = None) -> list[dict]:
+    """Findings for pkgdir/PKGBUILD (an unreadable file is itself a finding)."""
+    d = Path(pkgdir)
+    try:
+        text = (d / "PKGBUILD").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return [_finding(d / "PKGBUILD", 0, "unreadable", "error", str(e))]
+    return lint_text(text, d, type_name)
+
+
+def _lint_one(job: tuple[str, str | None]) -> list[dict]:
+    return lint_dir(*job)
+
+
+def lint_tree(dirs: list[Path], jobs: int = 0, type_name: str | None = None) -> list[dict]:
+    """Lint every package dir, in a process pool when there are several. Findings keep dir order."""
+    todo = [(str(d), type_name) for d in dirs]
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, max(len(todo), 1))
+    if jobs == 1:
+        results = map(_lint_one, todo)
+        return [f for found in results for f in found]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(_lint_one, todo, chunksize=max(1, len(todo) // (jobs * 4)))
+        return [f for found in results for f in found]
+
+
+def report(findings: list[dict], packages: int, as_json: bool = False) -> int:
+    """Print findings (text or JSON) and return 1 if any is an error."""
+    errors = sum(1 for f in findings if f["severity"] == "error")
+    if as_json:
+        import json
+
+        print(json.dumps({"packages": packages, "errors": errors, "warnings": len(findings) - errors, "findings": findings}, indent=2))
+    else:
+        for f in findings:
+            where = f"{f['path']}:{f['line']}" if f["line"] else f["path"]
+            print(f"{where}: {f['severity']}: {f['message']} [{f['rule']}]")
+        print(f"{packages} package(s): {errors} error(s), {len(findings) - errors} warning(s)", file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from executables import which
+from timings import count
+
+# Bare mirror cache for --vcs git --vcs-mirror. All upstreams share one bare
+# repository, $XDG_CACHE_HOME/aur-init/mirrors/shared.git, so forks and -git
+# variants of a project share objects: mirroring a second fork is one
+# incremental fetch, not a full clone. Each URL gets its own ref namespace,
+#
+#   refs/remotes/<key>/HEAD, refs/remotes/<key>/heads/*, refs/remotes/<key>/tags/*
+#
+# with key = sha1(url)[:16], and pkgver is computed from it the same way the
+# generated pkgver() does: `git describe --tags --long | sed 's/^v//' | tr - .`,
+# or r<commits>.<hash> when upstream has no tags.
+
+KEY_LEN = 16
+
+
+def mirror_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "aur-init" / "mirrors"
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:KEY_LEN]
+
+
+def _git(git: str, repo: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    count("subprocesses")
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    return subprocess.run([git, "--git-dir", str(repo), *args], check=check, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def update_mirror(url: str, root: Path | None = None) -> tuple[str, Path, str]:
+    """Fetch url into the shared mirror (creating it on first use). Returns (git, repo, key).
+
+    Raises RuntimeError when git is missing or creating the mirror or the fetch fails.
+    """
+    from downloads import FileLock
+
+    git = which("git")
+    if git is None:
+        raise RuntimeError("git not found")
+    root = root or mirror_dir()
+    repo = root / "shared.git"
+    key = url_key(url)
+    root.mkdir(parents=True, exist_ok=True)
+    # One fetch at a time: concurrent fetches into one repo race on ref locks
+    with FileLock(root / "mirror.lock"):
+        if not (repo / "HEAD").is_file():
+            cp = _git(git, repo, "init", "--quiet", "--bare", check=False)
+            if cp.returncode != 0:
+                raise RuntimeError(cp.stderr.strip() or f"git init exited with {cp.returncode}")
+        cp = _git(git, repo, "fetch", "--quiet", "--prune", "--no-tags", url,
+                  f"+HEAD:refs/remotes/{key}/HEAD",
+                  f"+refs/heads/*:refs/remotes/{key}/heads/*",
+                  f"+refs/tags/*:refs/remotes/{key}/tags/*", check=False)
+    if cp.returncode != 0:
+        raise RuntimeError(cp.stderr.strip() or f"git fetch exited with {cp.returncode}")
+    count("mirror_fetches")
+    return git, repo, key
+
+
+def describe_pkgver(git: str, repo: Path, key: str) -> str:
+    """pkgver for the upstream HEAD mirrored under key."""
+    head = f"refs/remotes/{key}/HEAD"
+    cp = _git(git, repo, "describe", "--all", "--long", "--match", f"{key}/tags/*", head, check=False)
+    if cp.returncode == 0:
+        name = cp.stdout.strip()
+        # Lightweight tags show as remotes/<key>/tags/NAME, annotated ones as tags/NAME
+        for prefix in (f"remotes/{key}/tags/", "tags/"):
+            if name.startswith(prefix):
+                return re.sub(r"^v", "", name[len(prefix):]).replace("-", ".")
+    commits = _git(git, repo, "rev-list", "--count", head).stdout.strip()
+    short = _git(git, repo, "rev-parse", "--short", head).stdout.strip()
+    return f"r{commits}.{short}"
+
+
+def mirror_pkgver(url: str, root: Path | None = None) -> str:
+    """Update the mirror of url and return the pkgver of its default branch."""
+    git, repo, key = update_mirror(url, root)
+    try:
+        return describe_pkgver(git, repo, key)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.strip() or str(e))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import re
+import shlex
+
+# Minimal, static PKGBUILD reader: top-level scalar and array assignments only.
+# Functions are skipped and only $var/${var} references to earlier top-level
+# scalars are expanded, which covers what aur-init generates and typical AUR files.
+
+ASSIGN_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(\+?)=(.*)$")
+FUNC_RE = re.compile(r"^\s*(?:function\s+)?([A-Za-z_][A-Za-z0-9_-]*)\s*\(\s*\)\s*\{?\s*$")
+VAR_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _balance(text: str) -> int:
+    """Return paren depth change of text, ignoring quoted and commented parts."""
+    depth = 0
+    quote = ""
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if quote:
+            if c == "\\" and quote == '"':
+                i += 1
+            elif c == quote:
+                quote = ""
+        elif c in "'\"":
+            quote = c
+        elif c == "\\":
+            i += 1
+        elif c == "#" and (i == 0 or text[i - 1].isspace()):
+            break
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        i += 1
+    return depth
+
+
+def _expand(text: str, scope: dict) -> str:
+    """Expand $var/${var} outside single quotes using known scalars."""
+    out = []
+    for chunk in re.split(r"('[^']*'?)", text):
+        if chunk.startswith("'"):
+            out.append(chunk)
+            continue
+        out.append(VAR_RE.sub(lambda m: _lookup(m, scope), chunk))
+    return "".join(out)
+
+
+def _lookup(m: re.Match, scope: dict) -> str:
+    name = m.group(1) or m.group(2)
+    val = scope.get(name)
+    if isinstance(val, str):
+        return val
+    return m.group(0)
+
+
+def iter_statements(text: str):
+    """Yield (kind, name, is_append, raw_value, start_line, end_line) for top-level lines.
+
+    kind is "assign", "function" (name is the function name, raw_value empty) or
+    "other" (any other non-blank, non-comment line, name empty). Line numbers are
+    0-based and end_line is inclusive.
+    """
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        fm = FUNC_RE.match(line)
+        if fm:
+            start = i
+            func_depth = max(1, stripped.count("{") - stripped.count("}"))
+            if "{" not in stripped:
+                # Opening brace on the next line
+                func_depth = 0
+                if i + 1 < len(lines) and lines[i + 1].strip().startswith("{"):
+                    func_depth = 1
+                    i += 1
+            while func_depth and i + 1 < len(lines):
+                i += 1
+                inner = lines[i].strip()
+                func_depth += inner.count("{") - inner.count("}")
+            yield "function", fm.group(1), False, "", start, i
+            i += 1
+            continue
+        m = ASSIGN_RE.match(line)
+        if not m:
+            if stripped and not stripped.startswith("#"):
+                yield "other", "", False, line, i, i
+            i += 1
+            continue
+        name, append, value = m.group(1), bool(m.group(2)), m.group(3)
+        start = i
+        if value.startswith("("):
+            depth = _balance(value)
+            while depth > 0 and i + 1 < len(lines):
+                i += 1
+                value += "\n" + lines[i]
+                depth += _balance(lines[i])
+        yield "assign", name, append, value, start, i
+        i += 1
+
+
+def iter_assignments(text: str):
+    """Yield (name, is_append, raw_value, start_line, end_line) for top-level assignments.
+
+    Line numbers are 0-based and end_line is inclusive.
+    """
+    for kind, *rest in iter_statements(text):
+        if kind == "assign":
+            yield tuple(rest)
+
+
+def parse_pkgbuild(text: str) -> dict:
+    """Return top-level variables: strings for scalars, lists for arrays."""
+    scope: dict = {}
+    for name, append, value, _, _ in iter_assignments(text):
+        expanded = _expand(value, scope)
+        if expanded.startswith("("):
+            inner = expanded[1:expanded.rfind(")")] if ")" in expanded else expanded[1:]
+            try:
+                items = shlex.split(inner, comments=True)
+            except ValueError:
+                items = inner.split()
+            if append and isinstance(scope.get(name), list):
+                scope[name] = scope[name] + items
+            else:
+                scope[name] = items
+        else:
+            try:
+                parts = shlex.split(expanded, comments=True)
+            except ValueError:
+                parts = [expanded]
+            scope[name] = " ".join(parts)
+    return scope
+
+
+def format_array(name: str, values, multiline: bool = False) -> str:
+    quoted = [shlex.quote(v) if "'" in v else f"'{v}'" for v in values]
+    if multiline and values:
+        return f"{name}=(\n" + "".join(f"  {q}\n" for q in quoted) + ")"
+    return f"{name}=({' '.join(quoted)})"
+
+
+def replace_array(text: str, name: str, values) -> str:
+    """Replace the top-level array ``name`` (or append it after ``source``)."""
+    lines = text.splitlines(keepends=True)
+    for var, _, value, start, end in iter_assignments(text):
+        if var != name:
+            continue
+        multiline = end > start
+        trailing = "\n" if lines[end].endswith("\n") else ""
+        lines[start:end + 1] = [format_array(name, values, multiline) + trailing]
+        return "".join(lines)
+    for var, _, value, start, end in iter_assignments(text):
+        if var == "source":
+            multiline = end > start
+            lines.insert(end + 1, format_array(name, values, multiline) + "\n")
+            return "".join(lines)
+    sep = "" if text.endswith("\n") or not text else "\n"
+    return text + sep + format_array(name, values) + "\n"
+
+
+VCS_RE = re.compile(r"^(?:bzr|fossil|git|hg|svn)[+:]")
+
+
+def is_local_source(entry: str) -> bool:
+    """True for plain file sources (no URL scheme or VCS prefix)."""
+    target = entry.split("::", 1)[1] if "::" in entry else entry
+    return "://" not in target and not VCS_RE.match(target)
+
+
+def is_vcs_source(entry: str) -> bool:
+    target = entry.split("::", 1)[1] if "::" in entry else entry
+    return bool(VCS_RE.match(target))
+
+
+def local_source_path(entry: str) -> str:
+    """Return the path to the local file behind a source entry."""
+    return entry.split("::", 1)[1] if "::" in entry else entry
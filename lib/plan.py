@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import posixpath
+import sys
+import time
+from pathlib import Path
+
+from timings import count
+
+# A Plan is the complete set of files for a project, built in memory and
+# validated before any I/O. While a Plan is active, scaffold.write_file and
+# ensure_dir record paths under its root instead of touching the disk. The
+# output backends below then write it out: write_disk (staged directory),
+# write_tar (archive stream, e.g. stdout) or nothing at all (tests use
+# Plan.files directly).
+
+_ACTIVE: "Plan | None" = None
+
+
+class Plan:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # rel path -> (data, mode)
+        self.files: dict[str, tuple[bytes, int]] = {}
+        # directories to create even when empty
+        self.dirs: set[str] = set()
+        self._prev = None
+
+    def __enter__(self):
+        global _ACTIVE
+        self._prev, _ACTIVE = _ACTIVE, self
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        _ACTIVE = self._prev
+        return False
+
+    def relative(self, p: Path) -> str | None:
+        """p relative to the plan root ('' for the root), or None if outside it."""
+        if p == self.root:
+            return ""
+        try:
+            return p.relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def add_file(self, rel: str, data: bytes | str, mode: int = 0o644):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.files[rel] = (data, mode)
+
+    def add_dir(self, rel: str):
+        if rel:
+            self.dirs.add(rel)
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.files
+
+    def text(self, rel: str) -> str:
+        return self.files[rel][0].decode("utf-8")
+
+    def sha256(self, rel: str) -> str | None:
+        entry = self.files.get(posixpath.normpath(rel))
+        return hashlib.sha256(entry[0]).hexdigest() if entry else None
+
+    def all_dirs(self) -> list[str]:
+        """Every directory the plan needs (explicit ones and file parents), parents first."""
+        out = set()
+        for rel in [*self.dirs, *(posixpath.dirname(f) for f in self.files)]:
+            while rel:
+                out.add(rel)
+                rel = posixpath.dirname(rel)
+        return sorted(out)
+
+    def validate(self):
+        """Raise ValueError for unsafe paths, bad modes or file/directory clashes."""
+        for rel in [*self.files, *self.dirs]:
+            if not rel or rel.startswith("/") or posixpath.normpath(rel) != rel or rel.split("/")[0] == "..":
+                raise ValueError(f"unsafe path in plan: {rel!r}")
+        for rel, (_, mode) in self.files.items():
+            if not 0 <= mode <= 0o7777:
+                raise ValueError(f"bad mode {mode:o} for {rel}")
+        clash = set(self.files).intersection(self.all_dirs())
+        if clash:
+            raise ValueError(f"path is both a file and a directory: {sorted(clash)[0]}")
+
+
+def active() -> "Plan | None":
+    return _ACTIVE
+
+
+def write_disk(plan: Plan, target: Path, post=None):
+    """Write plan into a staged sibling of target and publish it with one rename.
+
+    post(root) runs inside the staged directory before publishing (git init, cargo).
+    """
+    from staging import Stage
+
+    with Stage(target) as stage:
+        for rel in plan.all_dirs():
+            stage.dir_fd(rel)
+        for rel, (data, mode) in plan.files.items():
+            stage.write(rel, data, mode)
+        if post is not None:
+            post(stage.path)
+        stage.publish()
+
+
+def _tar_mode(dest: str) -> str:
+    for suffix, comp in ((".gz", "gz"), (".tgz", "gz"), (".bz2", "bz2"), (".xz", "xz")):
+        if dest.endswith(suffix):
+            return "w|" + comp
+    return "w|"
+
+
+def write_tar(plan: Plan, dest: str, prefix: str):
+    """Stream plan as a tar archive under prefix/ to dest ('-' for stdout).
+
+    Entries are sorted, owned by root and stamped with $SOURCE_DATE_EPOCH (or now),
+    so identical plans give identical archives.
+    """
+    import io
+    import tarfile
+
+    mtime = int(os.environ.get("SOURCE_DATE_EPOCH") or time.time())
+
+    def info(name, kind, mode, size=0):
+        ti = tarfile.TarInfo(f"{prefix}/{name}" if name else prefix)
+        ti.type, ti.mode, ti.size, ti.mtime = kind, mode, size, mtime
+        ti.uid = ti.gid = 0
+        ti.uname = ti.gname = "root"
+        return ti
+
+    if dest == "-":
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    else:
+        out = open(dest, "wb")
+    try:
+        with tarfile.open(fileobj=out, mode=_tar_mode(dest), format=tarfile.PAX_FORMAT) as tar:
+            tar.addfile(info("", tarfile.DIRTYPE, 0o755))
+            for rel in plan.all_dirs():
+                tar.addfile(info(rel, tarfile.DIRTYPE, 0o755))
+            for rel in sorted(plan.files):
+                data, mode = plan.files[rel]
+                tar.addfile(info(rel, tarfile.REGTYPE, mode, len(data)), io.BytesIO(data))
+                count("files_written")
+    finally:
+        if dest == "-":
+            out.flush()
+        else:
+            out.close()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+# Profile discovery and parsing, cached in $XDG_CACHE_HOME/aur-init/profiles.marshal.
+#
+# An entry per lookup key (the --from-file value, or the XDG_CONFIG_HOME/HOME
+# pair for auto-discovery) stores the profile that was found with its size and
+# mtime_ns, plus the mtime_ns of every directory whose candidates were absent.
+# A hit costs a few stat calls: absent candidates are not re-checked while
+# their directory is unchanged, and TOML/JSON is not parsed at all.
+#
+# Profiles may define named presets that inherit from each other:
+#
+#   license = "MIT"
+#   [presets.rust-cli]
+#   type = "rust"
+#   with_man = true
+#   [presets.rust-full]
+#   inherit = "rust-cli"
+#   gen_srcinfo = true
+#
+# Presets are resolved when the cache entry is built: each is stored fully
+# merged over the top-level settings.
+
+CACHE_VERSION = 1
+
+
+def cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aur-init", "profiles.marshal")
+
+
+def candidates(from_file: str | None) -> list[str]:
+    if from_file:
+        return [os.path.expanduser(from_file)]
+    out = []
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    if xdg:
+        out += [os.path.join(xdg, "aur-init", "config.toml"), os.path.join(xdg, "aur-init", "config.json")]
+    home = os.path.join(os.path.expanduser("~"), ".config", "aur-init")
+    out += [os.path.join(home, "config.toml"), os.path.join(home, "config.json")]
+    return out
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _parse(path: str) -> dict:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        import tomllib
+
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    import json
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("profile must be a JSON object")
+    return data
+
+
+def resolve_presets(data: dict, source: str = "profile") -> dict:
+    """Split presets out of data and merge each over the top level, following inherit chains.
+
+    Returns the top-level settings with "presets" replaced by the resolved presets.
+    Unknown parents and cycles are reported and the affected preset is dropped.
+    """
+    raw = data.get("presets") or {}
+    base = {k: v for k, v in data.items() if k != "presets"}
+    if not isinstance(raw, dict):
+        print(f"Warning: {source}: presets must be a table; ignored", file=sys.stderr)
+        raw = {}
+    resolved: dict = {}
+
+    def merged(name: str, seen: tuple) -> dict | None:
+        if name in resolved:
+            return resolved[name]
+        preset = raw.get(name)
+        if not isinstance(preset, dict):
+            print(f"Warning: {source}: unknown preset {name!r} in {' -> '.join(seen)}", file=sys.stderr)
+            return None
+        if name in seen:
+            print(f"Warning: {source}: preset inheritance cycle {' -> '.join((*seen, name))}", file=sys.stderr)
+            return None
+        parent = preset.get("inherit")
+        out = merged(str(parent), (*seen, name)) if parent else base
+        if out is None:
+            return None
+        out = _merge(out, {k: v for k, v in preset.items() if k != "inherit"})
+        resolved[name] = out
+        return out
+
+    for name in raw:
+        merged(name, ())
+    return {**base, "presets": resolved}
+
+
+def _merge(base: dict, over: dict) -> dict:
+    """Shallow merge, except nested tables (e.g. [rust]) which are merged key by key."""
+    out = dict(base)
+    for k, v in over.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            out[k] = {**out[k], **v}
+        else:
+            out[k] = v
+    return out
+
+
+def _read_cache() -> dict:
+    import marshal
+
+    try:
+        with open(cache_path(), "rb") as f:
+            cache = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("entries") or {}
+
+
+def _write_cache(entries: dict):
+    import marshal
+
+    path = cache_path()
+    try:
+        data = marshal.dumps({"version": CACHE_VERSION, "entries": entries})
+    except ValueError:
+        return  # values marshal cannot store (e.g. TOML datetimes): just don't cache
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot write profile cache {path}: {e}", file=sys.stderr)
+
+
+def _entry_valid(entry: dict) -> bool:
+    for d, mtime in entry["absent_dirs"]:
+        if _mtime_ns(d) != mtime:
+            return False
+    path = entry["path"]
+    if path is None:
+        return True
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return [st.st_size, st.st_mtime_ns] == entry["stat"]
+
+
+def load(from_file: str | None = None, use_cache: bool = True) -> tuple[str | None, dict]:
+    """Find and parse the profile. Returns (path, settings) or (None, {}).
+
+    settings["presets"], when present, maps preset names to fully merged settings.
+    """
+    if from_file:
+        # Absolute, so the key and the candidate mean the same file from any cwd
+        from_file = os.path.abspath(os.path.expanduser(from_file))
+    key = from_file or f"auto:{os.environ.get('XDG_CONFIG_HOME', '')}:{os.path.expanduser('~')}"
+    entries = _read_cache() if use_cache else {}
+    entry = entries.get(key)
+    if entry is not None and _entry_valid(entry):
+        return entry["path"], entry["settings"]
+
+    absent_dirs: dict[str, int | None] = {}
+    for p in candidates(from_file):
+        d = os.path.dirname(p)
+        # Directory mtime first: a file created after the stat still invalidates the entry
+        mtime = _mtime_ns(d)
+        if not os.path.isfile(p):
+            absent_dirs.setdefault(d, mtime)
+            continue
+        if os.path.splitext(p)[1].lower() not in (".toml", ".json"):
+            continue
+        try:
+            st = os.stat(p)
+            settings = resolve_presets(_parse(p), p)
+        except Exception as e:
+            print(f"Warning: failed to load profile {p}: {e}", file=sys.stderr)
+            return (None, {})
+        found = {"path": p, "stat": [st.st_size, st.st_mtime_ns], "settings": settings}
+        break
+    else:
+        found = {"path": None, "stat": None, "settings": {}}
+    found["absent_dirs"] = [[d, m] for d, m in absent_dirs.items()]
+    # A missing --from-file is never cached: it is looked for again on every run
+    if use_cache and not (from_file and found["path"] is None):
+        entries[key] = found
+        _write_cache(entries)
+    return found["path"], found["settings"]
+
+
+def select(settings: dict, preset: str | None, source: str = "profile") -> dict | None:
+    """Settings for preset (or the top level when preset is None); None if it does not exist."""
+    if not preset:
+        return {k: v for k, v in settings.items() if k != "presets"}
+    presets = settings.get("presets") or {}
+    if preset not in presets:
+        names = ", ".join(sorted(presets)) or "none defined"
+        print(f"Unknown preset {preset!r} in {source} ({names})", file=sys.stderr)
+        return None
+    return presets[preset]
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import re
+import sys
 from pathlib import Path
 
 # Template directory resolution
@@ -15,53 +17,144 @@ def find_templates_dir() -> Path:
     return DEV_TPL_DIR
 
 
+# @KEY@ placeholders; capturing group makes re.split keep the key names
+PLACEHOLDER_RE = re.compile(r"@([A-Z][A-Z0-9_]*)@")
+
+
+class CompiledTemplate:
+    """A template split once into alternating literal and placeholder segments.
+
+    ``segments[0::2]`` are literals, ``segments[1::2]`` are placeholder keys.
+    """
+
+    __slots__ = ("name", "segments", "keys", "_warned")
+
+    def __init__(self, text: str, name: str = "<template>"):
+        self.name = name
+        self.segments = PLACEHOLDER_RE.split(text)
+        self.keys = frozenset(self.segments[1::2])
+        self._warned: set[str] = set()
+
+    @classmethod
+    def from_segments(cls, segments: list[str], name: str = "<template>") -> "CompiledTemplate":
+        """Rebuild a compiled template from its segments (e.g. from a snapshot) without re-parsing."""
+        self = cls.__new__(cls)
+        self.name = name
+        self.segments = list(segments)
+        self.keys = frozenset(self.segments[1::2])
+        self._warned = set()
+        return self
+
+    @property
+    def source(self) -> str:
+        return "".join(s if i % 2 == 0 else f"@{s}@" for i, s in enumerate(self.segments))
+
+    def render(self, replacements: dict) -> str:
+        self._check_keys(replacements)
+        parts = self.segments.copy()
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            parts[i] = replacements[key] if key in replacements else f"@{key}@"
+        return "".join(parts)
+
+    def _check_keys(self, replacements: dict):
+        # Warn once per template and key so batch runs do not flood stderr
+        unknown = self.keys.difference(replacements)
+        unused = set(replacements).difference(self.keys)
+        for kind, keys in (("unknown", unknown), ("unused", unused)):
+            for key in sorted(keys):
+                tag = f"{kind}:{key}"
+                if tag in self._warned:
+                    continue
+                self._warned.add(tag)
+                if kind == "unknown":
+                    print(f"Warning: {self.name}: placeholder @{key}@ has no value", file=sys.stderr)
+                else:
+                    print(f"Warning: {self.name}: value for {key} is not used by the template", file=sys.stderr)
+
+
+# path -> (mtime_ns, size, compiled)
+_TEMPLATE_CACHE: dict[Path, tuple[int, int, CompiledTemplate]] = {}
+
+
+def load_template(template_path: Path) -> CompiledTemplate:
+    """Return the compiled template, recompiling only when the file changed."""
+    st = template_path.stat()
+    cached = _TEMPLATE_CACHE.get(template_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    compiled = CompiledTemplate(template_path.read_text(), name=str(template_path))
+    _TEMPLATE_CACHE[template_path] = (st.st_mtime_ns, st.st_size, compiled)
+    return compiled
+
+
 def render_template(template_path: Path, replacements: dict) -> str:
-    content = template_path.read_text()
-    for k, v in replacements.items():
-        content = content.replace(f"@{k}@", v)
-    return content
+    return load_template(template_path).render(replacements)
+
+
+def arch_list(t: str) -> list[str]:
+    from typedefs import get_type
+
+    return list(get_type(t).arch)
 
 
 def compute_arch_line(t: str) -> str:
-    if t in ("go", "cmake", "rust"):
-        return "arch=('x86_64')"
-    return "arch=('any')"
+    return f"arch=({join_single_quoted(arch_list(t))})"
 
 
 def join_single_quoted(items) -> str:
-    return " ".join([f"'{x}'" for x in items])
+    return " ".join([f"'{escape_single_quoted(x)}'" for x in items])
 
 
-def compute_source_and_sha(local_sources, vcs, vcs_url, pkgname):
-    parts = []
-    sha = []
-    for s in local_sources:
-        parts.append(f"'{s}'")
-        sha.append("'SKIP'")
+def escape_single_quoted(value: str) -> str:
+    """value ready to go between '...' in bash: a quote closes, escapes and reopens."""
+    return value.replace("'", "'\\''")
+
+
+def escape_double_quoted(value: str) -> str:
+    """value ready to go between "..." in bash, so $, backticks, quotes and backslashes stay literal."""
+    return re.sub(r'([\\$`"])', r"\\\1", value)
+
+
+def source_entries(local_sources, vcs, vcs_url, pkgname, root: Path | None = None, plan=None, remote=()) -> tuple[list[str], list[str]]:
+    """Return the (source, sha256sums) arrays as plain values.
+
+    Local sources get real SHA-256 digests from ``plan`` (planned file contents)
+    or, failing that, from files under ``root``; everything else (missing files,
+    VCS sources) is 'SKIP'. ``remote`` holds (url, sha256) pairs for downloaded
+    sources, listed after the local ones.
+    """
+    sources = list(local_sources)
+    sums = ["SKIP"] * len(sources)
+    if plan is not None:
+        sums = [plan.sha256(s) or "SKIP" for s in sources]
+    if root is not None and "SKIP" in sums:
+        from checksums import local_sums
+
+        on_disk = local_sums(root, [s for s, d in zip(sources, sums) if d == "SKIP"])
+        it = iter(on_disk)
+        sums = [next(it) if d == "SKIP" else d for d in sums]
+    for url, digest in remote:
+        sources.append(url)
+        sums.append(digest)
     if vcs:
-        parts.append(f"'{pkgname}::{vcs}+{vcs_url}'")
-        sha.append("'SKIP'")
-    if parts:
-        return f"source=({ ' '.join(parts) })\nsha256sums=({ ' '.join(sha) })"
-    else:
-        return "source=()\nsha256sums=()"
+        sources.append(f"{pkgname}::{vcs}+{vcs_url}")
+        sums.append("SKIP")
+    return sources, sums
+
+
+def format_source_and_sha(sources, sums) -> str:
+    return f"source=({join_single_quoted(sources)})\nsha256sums=({join_single_quoted(sums)})"
+
+
+def compute_source_and_sha(local_sources, vcs, vcs_url, pkgname):
+    return format_source_and_sha(*source_entries(local_sources, vcs, vcs_url, pkgname))
 
 
 def build_block(t: str, vcs: bool) -> str:
-    lines = []
-    if not vcs and t == "go":
-        lines.append('  cd "$srcdir"; GOFLAGS="${GOFLAGS} -buildmode=pie -trimpath" go build -o "$pkgname" .')
-    if not vcs and t == "cmake":
-        lines.append('  cmake -S "$srcdir" -B "$srcdir/build" -DCMAKE_BUILD_TYPE=Release && cmake --build "$srcdir/build" --config Release')
-    if not vcs and t == "rust":
-        lines.append('  cd "$srcdir"; if [[ -f Cargo.lock ]]; then cargo build --release --frozen; else cargo build --release; fi')
-    if vcs and t == "go":
-        lines.append('  cd "$srcdir/$pkgname"; GOFLAGS="${GOFLAGS} -buildmode=pie -trimpath" go build -o "$pkgname" .')
-    if vcs and t == "cmake":
-        lines.append('  cmake -S "$srcdir/$pkgname" -B "$srcdir/build" -DCMAKE_BUILD_TYPE=Release && cmake --build "$srcdir/build" --config Release')
-    if vcs and t == "rust":
-        lines.append('  cd "$srcdir/$pkgname"; if [[ -f Cargo.lock ]]; then cargo build --release --frozen; else cargo build --release; fi')
-    return ("\n".join(lines) + ("\n" if lines else ""))
+    from typedefs import get_type
+
+    return get_type(t).build_block(vcs)
 
 
 def check_block(with_tests: bool) -> str:
@@ -74,32 +167,9 @@ def check_block(with_tests: bool) -> str:
 
 
 def package_block(t: str, vcs: bool) -> str:
-    lines = []
-    if not vcs and t == "python":
-        lines.append('  install -Dm644 "$srcdir/src/$pkgname/main.py" "$pkgdir/usr/share/$pkgname/main.py"')
-        lines.append('  install -Dm755 "$srcdir/bin/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if not vcs and t == "node":
-        lines.append('  install -Dm644 "$srcdir/src/main.js" "$pkgdir/usr/share/$pkgname/main.js"')
-        lines.append('  install -Dm755 "$srcdir/bin/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if not vcs and t == "go":
-        lines.append('  install -Dm755 "$srcdir/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if not vcs and t == "cmake":
-        lines.append('  install -Dm755 "$srcdir/build/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if not vcs and t == "rust":
-        lines.append('  install -Dm755 "$srcdir/target/release/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if vcs and t == "python":
-        lines.append('  install -Dm644 "$srcdir/$pkgname/src/$pkgname/main.py" "$pkgdir/usr/share/$pkgname/main.py"')
-        lines.append('  install -Dm755 "$srcdir/$pkgname/bin/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if vcs and t == "node":
-        lines.append('  install -Dm644 "$srcdir/$pkgname/src/main.js" "$pkgdir/usr/share/$pkgname/main.js"')
-        lines.append('  install -Dm755 "$srcdir/$pkgname/bin/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if vcs and t == "go":
-        lines.append('  install -Dm755 "$srcdir/$pkgname/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if vcs and t == "cmake":
-        lines.append('  install -Dm755 "$srcdir/build/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    if vcs and t == "rust":
-        lines.append('  install -Dm755 "$srcdir/$pkgname/target/release/$pkgname" "$pkgdir/usr/bin/$pkgname"')
-    return ("\n".join(lines) + ("\n" if lines else ""))
+    from typedefs import get_type
+
+    return get_type(t).package_block(vcs)
 
 
 def pkgver_block(vcs: bool) -> str:
@@ -1,20 +1,41 @@
 #!/usr/bin/env python3
-import os
-import shutil
 import subprocess
+import sys
 from pathlib import Path
 
+import plan
+import staging
+from executables import which
+from timings import count, traced
+
 
 def ensure_dir(p: Path):
-    p.mkdir(parents=True, exist_ok=True)
+    active = plan.active()
+    rel = active.relative(p) if active is not None else None
+    if rel is not None:
+        active.add_dir(rel)
+        return
+    try:
+        p.mkdir(parents=True)
+    except FileExistsError:
+        if not p.is_dir():
+            raise
+        return
+    count("dirs_created")
 
 
 def write_file(p: Path, data: str, mode=0o644):
+    """Write data to p with mode; paths under an active Plan are only recorded."""
+    active = plan.active()
+    rel = active.relative(p) if active is not None else None
+    if rel is not None:
+        active.add_file(rel, data, mode)
+        return
     ensure_dir(p.parent)
-    p.write_text(data)
-    os.chmod(p, mode)
+    staging.write_at(None, p, data, mode)
 
 
+@traced
 def scaffold_common_files(root: Path, pkgname: str):
     write_file(root / ".gitignore", """# Build artifacts
 /pkg/
@@ -63,53 +84,16 @@ After install, `{pkgname}` should be available on your `PATH` if a `bin/{pkgname
 """, 0o644)
 
 
+@traced
 def scaffold_template(root: Path, t: str, pkgname: str):
-    if t == "python":
-        ensure_dir(root / f"src/{pkgname}")
-        write_file(root / f"src/{pkgname}/main.py", f"""#!/usr/bin/env python3
-print(\"Hello from {pkgname} (python)\")
-""", 0o755)
-        write_file(root / f"bin/{pkgname}", f"""#!/usr/bin/env bash
-exec python3 "/usr/share/{pkgname}/main.py" "$@"
-""", 0o755)
-    elif t == "node":
-        ensure_dir(root / "src")
-        write_file(root / "src/main.js", f"""#!/usr/bin/env node
-console.log('Hello from {pkgname} (node)');
-""", 0o755)
-        write_file(root / f"bin/{pkgname}", f"""#!/usr/bin/env node
-require('/usr/share/{pkgname}/main.js')
-""", 0o755)
-    elif t == "go":
-        write_file(root / "main.go", """package main
-import "fmt"
-func main(){fmt.Println("Hello from GO")}
-""", 0o644)
-    elif t == "cmake":
-        ensure_dir(root / "src")
-        write_file(root / "CMakeLists.txt", f"""cmake_minimum_required(VERSION 3.10)
-project({pkgname})
-add_executable({pkgname} src/main.cpp)
-""", 0o644)
-        write_file(root / "src/main.cpp", f"""#include <iostream>
-int main(){{ std::cout << "Hello from {pkgname} (cmake)\\n"; return 0; }}
-""", 0o644)
-    elif t == "rust":
-        ensure_dir(root / "src")
-        write_file(root / "Cargo.toml", f"""[package]
-name = "{pkgname}"
-version = "0.1.0"
-edition = "2021"
-
-[dependencies]
-""", 0o644)
-        write_file(root / "src/main.rs", f"""fn main() {{
-    println!("Hello from {pkgname} (rust)");
-}}
-""", 0o644)
-    # else minimal: nothing
+    """Write the files declared by type t (templates/types/<t>.toml)."""
+    from typedefs import get_type
 
+    for rel, content, mode in get_type(t).render_files(pkgname):
+        write_file(root / rel, content, mode)
 
+
+@traced
 def maybe_scaffold_tests(root: Path, with_tests: bool):
     if with_tests:
         ensure_dir(root / "scripts/tests")
@@ -120,6 +104,7 @@ echo "Running basic test..."
 """, 0o755)
 
 
+@traced
 def maybe_scaffold_man(root: Path, pkgname: str, enabled: bool):
     if not enabled:
         return
@@ -135,6 +120,7 @@ Minimal man page scaffold generated by aur-init.
 """, 0o644)
 
 
+@traced
 def maybe_scaffold_completions(root: Path, pkgname: str, enabled: bool):
     if not enabled:
         return
@@ -158,13 +144,15 @@ complete -c {pkgname}
 """, 0o644)
 
 
-def maybe_generate_rust_lock(root: Path, enabled: bool):
+@traced
+def maybe_generate_rust_lock(root: Path, enabled: bool, timeout: float | None = None):
+    """Generate Cargo.lock with cargo when available; raises subprocess.CalledProcessError on failure."""
     if not enabled:
         return
-    # Generate Cargo.lock using cargo if available
-    if shutil.which("cargo") is None:
+    cargo = which("cargo")
+    if cargo is None:
+        print("cargo not found; skipping Cargo.lock", file=sys.stderr)
         return
-    try:
-        subprocess.run(["cargo", "generate-lockfile"], cwd=root, check=False)
-    except Exception:
-        pass
+    count("subprocesses")
+    subprocess.run([cargo, "generate-lockfile", "--quiet"], cwd=root, check=True, timeout=timeout,
+                   stderr=subprocess.PIPE)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+import re
+import sys
+from pathlib import Path
+
+# Field order used by makepkg's srcinfo.sh (srcinfo_write_global)
+SINGLE_VALUED = ("pkgdesc", "pkgver", "pkgrel", "epoch", "url", "install", "changelog")
+MULTI_VALUED = (
+    "arch", "groups", "license", "checkdepends", "makedepends",
+    "depends", "optdepends", "provides", "conflicts", "replaces",
+    "noextract", "options", "backup",
+    "source", "validpgpkeys",
+    "md5sums", "sha1sums", "sha224sums", "sha256sums", "sha384sums", "sha512sums", "b2sums",
+)
+
+
+def render_srcinfo(pkgbase: str, fields: dict) -> str:
+    """Render a single-package .SRCINFO from already-evaluated PKGBUILD fields.
+
+    Single-valued fields take a string, multi-valued fields a list of strings.
+    Empty and missing fields are omitted, as makepkg does.
+    """
+    lines = [f"pkgbase = {pkgbase}"]
+    for key in SINGLE_VALUED:
+        val = fields.get(key)
+        if val:
+            lines.append(f"\t{key} = {val}")
+    for key in MULTI_VALUED:
+        for val in fields.get(key) or ():
+            lines.append(f"\t{key} = {val}")
+    lines += ["", f"pkgname = {pkgbase}", ""]
+    return "\n".join(lines) + "\n"
+
+
+# makepkg's architecture suffixes for per-arch arrays (source_x86_64=...)
+ARCH_SUFFIX_RE = re.compile(r"^(" + "|".join(MULTI_VALUED) + r")_[A-Za-z0-9_]+$")
+REQUIRED = ("pkgname", "pkgver", "pkgrel", "arch")
+
+
+def native_srcinfo(text: str) -> str | None:
+    """Render .SRCINFO for PKGBUILD text without makepkg.
+
+    Returns None unless the PKGBUILD is a single package made of plain top-level
+    assignments that the static reader evaluates exactly: no other top-level
+    commands, command substitutions, escapes, unknown $references, pkgbase,
+    package_*() functions or per-architecture arrays.
+    """
+    from pkgbuild import VAR_RE, iter_statements, parse_pkgbuild
+
+    scalars: set = set()
+    for kind, name, append, value, _, _ in iter_statements(text):
+        if kind == "other" or (kind == "function" and name.startswith("package_")):
+            return None
+        if kind != "assign":
+            continue
+        if name == "pkgbase" or ARCH_SUFFIX_RE.match(name) or "\\" in value or "`" in value:
+            return None
+        if "$" in VAR_RE.sub("", value) or any((m.group(1) or m.group(2)) not in scalars for m in VAR_RE.finditer(value)):
+            return None
+        is_array = value.startswith("(")
+        if append and not is_array:
+            return None
+        if is_array:
+            scalars.discard(name)
+        else:
+            scalars.add(name)
+
+    fields = parse_pkgbuild(text)
+    if any(not fields.get(key) for key in REQUIRED):
+        return None
+    if not isinstance(fields["pkgname"], str) or any(isinstance(fields.get(k), list) for k in SINGLE_VALUED):
+        return None
+    for key in MULTI_VALUED:
+        if isinstance(fields.get(key), str):
+            fields[key] = [fields[key]]
+    return render_srcinfo(fields["pkgname"], fields)
+
+
+def makepkg_srcinfo(pkgbuild: str) -> str | None:
+    """Run `makepkg --printsrcinfo` on PKGBUILD text. Returns None without makepkg."""
+    import subprocess
+    import tempfile
+
+    from executables import which
+
+    makepkg = which("makepkg")
+    if makepkg is None:
+        return None
+    from timings import count
+
+    with tempfile.TemporaryDirectory() as td:
+        (Path(td) / "PKGBUILD").write_text(pkgbuild)
+        count("subprocesses")
+        return subprocess.check_output([makepkg, "--printsrcinfo"], cwd=td, text=True)
+
+
+def diff_srcinfo(native: str, reference: str) -> str:
+    """Return a unified diff between native and makepkg output ('' when byte-identical)."""
+    if native == reference:
+        return ""
+    import difflib
+
+    return "".join(
+        difflib.unified_diff(
+            reference.splitlines(keepends=True),
+            native.splitlines(keepends=True),
+            fromfile="makepkg --printsrcinfo",
+            tofile="aur-init",
+        )
+    )
+
+
+# --- Bulk regeneration (aur-init srcinfo) ---
+#
+# Package directories are found under a root, and each .SRCINFO is rendered
+# in-process by native_srcinfo, falling back to makepkg --printsrcinfo for any
+# PKGBUILD the static reader cannot evaluate exactly. --check instead compares
+# against makepkg --printsrcinfo whenever makepkg is installed, so it also catches
+# renderer mismatches. Work runs in a thread pool since the fallbacks are
+# subprocesses. The SHA-256 of every PKGBUILD and .SRCINFO written or verified is
+# recorded in $XDG_CACHE_HOME/aur-init/srcinfo.json; a directory whose two files
+# still match the record is skipped without rendering anything.
+
+# Directories never searched for packages: makepkg's build dirs inside a package
+SKIP_IN_PACKAGE = {"src", "pkg"}
+
+
+def find_package_dirs(root: Path) -> list[Path]:
+    """Every directory under root (root included) that holds a PKGBUILD, sorted."""
+    import os
+
+    out = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        is_package = "PKGBUILD" in filenames
+        if is_package:
+            out.append(Path(dirpath))
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and not (is_package and d in SKIP_IN_PACKAGE))
+    return sorted(out)
+
+
+def state_path() -> Path:
+    import os
+
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "aur-init" / "srcinfo.json"
+
+
+def _sha256(path: Path) -> str | None:
+    import hashlib
+
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def regenerate(pkgdir: Path, check: bool) -> tuple[str, list | None]:
+    """Bring one pkgdir/.SRCINFO up to date (or only compare it when check).
+
+    Returns (status, record); status is "updated", "current", "stale" or "failed".
+    """
+    import hashlib
+
+    from executables import which
+    from features import maybe_gen_srcinfo, printsrcinfo
+
+    pkgbuild_sha = _sha256(pkgdir / "PKGBUILD")
+    content = None
+    if pkgbuild_sha is not None and not (check and which("makepkg")):
+        content = native_srcinfo((pkgdir / "PKGBUILD").read_text(encoding="utf-8", errors="replace"))
+    if content is None:
+        content = printsrcinfo(pkgdir)
+    if pkgbuild_sha is None or content is None:
+        return "failed", None
+    record = [pkgbuild_sha, hashlib.sha256(content.encode("utf-8")).hexdigest()]
+    if _sha256(pkgdir / ".SRCINFO") == record[1]:
+        return "current", record
+    if check:
+        return "stale", None
+    maybe_gen_srcinfo(pkgdir, True, content)
+    return "updated", record
+
+
+def regenerate_tree(dirs: list[Path], jobs: int | None = None, check: bool = False, use_cache: bool = True) -> int:
+    """Regenerate (or with check, verify) .SRCINFO in every dir. Returns the exit code.
+
+    1 when any generation failed or, with check, any .SRCINFO is stale.
+    """
+    import json
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = state_path()
+    state: dict = {}
+    if use_cache:
+        try:
+            state = json.loads(store.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+        if not isinstance(state, dict):
+            state = {}
+
+    todo, skipped = [], 0
+    for d in dirs:
+        key = os.path.abspath(d)
+        rec = state.get(key)
+        if rec is not None and rec == [_sha256(d / "PKGBUILD"), _sha256(d / ".SRCINFO")]:
+            skipped += 1
+        else:
+            todo.append(d)
+
+    counts = {"updated": 0, "current": 0, "stale": 0, "failed": 0}
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(todo) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for d, (status, record) in zip(todo, pool.map(lambda d: regenerate(d, check), todo)):
+            counts[status] += 1
+            if status in ("updated", "stale"):
+                print(f"{status} {d / '.SRCINFO'}")
+            if record is not None:
+                state[os.path.abspath(d)] = record
+
+    if use_cache:
+        try:
+            store.parent.mkdir(parents=True, exist_ok=True)
+            tmp = store.with_suffix(".tmp")
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp, store)
+        except OSError as e:
+            print(f"Warning: cannot write .SRCINFO state {store}: {e}", file=sys.stderr)
+
+    summary = ", ".join(f"{n} {s}" for s, n in counts.items() if n or s != "failed")
+    print(f"{len(dirs)} package(s): {summary}, {skipped} skipped (PKGBUILD unchanged)", file=sys.stderr)
+    if counts["stale"]:
+        print("Stale .SRCINFO found; run `aur-init srcinfo` without --check to regenerate", file=sys.stderr)
+    return 1 if counts["failed"] or counts["stale"] else 0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import sys
+import time
+
+LIB_DIR = os.path.dirname(os.path.realpath(__file__))
+# In the zipapp build (zipbuild.py) LIB_DIR is the archive, which python runs as is
+ZIPAPP = os.path.isfile(LIB_DIR)
+ENTRY = LIB_DIR if ZIPAPP else os.path.join(LIB_DIR, "aur_init.py")
+
+
+def _own_modules() -> set[str]:
+    if ZIPAPP:
+        import zipfile
+
+        with zipfile.ZipFile(LIB_DIR) as zf:
+            names = zf.namelist()
+    else:
+        names = os.listdir(LIB_DIR)
+    return {os.path.splitext(name)[0] for name in names if name.endswith(".py") and name != "__main__.py"}
+
+
+# Modules that belong to aur-init itself (always listed and marked in the report)
+OWN_MODULES = _own_modules()
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse `-X importtime` output into (module, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cum_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        rows.append((parts[2].strip(), self_us, cum_us))
+    return rows
+
+
+def measure_wall_ms(cmd: list[str], runs: int = 5) -> float:
+    """Best-of-N wall time of a command in milliseconds (stdout/stderr discarded).
+
+    Raises subprocess.CalledProcessError when a run exits non-zero.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+# Arguments that already keep a scaffold command from writing into a project
+# directory (--output-tar writes an archive instead)
+READ_ONLY = {"-h", "--help", "--doctor", "--dry-run", "--output-tar"}
+# Subcommands that are safe to run repeatedly, with the flag that makes them so
+# (None: always); the others are only profiled with -h
+SUBCOMMAND_READ_ONLY = {"lint": None, "completions": None, "srcinfo": "--check"}
+
+
+def report_argv(argv: list[str]) -> list[str] | None:
+    """argv made safe to run several times, or None (with a message) when it would write."""
+    from aur_init import SUBCOMMANDS
+
+    flags = {a.split("=", 1)[0] for a in argv}
+    if argv and argv[0] in SUBCOMMANDS:
+        name = argv[0]
+        if flags & {"-h", "--help"} or (name in SUBCOMMAND_READ_ONLY and SUBCOMMAND_READ_ONLY[name] in (None, *flags)):
+            return argv
+        safe = ", ".join(f for f in ("-h", SUBCOMMAND_READ_ONLY.get(name)) if f)
+        print(f"--startup-report runs the command several times; profile `aur-init {name}` with {safe}", file=sys.stderr)
+        return None
+    if not READ_ONLY & flags:
+        return [*argv, "--dry-run"]
+    return argv
+
+
+def startup_report(argv: list[str], top: int = 25, runs: int = 5) -> int:
+    """Run `aur-init ARGV` in fresh interpreters and print per-module import cost.
+
+    The command runs several times, so --dry-run is added to a scaffold unless
+    ARGV is already read-only (-h, --doctor, --dry-run, --output-tar), and
+    subcommands that write are refused (2). Returns 1 if any run fails.
+    """
+    argv = report_argv(argv)
+    if argv is None:
+        return 2
+    cmd = [sys.executable, ENTRY, *argv]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", ENTRY, *argv],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(f"aur-init {' '.join(argv)} exited with status {proc.returncode}; no report", file=sys.stderr)
+        return 1
+    rows = parse_importtime(proc.stderr)
+    try:
+        wall = measure_wall_ms(cmd, runs)
+    except subprocess.CalledProcessError as e:
+        print(f"aur-init {' '.join(argv)} exited with status {e.returncode}; no report", file=sys.stderr)
+        return 1
+    bare = measure_wall_ms([sys.executable, "-c", "pass"], runs)
+    total_us = sum(r[1] for r in rows)
+
+    print(f"aur-init start-up report: aur-init {' '.join(argv) or '(no arguments)'}")
+    print(f"  wall time:   {wall:7.1f} ms  (best of {runs})")
+    print(f"  interpreter: {bare:7.1f} ms  (python -c pass)")
+    print(f"  overhead:    {wall - bare:7.1f} ms")
+    print(f"  imports:     {total_us / 1000:7.1f} ms across {len(rows)} modules (under -X importtime)")
+    print()
+    print(f"  {'self ms':>8} {'cum ms':>8}  module")
+    # Top N by self time, plus every aur-init module wherever it ranks
+    ranked = sorted(rows, key=lambda r: r[1], reverse=True)
+    for i, (name, self_us, cum_us) in enumerate(ranked):
+        own = name in OWN_MODULES
+        if i >= top and not own:
+            continue
+        mark = "  *" if own else ""
+        print(f"  {self_us / 1000:8.2f} {cum_us / 1000:8.2f}  {name}{mark}")
+    print("\n  * aur-init module")
+    return 0
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import subprocess
+import sys
+
+from timings import phase
+
+# Post-scaffold steps (cargo generate-lockfile, git init, the initial commit)
+# run as a small dependency graph on a thread pool: a step starts as soon as
+# the steps it comes after have succeeded, so independent subprocesses overlap.
+# Each step gets its own timeout, which it passes on to subprocess.run; a failed
+# or timed-out step is collected (and the steps after it are skipped) rather
+# than ignored.
+
+# Per-step timeouts in seconds
+TIMEOUTS = {"rust-lock": 600.0, "git-init": 30.0, "git-commit": 120.0}
+
+
+class Step:
+    """A named unit of work: run(timeout) is called once its after= steps succeeded."""
+
+    __slots__ = ("name", "run", "after", "timeout")
+
+    def __init__(self, name: str, run, after: tuple[str, ...] = (), timeout: float | None = None):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.timeout = timeout
+
+
+def _describe(e: BaseException, timeout: float | None) -> str:
+    if isinstance(e, subprocess.TimeoutExpired):
+        return f"timed out after {timeout or e.timeout:g}s"
+    if isinstance(e, subprocess.CalledProcessError):
+        detail = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
+        detail = detail.strip().splitlines()[-1] if detail.strip() else ""
+        return f"exit status {e.returncode}" + (f": {detail}" if detail else "")
+    return f"{type(e).__name__}: {e}"
+
+
+def _timed(step: Step):
+    with phase(f"step.{step.name}"):
+        return step.run(step.timeout)
+
+
+def run_steps(steps: list[Step], jobs: int | None = None) -> list[tuple[str, str]]:
+    """Run steps respecting their order constraints. Returns [(name, error)] for steps that failed or were skipped."""
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    by_name = {s.name: s for s in steps}
+    for s in steps:
+        unknown = [d for d in s.after if d not in by_name]
+        if unknown:
+            raise ValueError(f"step {s.name} comes after unknown step(s): {', '.join(unknown)}")
+    done: set[str] = set()
+    failures: list[tuple[str, str]] = []
+    failed: set[str] = set()
+    pending = list(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or max(1, len(steps))) as pool:
+        while pending or running:
+            for s in list(pending):
+                blocked = [d for d in s.after if d in failed]
+                if blocked:
+                    pending.remove(s)
+                    failed.add(s.name)
+                    failures.append((s.name, f"skipped: {blocked[0]} failed"))
+                elif all(d in done for d in s.after):
+                    pending.remove(s)
+                    running[pool.submit(_timed, s)] = s
+            if not running:
+                if pending:  # only reachable with a cycle
+                    raise ValueError(f"step order has a cycle: {', '.join(s.name for s in pending)}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                s = running.pop(fut)
+                e = fut.exception()
+                if e is None:
+                    done.add(s.name)
+                else:
+                    failed.add(s.name)
+                    failures.append((s.name, _describe(e, s.timeout)))
+    return failures
+
+
+def report_failures(failures: list[tuple[str, str]]) -> int:
+    """Print failures on stderr; returns 1 if there were any."""
+    for name, error in failures:
+        print(f"Post-scaffold step {name} failed: {error}", file=sys.stderr)
+    return 1 if failures else 0
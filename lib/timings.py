@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Phase timing and counters for --timings / --trace. Recording is off unless a
+# Recorder is active, in which case phase() and count() are a global check each.
+
+_ACTIVE: "Recorder | None" = None
+
+
+class Recorder:
+    def __init__(self):
+        self.t0 = time.perf_counter_ns()
+        # (name, start_ns, dur_ns, depth, tid)
+        self.events: list[tuple[str, int, int, int, int]] = []
+        self.counters: dict[str, int] = {}
+        # (ts_ns, snapshot of counters)
+        self.counter_events: list[tuple[int, dict[str, int]]] = []
+        self._depth = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._depth.value = depth
+            with self._lock:
+                self.events.append((name, start - self.t0, end - start, depth, threading.get_ident()))
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            self.counter_events.append((time.perf_counter_ns() - self.t0, dict(self.counters)))
+
+    def summary(self, out=None):
+        out = out or sys.stderr
+        totals: dict[str, list] = {}
+        for name, _, dur, depth, _ in sorted(self.events, key=lambda e: e[1]):
+            row = totals.setdefault(name, [0, 0, depth])
+            row[0] += 1
+            row[1] += dur
+        wall = max((s + d for _, s, d, _, _ in self.events), default=0)
+        print("aur-init timings:", file=out)
+        print(f"  {'phase':<40} {'calls':>5} {'ms':>9} {'%':>6}", file=out)
+        for name, (calls, dur, depth) in totals.items():
+            pct = 100.0 * dur / wall if wall else 0.0
+            label = "  " * depth + name
+            print(f"  {label:<40} {calls:>5} {dur / 1e6:>9.2f} {pct:>5.1f}%", file=out)
+        if self.counters:
+            print("  counters: " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())), file=out)
+
+    def chrome_trace(self) -> dict:
+        """Trace Event Format (loadable in Perfetto / chrome://tracing)."""
+        pid = os.getpid()
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "aur-init"}},
+        ]
+        for name, start, dur, depth, tid in self.events:
+            events.append({
+                "name": name, "cat": "aur-init", "ph": "X",
+                "ts": start / 1000, "dur": dur / 1000, "pid": pid, "tid": tid,
+                "args": {"depth": depth},
+            })
+        for ts, snapshot in self.counter_events:
+            events.append({"name": "counters", "ph": "C", "ts": ts / 1000, "pid": pid, "args": snapshot})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str):
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def phase(name: str):
+    rec = _ACTIVE
+    return rec.phase(name) if rec is not None else nullcontext()
+
+
+def count(name: str, n: int = 1):
+    rec = _ACTIVE
+    if rec is not None:
+        rec.count(name, n)
+
+
+def traced(fn):
+    """Decorator recording each call of fn as a phase named module.function."""
+    name = f"{fn.__module__}.{fn.__name__}"
+
+    def wrapper(*args, **kwargs):
+        rec = _ACTIVE
+        if rec is None:
+            return fn(*args, **kwargs)
+        with rec.phase(name):
+            return fn(*args, **kwargs)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__doc__ = fn.__doc__
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+@contextmanager
+def recording():
+    """Activate a fresh Recorder for the duration of the block."""
+    global _ACTIVE
+    prev = _ACTIVE
+    rec = Recorder()
+    _ACTIVE = rec
+    try:
+        yield rec
+    finally:
+        _ACTIVE = prev
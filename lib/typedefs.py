@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+
+# Language types are declared in templates/types/<name>.toml:
+#
+#   description = "..."
+#   arch = ["x86_64"]            # default ["any"]
+#   depends = [...]              # runtime deps
+#   makedepends = [...]
+#   sources = ["main.go"]        # local sources shipped when not using --vcs
+#   build = [...]                # build() body lines; build_vcs for --vcs
+#   package = [...]              # package() body lines; package_vcs for --vcs
+#   require_depends = true       # --strict fails when depends ends up empty
+#   lockfile = "cargo"           # --rust-lock / a profile [rust] section apply
+#   [[files]]                    # files scaffolded into the project
+#   path = "src/@PKGNAME@/main.py"
+#   mode = 0o755                 # default 0o644
+#   content = '''...'''
+#
+# Paths, sources and contents may use @PKGNAME@. The parsed registry is kept
+# in a marshal snapshot under $XDG_CACHE_HOME/aur-init, keyed by the names,
+# sizes and mtimes of the type files, so most runs never parse TOML.
+# This module only imports os/re/sys at load time: cli uses it for --type choices.
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+DEV_TEMPLATES_DIR = os.path.join(os.path.dirname(LIB_DIR), "templates")
+INSTALL_TEMPLATES_DIR = "/usr/share/aur-init/templates"
+
+NAME_RE = re.compile(r"[a-z0-9][a-z0-9+_-]*")
+LIST_KEYS = ("arch", "depends", "makedepends", "sources", "build", "build_vcs", "package", "package_vcs")
+PLACEHOLDERS = {"PKGNAME"}
+# Lock file generators a type may name (see features.maybe_generate_rust_lock)
+LOCKFILES = ("cargo",)
+SNAPSHOT_VERSION = 2
+# Menus and --help list the original types first, in their historic order
+BUILTIN_ORDER = ("python", "node", "go", "cmake", "rust")
+
+
+def types_dir() -> str:
+    """templates/types, resolved like render.find_templates_dir (dev tree first)."""
+    if os.path.isdir(DEV_TEMPLATES_DIR) or not os.path.isdir(INSTALL_TEMPLATES_DIR):
+        return os.path.join(DEV_TEMPLATES_DIR, "types")
+    return os.path.join(INSTALL_TEMPLATES_DIR, "types")
+
+
+def _scan(directory: str) -> list[tuple[str, int, int]]:
+    """(file name, mtime_ns, size) of every *.toml in directory, sorted."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+    out = []
+    for e in entries:
+        if e.name.endswith(".toml") and e.is_file():
+            st = e.stat()
+            out.append((e.name, st.st_mtime_ns, st.st_size))
+    return sorted(out)
+
+
+def type_names(directory: str | None = None) -> list[str]:
+    """'' (plain PKGBUILD) followed by the declared type names."""
+    names = [n[:-5] for n, _, _ in _scan(directory or types_dir()) if NAME_RE.fullmatch(n[:-5])]
+    rank = {n: i for i, n in enumerate(BUILTIN_ORDER)}
+    return [""] + sorted(names, key=lambda n: (rank.get(n, len(rank)), n))
+
+
+class TypeChoices:
+    """Lazy argparse choices for --type; the directory is only listed when needed."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory
+        self._names = None
+
+    def _get(self) -> list[str]:
+        if self._names is None:
+            self._names = type_names(self.directory)
+        return self._names
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __contains__(self, item) -> bool:
+        return item in self._get()
+
+    def __len__(self) -> int:
+        return len(self._get())
+
+
+class TypeDef:
+    """One language type with its placeholder templates precompiled."""
+
+    __slots__ = ("name", "description", "arch", "depends", "makedepends", "sources",
+                 "build", "build_vcs", "package", "package_vcs", "require_depends", "lockfile", "files")
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        self.description = data.get("description", "")
+        for key in LIST_KEYS:
+            setattr(self, key, list(data.get(key) or []))
+        self.arch = self.arch or ["any"]
+        self.require_depends = bool(data.get("require_depends", False))
+        self.lockfile = data.get("lockfile", "")
+        # (path template, content template, mode); data["files"] holds raw text
+        # (from TOML) or precompiled segments (from a snapshot)
+        self.files = []
+        for f in data.get("files") or []:
+            from render import CompiledTemplate
+
+            if "segments" in f:
+                path = CompiledTemplate.from_segments(f["path_segments"])
+                path.name = content_name = f"{name}:{path.source}"
+                content = CompiledTemplate.from_segments(f["segments"], name=content_name)
+            else:
+                path = CompiledTemplate(f["path"], name=f"{name}:{f['path']}")
+                content = CompiledTemplate(f["content"], name=f"{name}:{f['path']}")
+            self.files.append((path, content, f.get("mode", 0o644)))
+
+    def local_sources(self, pkgname: str) -> list[str]:
+        return [s.replace("@PKGNAME@", pkgname) for s in self.sources]
+
+    def build_block(self, vcs: bool) -> str:
+        lines = self.build_vcs if vcs else self.build
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def package_block(self, vcs: bool) -> str:
+        lines = self.package_vcs if vcs else self.package
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def render_files(self, pkgname: str) -> list[tuple[str, str, int]]:
+        values = {"PKGNAME": pkgname}
+        return [(path.render(_only(path, values)), content.render(_only(content, values)), mode)
+                for path, content, mode in self.files]
+
+    def snapshot(self) -> dict:
+        data = {key: getattr(self, key) for key in LIST_KEYS}
+        data["description"] = self.description
+        data["require_depends"] = self.require_depends
+        data["lockfile"] = self.lockfile
+        data["files"] = [{"path_segments": p.segments, "segments": c.segments, "mode": m} for p, c, m in self.files]
+        return data
+
+
+def _only(tpl, values: dict) -> dict:
+    return {k: v for k, v in values.items() if k in tpl.keys}
+
+
+GENERIC = TypeDef("", {})
+
+
+def _validate(name: str, data: dict):
+    """Raise ValueError when a type file does not follow the schema."""
+    known = {"description", "files", "require_depends", "lockfile", *LIST_KEYS}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"unknown key(s): {', '.join(unknown)}")
+    for key in LIST_KEYS:
+        value = data.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"{key} must be a list of strings")
+    if not isinstance(data.get("require_depends", False), bool):
+        raise ValueError("require_depends must be true or false")
+    if data.get("lockfile", "") not in ("", *LOCKFILES):
+        raise ValueError(f"lockfile must be one of: {', '.join(LOCKFILES)}")
+    for f in data.get("files", []):
+        if not isinstance(f, dict) or not isinstance(f.get("path"), str) or not isinstance(f.get("content"), str):
+            raise ValueError("each [[files]] entry needs string path and content")
+        if set(f) - {"path", "content", "mode"}:
+            raise ValueError(f"unknown key(s) in [[files]] {f['path']}")
+        if not isinstance(f.get("mode", 0o644), int) or not 0 <= f.get("mode", 0o644) <= 0o7777:
+            raise ValueError(f"bad mode for {f['path']}")
+        if f["path"].startswith("/") or ".." in f["path"].split("/"):
+            raise ValueError(f"unsafe path {f['path']!r}")
+        for text in (f["path"], f["content"]):
+            bad = set(re.findall(r"@([A-Z][A-Z0-9_]*)@", text)) - PLACEHOLDERS
+            if bad:
+                raise ValueError(f"unknown placeholder(s) in {f['path']}: {', '.join(sorted(bad))}")
+
+
+def _parse(directory: str, files: list) -> tuple[dict[str, dict], bool]:
+    """(name -> data, clean); broken files are skipped with a warning and clean is False."""
+    import tomllib
+
+    out = {}
+    clean = True
+    for fname, _, _ in files:
+        name = fname[:-5]
+        path = os.path.join(directory, fname)
+        if not NAME_RE.fullmatch(name):
+            print(f"Warning: {path}: invalid type name; ignored", file=sys.stderr)
+            clean = False
+            continue
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+            _validate(name, data)
+        except (OSError, ValueError) as e:  # tomllib.TOMLDecodeError is a ValueError
+            print(f"Warning: {path}: {e}; type ignored", file=sys.stderr)
+            clean = False
+            continue
+        out[name] = data
+    return out, clean
+
+
+def snapshot_path(directory: str) -> str:
+    import hashlib
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base, "aur-init", f"types-{key}.marshal")
+
+
+def _load_snapshot(path: str, fingerprint: list):
+    import marshal
+
+    try:
+        with open(path, "rb") as f:
+            snap = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snap, dict) or snap.get("version") != SNAPSHOT_VERSION or snap.get("fingerprint") != fingerprint:
+        return None
+    return snap.get("types")
+
+
+def _save_snapshot(path: str, fingerprint: list, types: dict):
+    import marshal
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump({"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "types": types}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot write type snapshot {path}: {e}", file=sys.stderr)
+
+
+# directory -> (fingerprint, registry)
+_REGISTRIES: dict[str, tuple[list, dict]] = {}
+
+
+def load_registry(directory: str | None = None) -> dict[str, TypeDef]:
+    """name -> TypeDef for every valid type file, plus '' for the plain PKGBUILD."""
+    directory = directory or types_dir()
+    fingerprint = [list(e) for e in _scan(directory)]
+    cached = _REGISTRIES.get(directory)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    snap = snapshot_path(directory)
+    raw = _load_snapshot(snap, fingerprint)
+    if raw is None:
+        parsed, clean = _parse(directory, fingerprint)
+        registry = {"": GENERIC}
+        registry.update((name, TypeDef(name, data)) for name, data in parsed.items())
+        if clean:  # keep warning about broken files until they are fixed
+            _save_snapshot(snap, fingerprint, {n: t.snapshot() for n, t in registry.items() if n})
+    else:
+        registry = {"": GENERIC}
+        registry.update((name, TypeDef(name, data)) for name, data in raw.items())
+    _REGISTRIES[directory] = (fingerprint, registry)
+    return registry
+
+
+def get_type(name: str) -> TypeDef:
+    """The TypeDef for name; raises KeyError for unknown types."""
+    return load_registry()[name or ""]
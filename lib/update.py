@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+from timings import count
+
+# --update: regenerate an existing project in place, touching only files whose
+# content changed. Each file of the new plan is compared with the disk (size
+# first, then content) and with the base, i.e. what aur-init generated last time:
+#
+#   disk == new                  unchanged (not written, mtime kept)
+#   disk == base                 changed (the template moved; no local edits)
+#   new == base                  kept (only the user edited it)
+#   otherwise                    three-way merge of base/disk/new; overlapping
+#                                edits get diff3-style conflict markers
+#
+# The base of a project is a marshal snapshot of its last generated plan under
+# $XDG_CACHE_HOME/aur-init/base, keyed by the project's absolute path, written
+# after every run that writes to disk. Without one (e.g. the project was moved),
+# the lines common to disk and new serve as the base. The directory is pruned
+# whenever a base is written: bases unused for BASE_MAX_AGE_DAYS are dropped,
+# then the oldest beyond MAX_BASES (one file per project, a few KiB each).
+
+BASE_VERSION = 1
+MAX_BASES = 256
+BASE_MAX_AGE_DAYS = 180
+STATUSES = ("added", "changed", "merged", "conflict", "kept", "unchanged")
+
+
+def base_path(target: Path) -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.abspath(target).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base, "aur-init", "base", f"{key}.marshal")
+
+
+def load_base(target: Path) -> dict[str, bytes]:
+    """rel -> content of the last generated plan for target ({} when unknown)."""
+    import marshal
+
+    try:
+        with open(base_path(target), "rb") as f:
+            snap = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if not isinstance(snap, dict) or snap.get("version") != BASE_VERSION:
+        return {}
+    return snap.get("files") or {}
+
+
+def record_base(target: Path, files: dict[str, tuple[bytes, int]]):
+    """Remember the generated content of files as the base of the next --update."""
+    import marshal
+
+    path = base_path(target)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump({"version": BASE_VERSION, "files": {rel: data for rel, (data, _) in files.items()}}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: cannot record update base {path}: {e}", file=sys.stderr)
+        return
+    prune_bases(os.path.dirname(path), MAX_BASES, BASE_MAX_AGE_DAYS)
+
+
+def prune_bases(directory: str, keep: int, max_age_days: int):
+    """Drop bases older than max_age_days, then the oldest beyond keep."""
+    import time
+
+    try:
+        with os.scandir(directory) as it:
+            bases = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(".marshal")]
+    except OSError:
+        return
+    bases.sort(reverse=True)  # newest first
+    cutoff = time.time() - max_age_days * 86400
+    for i, (mtime, path) in enumerate(bases):
+        if i >= keep or mtime < cutoff:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _sync_regions(base: list, a: list, b: list) -> list[tuple[int, int, int, int, int, int]]:
+    """Base ranges unchanged on both sides, as (base_start, base_end, a_start, a_end, b_start, b_end)."""
+    from difflib import SequenceMatcher
+
+    ma = SequenceMatcher(None, base, a, autojunk=False).get_matching_blocks()
+    mb = SequenceMatcher(None, base, b, autojunk=False).get_matching_blocks()
+    out = []
+    ia = ib = 0
+    while ia < len(ma) and ib < len(mb):
+        abase, amatch, alen = ma[ia]
+        bbase, bmatch, blen = mb[ib]
+        i, j = max(abase, bbase), min(abase + alen, bbase + blen)
+        if i < j:
+            asub, bsub = amatch + i - abase, bmatch + i - bbase
+            out.append((i, j, asub, asub + j - i, bsub, bsub + j - i))
+        if abase + alen < bbase + blen:
+            ia += 1
+        else:
+            ib += 1
+    out.append((len(base), len(base), len(a), len(a), len(b), len(b)))
+    return out
+
+
+def merge3(base: list[str], local: list[str], new: list[str], with_base: bool = True) -> tuple[list[str], int]:
+    """Line-based three-way merge. Returns (merged lines, number of conflicts).
+
+    Conflicting hunks are wrapped in <<<<<<< local / ||||||| base / ======= / >>>>>>> aur-init
+    markers (the base section only when with_base).
+    """
+    out: list[str] = []
+    conflicts = 0
+    iz = ia = ib = 0
+    for zs, ze, as_, ae, bs, be in _sync_regions(base, local, new):
+        z, a, b = base[iz:zs], local[ia:as_], new[ib:bs]
+        if a == b or z == b:
+            out += a
+        elif z == a:
+            out += b
+        else:
+            conflicts += 1
+            out.append("<<<<<<< local\n")
+            out += _terminated(a)
+            if with_base:
+                out.append("||||||| base\n")
+                out += _terminated(z)
+            out.append("=======\n")
+            out += _terminated(b)
+            out.append(">>>>>>> aur-init\n")
+        out += base[zs:ze]
+        iz, ia, ib = ze, ae, be
+    return out, conflicts
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+def _common_lines(a: list[str], b: list[str]) -> list[str]:
+    from difflib import SequenceMatcher
+
+    return [line for i, _, n in SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks() for line in a[i:i + n]]
+
+
+def _read(path: Path) -> bytes | None:
+    """Content of path, or None when it is missing or not a regular file."""
+    try:
+        with open(path, "rb") as f:
+            return f.read() if os.path.isfile(path) else None
+    except OSError:
+        return None
+
+
+def _replace(path: Path, data: bytes, mode: int):
+    """Write path atomically (temp file + rename) with mode."""
+    from staging import write_at
+
+    tmp = path.with_name(f".{path.name}.aur-init.tmp")
+    write_at(None, tmp, data, mode)
+    os.replace(tmp, path)
+
+
+def resolve(rel: str, new: bytes, local: bytes | None, base: bytes | None) -> tuple[str, bytes | None]:
+    """(status, content to write or None) for one file; see the module comment."""
+    if local is None:
+        return "added", new
+    if len(local) == len(new) and local == new:
+        return "unchanged", None
+    if base is not None and local == base:
+        return "changed", new
+    if base is not None and new == base:
+        return "kept", None
+    try:
+        local_lines = local.decode("utf-8").splitlines(keepends=True)
+        new_lines = new.decode("utf-8").splitlines(keepends=True)
+        base_lines = base.decode("utf-8").splitlines(keepends=True) if base is not None else None
+    except UnicodeDecodeError:
+        print(f"Warning: {rel} is not text and has local edits; kept", file=sys.stderr)
+        return "conflict", None
+    if base_lines is None:
+        base_lines = _common_lines(local_lines, new_lines)
+    merged, conflicts = merge3(base_lines, local_lines, new_lines, with_base=base is not None)
+    return ("conflict" if conflicts else "merged"), "".join(merged).encode("utf-8")
+
+
+def apply(plan, target: Path) -> dict[str, list[str]]:
+    """Bring target up to date with plan, writing only what changed. Returns status -> rel paths."""
+    target = Path(target)
+    base = load_base(target)
+    result: dict[str, list[str]] = {s: [] for s in STATUSES}
+    for rel in plan.all_dirs():
+        d = target / rel
+        if not d.is_dir():
+            d.mkdir(parents=True, exist_ok=True)
+            count("dirs_created")
+    for rel in sorted(plan.files):
+        new, mode = plan.files[rel]
+        path = target / rel
+        local = _read(path)
+        status, data = resolve(rel, new, local, base.get(rel))
+        if data is not None:
+            _replace(path, data, mode)
+        elif status == "unchanged" and os.stat(path).st_mode & 0o7777 != mode:
+            os.chmod(path, mode)
+            status = "changed"
+        result[status].append(rel)
+    record_base(target, plan.files)
+    return result
+
+
+def report(result: dict[str, list[str]], pkgname: str):
+    for status in STATUSES[:-1]:
+        for rel in result[status]:
+            print(f"  {status:<9} {pkgname}/{rel}")
+    counts = ", ".join(f"{len(result[s])} {s}" for s in STATUSES)
+    print(f"✅ Updated {pkgname}/: {counts}")
+    if result["conflict"]:
+        print(f"Resolve the conflict markers in: {', '.join(result['conflict'])}", file=sys.stderr)
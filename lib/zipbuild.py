@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Single-file distribution: every lib/*.py plus its precompiled bytecode in one
+# zipapp whose shebang runs the interpreter directly (no bash wrapper, no
+# directory probing). Modules are stored uncompressed next to unchecked-hash
+# .pyc files, so zipimport loads the bytecode without comparing it to the
+# source; the .py copies remain as a fallback when another Python version runs
+# the archive (bad magic number) and for tracebacks.
+#
+# Templates are not bundled: like the lib/ tree, the archive looks for a
+# templates/ directory next to it, then /usr/share/aur-init/templates.
+
+LIB_DIR = Path(__file__).resolve().parent
+DEFAULT_INTERPRETER = "/usr/bin/python3"
+
+# Entry point inside the archive; forwards to a running daemon like the wrapper
+MAIN = """\
+import os
+import stat
+import sys
+
+
+def main(argv):
+    if os.environ.get("AUR_INIT_NO_DAEMON", "0") != "1":
+        from client import default_socket_path
+
+        try:
+            daemon = stat.S_ISSOCK(os.stat(default_socket_path()).st_mode)
+        except OSError:
+            daemon = False
+        if daemon:
+            from client import main as forward
+
+            return forward(argv)
+    from aur_init import main as run
+
+    return run(argv)
+
+
+sys.exit(main(sys.argv[1:]))
+"""
+
+
+def _compile(src: Path, cfile: Path, optimize: int):
+    import py_compile
+
+    py_compile.compile(str(src), cfile=str(cfile), dfile=src.name, doraise=True, optimize=optimize,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+
+def build_zipapp(out: Path, interpreter: str = DEFAULT_INTERPRETER, lib_dir: Path = LIB_DIR, optimize: int = 0) -> list[str]:
+    """Write the aur-init zipapp to out (atomically). Returns the bundled module names.
+
+    Raises py_compile.PyCompileError when a module does not compile.
+    """
+    import zipapp
+
+    modules = sorted(p for p in lib_dir.glob("*.py") if p.name != "__main__.py")
+    with tempfile.TemporaryDirectory(prefix="aur-init-zipapp-") as stage:
+        stage = Path(stage)
+        for src in modules:
+            shutil.copy2(src, stage / src.name)
+            _compile(src, stage / f"{src.stem}.pyc", optimize)
+        (stage / "__main__.py").write_text(MAIN, encoding="utf-8")
+        _compile(stage / "__main__.py", stage / "__main__.pyc", optimize)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+        try:
+            zipapp.create_archive(stage, tmp, interpreter=interpreter)
+            os.replace(tmp, out)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    return [p.stem for p in modules]
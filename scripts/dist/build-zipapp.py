@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from pathlib import Path
+
+# Build target for the single-file distribution: lib/ precompiled into one
+# zipapp (see lib/zipbuild.py) that runs straight on the interpreter.
+#
+# Usage: scripts/dist/build-zipapp.py [-o FILE] [-p INTERPRETER] [-O]
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR / "lib"))
+
+
+def main(argv) -> int:
+    import py_compile
+
+    from zipbuild import DEFAULT_INTERPRETER, build_zipapp
+
+    ap = argparse.ArgumentParser(description="Build dist/aur-init.pyz, a precompiled single-file aur-init.")
+    ap.add_argument("-o", "--output", default=str(ROOT_DIR / "dist" / "aur-init.pyz"), metavar="FILE", help="Archive to write (default: %(default)s)")
+    ap.add_argument("-p", "--python", default=DEFAULT_INTERPRETER, metavar="INTERPRETER", help="Interpreter for the shebang line (default: %(default)s)")
+    ap.add_argument("-O", dest="optimize", action="count", default=0, help="Compile like python -O (-OO also drops docstrings)")
+    opts = ap.parse_args(argv)
+
+    out = Path(opts.output)
+    try:
+        modules = build_zipapp(out, interpreter=opts.python, optimize=opts.optimize)
+    except (OSError, py_compile.PyCompileError) as e:
+        print(f"Cannot build {out}: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {out} ({len(modules)} modules, {out.stat().st_size // 1024} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
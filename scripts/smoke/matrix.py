@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import io
+import itertools
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# Smoke matrix: every --type x --vcs x feature-flag combination, scaffolded
+# in-process (core.execute) by a pool of worker processes, each case in its own
+# directory. Every generated tree is then validated: `aur-init lint` must find no
+# errors, requested feature files must exist, local sources must match their
+# sha256sums, and .SRCINFO must agree with the PKGBUILD.
+#
+# Usage: scripts/smoke/matrix.py [-j N] [-k SUBSTRING] [--out DIR]
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR / "lib"))
+
+TYPES = ("", "python", "node", "go", "cmake", "rust")
+VCS = ("", "git")
+FEATURES = ("with_tests", "with_man", "with_completions", "add_ci", "gen_srcinfo")
+SHORT = {"with_tests": "tests", "with_man": "man", "with_completions": "compl", "add_ci": "ci", "gen_srcinfo": "srcinfo"}
+
+
+def cases() -> list[dict]:
+    out = []
+    for t, vcs in itertools.product(TYPES, VCS):
+        for bits in itertools.product((False, True), repeat=len(FEATURES)):
+            flags = dict(zip(FEATURES, bits))
+            name = "-".join([t or "minimal", vcs or "local"] + [SHORT[f] for f in FEATURES if flags[f]])
+            out.append({"id": name, "type": t, "vcs": vcs, **flags})
+    return out
+
+
+def _args(case: dict, pkgname: str):
+    from cli import parse_args
+
+    args = parse_args([pkgname, "--maintainer", "Smoke <smoke@example.org>", "--description", "Smoke test package",
+                       "--url", "https://example.org/smoke", "--license", "MIT"])
+    args.type = case["type"]
+    args.vcs = case["vcs"]
+    args.vcs_url = "https://example.org/smoke.git" if case["vcs"] else ""
+    for f in FEATURES:
+        setattr(args, f, case[f])
+    return args
+
+
+def expected_files(case: dict, pkgname: str) -> list[str]:
+    files = ["PKGBUILD", ".gitignore", "README.md"]
+    if case["with_tests"]:
+        files.append("scripts/tests/test.sh")
+    if case["with_man"]:
+        files.append(f"man/{pkgname}.1")
+    if case["with_completions"]:
+        files += [f"completions/bash/{pkgname}", f"completions/zsh/_{pkgname}", f"completions/fish/{pkgname}.fish"]
+    if case["add_ci"]:
+        files.append(".github/workflows/aur.yml")
+    if case["gen_srcinfo"]:
+        files.append(".SRCINFO")
+    return files
+
+
+def validate(case: dict, root: Path) -> list[str]:
+    """Problems found in the generated tree (empty when it is fine)."""
+    from lint import lint_dir
+    from pkgbuild import is_local_source, local_source_path, parse_pkgbuild
+
+    problems = [f"missing {rel}" for rel in expected_files(case, root.name) if not (root / rel).is_file()]
+    if problems:
+        return problems
+    problems += [f"lint: {f['message']} [{f['rule']}]" for f in lint_dir(str(root)) if f["severity"] == "error"]
+    fields = parse_pkgbuild((root / "PKGBUILD").read_text())
+    for entry, digest in zip(fields.get("source") or [], fields.get("sha256sums") or []):
+        if is_local_source(entry):
+            actual = hashlib.sha256((root / local_source_path(entry)).read_bytes()).hexdigest()
+            if actual != digest:
+                problems.append(f"sha256sums mismatch for {entry}")
+    if case["gen_srcinfo"]:
+        srcinfo = (root / ".SRCINFO").read_text()
+        for key in ("pkgver", "pkgrel"):
+            if f"\t{key} = {fields.get(key)}\n" not in srcinfo:
+                problems.append(f".SRCINFO {key} differs from PKGBUILD")
+        if srcinfo.count("\tsource = ") != len(fields.get("source") or []):
+            problems.append(".SRCINFO source count differs from PKGBUILD")
+    return problems
+
+
+def run_case(job: tuple[dict, str]) -> tuple[str, float, list[str], str]:
+    """Scaffold and validate one case in out_dir/<id>. Returns (id, seconds, problems, captured stderr)."""
+    from core import execute
+
+    case, out_dir = job
+    workdir = Path(out_dir) / case["id"]
+    workdir.mkdir(parents=True)
+    pkgname = f"smoke-{case['type'] or 'minimal'}"
+    err = io.StringIO()
+    start = time.perf_counter()
+    os.chdir(workdir)
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(err):
+            rc = execute(_args(case, pkgname))
+        problems = [f"exit status {rc}"] if rc else []
+    except Exception as e:
+        problems = [f"{type(e).__name__}: {e}"]
+    elapsed = time.perf_counter() - start
+    if not problems:
+        problems = validate(case, workdir / pkgname)
+    return case["id"], elapsed, problems, err.getvalue()
+
+
+def main(argv) -> int:
+    ap = argparse.ArgumentParser(description="Scaffold and validate every type x vcs x feature combination in parallel.")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N", help="Worker processes (default: number of CPUs)")
+    ap.add_argument("-k", "--filter", default="", metavar="SUBSTRING", help="Only run cases whose id contains SUBSTRING")
+    ap.add_argument("--out", default=None, metavar="DIR", help="Output directory, new or empty (default: .smoke/matrix-TIMESTAMP)")
+    opts = ap.parse_args(argv)
+
+    selected = [c for c in cases() if opts.filter in c["id"]]
+    if not selected:
+        print(f"No cases match {opts.filter!r}", file=sys.stderr)
+        return 2
+    out_dir = Path(opts.out or ROOT_DIR / ".smoke" / time.strftime("matrix-%Y%m%d-%H%M%S")).resolve()
+    if out_dir.is_dir() and any(out_dir.iterdir()):
+        print(f"{out_dir} is not empty; pass a new or empty --out directory", file=sys.stderr)
+        return 2
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Keep the user's caches out of the runs (update bases, type snapshots)
+    os.environ["XDG_CACHE_HOME"] = str(out_dir / ".cache")
+    os.environ.pop("SOURCE_DATE_EPOCH", None)
+
+    jobs = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), len(selected))
+    work = [(c, str(out_dir)) for c in selected]
+    start = time.perf_counter()
+    cwd = os.getcwd()
+    try:
+        if jobs == 1:
+            results = list(map(run_case, work))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(run_case, work, chunksize=max(1, len(work) // (jobs * 4))))
+    finally:
+        os.chdir(cwd)
+    wall = time.perf_counter() - start
+
+    failed = [r for r in results if r[2]]
+    for case_id, _, problems, err in failed:
+        print(f"[SMOKE] FAIL {case_id}")
+        for p in problems:
+            print(f"         {p}")
+        for line in err.strip().splitlines():
+            print(f"         stderr: {line}")
+    times = sorted(r[1] for r in results)
+    print(f"[SMOKE] {len(results) - len(failed)}/{len(results)} cases ok in {wall:.2f}s wall (jobs={jobs})")
+    print(f"[SMOKE] per case: median {times[len(times) // 2] * 1000:.1f} ms, max {times[-1] * 1000:.1f} ms, "
+          f"total {sum(times):.2f}s")
+    by_type: dict[str, list[float]] = {}
+    for case_id, elapsed, _, _ in results:
+        by_type.setdefault(case_id.split("-")[0], []).append(elapsed)
+    for t, ts in by_type.items():
+        print(f"[SMOKE]   {t:<8} {len(ts):>3} cases, mean {sum(ts) / len(ts) * 1000:6.1f} ms")
+    print(f"[SMOKE] Artifacts in: {out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -30,30 +30,10 @@ for t in "${types[@]}"; do
     continue
   fi
   pushd "$name" >/dev/null
-  # Local source validation: ensure files in source=() exist (ignores VCS/URLs)
-  if [[ -f PKGBUILD ]]; then
-    echo "[SMOKE] validate local sources in PKGBUILD"
-    mapfile -t SRC_LINES < <(awk '/^source=\(/, /^\)/ {print}' PKGBUILD)
-    SRC_JOINED=$(printf '%s' "${SRC_LINES[@]}")
-    # Strip leading 'source=(' and trailing ')', split on spaces
-    SRC_CONTENT=${SRC_JOINED#*source=(}
-    SRC_CONTENT=${SRC_CONTENT%)*}
-    # Iterate tokens
-    err=0
-    while read -r tok; do
-      [[ -z "$tok" ]] && continue
-      tok=${tok#\'}; tok=${tok%\'}
-      if [[ "$tok" == *://* || "$tok" == *::* ]]; then
-        continue
-      fi
-      if [[ ! -f "$tok" ]]; then
-        echo "[SMOKE] missing local source: $tok" >&2
-        err=1
-      fi
-    done < <(tr ' ' '\n' <<<"$SRC_CONTENT")
-    if [[ $err -ne 0 ]]; then
-      status=1
-    fi
+  # Static checks: local sources exist, checksums, placeholders, arch vs type
+  echo "[SMOKE] aur-init lint"
+  if ! "$AURINIT_BIN" lint .; then
+    status=1
   fi
 
   # Optional makepkg verification if explicitly enabled
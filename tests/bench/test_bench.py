@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import aur_init
+import bench
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def test_measure_reports_per_call_times():
+    res = bench.measure(lambda: sum(range(100)), repeat=3, min_time=0.001)
+    assert res["repeat"] == 3 and res["number"] >= 1
+    assert 0 < res["best_us"] <= res["median_us"]
+
+
+def test_compare_flags_only_regressions():
+    base = {"results": {"a": {"best_us": 10.0}, "b": {"best_us": 10.0}, "gone": {"best_us": 1.0}}}
+    cur = {"results": {"a": {"best_us": 12.0}, "b": {"best_us": 14.0}, "new": {"best_us": 5.0}}}
+    assert bench.compare(cur, base, threshold=0.25) == [("b", 10.0, 14.0, 1.4)]
+
+
+def test_every_hot_path_is_covered():
+    names = set(bench.benchmarks())
+    assert {"render.render_template", "render.build_block", "render.package_block",
+            "render.compute_source_and_sha", "startup.cold[-h]", "batch.throughput[per-package]"} <= names
+    assert sum(n.startswith("core.execute[") for n in names) == len(bench.TYPES) * len(bench.VCS)
+    # The saved baseline covers the same set, so comparisons are never silently partial
+    assert set(json.loads(BASELINE.read_text())["results"]) == names
+
+
+def test_bench_subcommand_fails_loudly_on_regression(tmp_path: Path, monkeypatch):
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps({"results": {"render.build_block": {"best_us": 1e-6}}}))
+    out = tmp_path / "out.json"
+    err = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", err)
+    rc = aur_init.main(["bench", "-k", "render.build_block", "--quick", "-o", str(out), "--baseline", str(fast)])
+    assert rc == 1
+    assert "REGRESSION" in err.getvalue()
+    data = json.loads(out.read_text())
+    assert list(data["results"]) == ["render.build_block"]
+    assert "python" in data["meta"]
+
+
+def test_benchmarks_leave_the_user_cache_alone(tmp_path: Path, monkeypatch):
+    user_cache = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(user_cache))
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    assert list(bench.run_benchmarks("core.execute?rust,git?", quick=True)["results"]) == ["core.execute[rust,git]"]
+    assert not user_cache.exists()
+    assert os.environ["XDG_CACHE_HOME"] == str(user_cache)
+
+
+@pytest.mark.skipif(not os.environ.get("AUR_INIT_BENCH"), reason="set AUR_INIT_BENCH=1 to compare against baseline.json")
+def test_no_regressions_against_saved_baseline():
+    results = bench.run_benchmarks()
+    regressions = bench.compare(results, json.loads(BASELINE.read_text()))
+    assert not regressions, regressions
@@ -1,8 +1,23 @@
 # Ensure tests can import modules from lib/
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 LIB = ROOT / "lib"
 if str(LIB) not in sys.path:
     sys.path.insert(0, str(LIB))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_cache_home(tmp_path_factory):
+    # Keep caches written by the code under test (type snapshots etc.) out of ~/.cache
+    old = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = str(tmp_path_factory.mktemp("xdg-cache"))
+    yield
+    if old is None:
+        os.environ.pop("XDG_CACHE_HOME", None)
+    else:
+        os.environ["XDG_CACHE_HOME"] = old
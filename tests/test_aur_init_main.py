@@ -17,7 +17,7 @@ def test_main_dry_run_no_summary(monkeypatch, tmp_path: Path):
 
 
 def test_main_doctor_suppresses_summary(monkeypatch):
-    monkeypatch.setattr(aur_init, "doctor", lambda: 0)
+    monkeypatch.setattr(aur_init, "doctor", lambda **kw: 0)
     err = io.StringIO()
     monkeypatch.setattr(aur_init.sys, "stderr", err)
     rc = aur_init.main(["--doctor"])  # returns before summary/execute
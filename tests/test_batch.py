@@ -0,0 +1,93 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+import aur_init
+import batch
+import cli
+
+
+def _base():
+    return cli.parse_args(["_"])
+
+
+def test_load_specs_toml_merges_defaults(tmp_path: Path):
+    m = tmp_path / "specs.toml"
+    m.write_text("""
+[defaults]
+license = "GPL-3.0-or-later"
+
+[[package]]
+pkgname = "one"
+type = "go"
+
+[[package]]
+pkgname = "two"
+license = "MIT"
+""".strip())
+    specs = batch.load_specs(m)
+    assert specs == [
+        {"license": "GPL-3.0-or-later", "pkgname": "one", "type": "go"},
+        {"license": "MIT", "pkgname": "two"},
+    ]
+
+
+def test_load_specs_jsonl_skips_comments(tmp_path: Path):
+    m = tmp_path / "specs.jsonl"
+    m.write_text('# comment\n{"pkgname": "a"}\n\n{"pkgname": "b", "type": "rust"}\n')
+    assert [s["pkgname"] for s in batch.load_specs(m)] == ["a", "b"]
+
+
+def test_load_specs_rejects_unknown_format(tmp_path: Path):
+    m = tmp_path / "specs.yaml"
+    m.write_text("")
+    try:
+        batch.load_specs(m)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "Unsupported manifest format" in str(e)
+
+
+def test_run_batch_inline_reports_failures(tmp_path: Path, monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    specs = [
+        {"pkgname": "good-py", "type": "python"},
+        {"pkgname": "BadName"},
+        {"pkgname": "typo", "tpye": "go"},
+    ]
+    rc = batch.run_batch(specs, _base(), jobs=1, output_dir=str(tmp_path))
+    assert rc == 1
+    o = out.getvalue()
+    assert "ok   good-py" in o
+    assert "FAIL BadName (rc=2)" in o and "Invalid pkgname" in o
+    assert "unknown key(s) in spec: tpye" in o
+    assert (tmp_path / "good-py/PKGBUILD").exists()
+    assert not (tmp_path / "BadName").exists()
+
+
+def test_run_batch_process_pool(tmp_path: Path, monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    specs = [{"pkgname": f"p{i}", "type": t} for i, t in enumerate(["", "go", "rust", "node"])]
+    rc = batch.run_batch(specs, _base(), jobs=2, output_dir=str(tmp_path))
+    assert rc == 0
+    for s in specs:
+        assert (tmp_path / s["pkgname"] / "PKGBUILD").exists()
+    assert out.getvalue().count("ok   ") == 4
+
+
+def test_main_dispatches_batch(tmp_path: Path, monkeypatch):
+    m = tmp_path / "specs.jsonl"
+    m.write_text(json.dumps({"pkgname": "via-main", "type": "go"}) + "\n")
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "nocfg"))
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    err = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", err)
+    rc = aur_init.main(["batch", str(m), "-j", "1", "-C", str(tmp_path)])
+    assert rc == 0
+    assert "batch: 1 ok, 0 failed" in err.getvalue()
+    assert "makedepends=('go')" in (tmp_path / "via-main/PKGBUILD").read_text()
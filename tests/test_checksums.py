@@ -0,0 +1,95 @@
+import hashlib
+import io
+import os
+import sys
+from pathlib import Path
+
+import aur_init
+import checksums
+import core
+from test_core import _args
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_sha256_file_small_and_mmap(tmp_path: Path, monkeypatch):
+    small = tmp_path / "small"
+    small.write_bytes(b"hello")
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    big = tmp_path / "big"
+    big.write_bytes(b"x" * 4096)
+    monkeypatch.setattr(checksums, "MMAP_THRESHOLD", 1024)
+    assert checksums.sha256_file(small) == _sha(b"hello")
+    assert checksums.sha256_file(empty) == _sha(b"")
+    assert checksums.sha256_file(big) == _sha(b"x" * 4096)
+
+
+def test_hash_files_uses_cache_for_unchanged_files(tmp_path: Path, monkeypatch):
+    files = []
+    for i in range(3):
+        f = tmp_path / f"f{i}"
+        f.write_text(f"content {i}")
+        files.append(f)
+    cache = checksums.DigestCache()
+    first = checksums.hash_files(files, cache=cache)
+    assert first[files[0].resolve()] == _sha(b"content 0")
+
+    reads = []
+    real = checksums.sha256_file
+    monkeypatch.setattr(checksums, "sha256_file", lambda p: reads.append(p) or real(p))
+    checksums.hash_files(files, cache=cache)
+    assert reads == []
+    files[1].write_text("changed!!")
+    again = checksums.hash_files(files, cache=cache)
+    assert reads == [files[1].resolve()]
+    assert again[files[1].resolve()] == _sha(b"changed!!")
+
+
+def test_digest_cache_persists(tmp_path: Path):
+    f = tmp_path / "f"
+    f.write_text("x")
+    store = tmp_path / "cache/sha256.json"
+    cache = checksums.DigestCache(store)
+    checksums.hash_files([f], cache=cache)
+    cache.save()
+    reloaded = checksums.DigestCache(store)
+    assert reloaded.get(f.resolve(), f.stat()) == _sha(b"x")
+
+
+def test_local_sums_keep_skip_for_vcs_and_missing(tmp_path: Path):
+    (tmp_path / "a").write_text("a")
+    sums = checksums.local_sums(tmp_path, ["a", "missing", "p::git+https://x.git"])
+    assert sums == [_sha(b"a"), "SKIP", "SKIP"]
+
+
+def test_execute_writes_real_sums(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    assert core.execute(_args(pkgname="p", type="go", dry_run=False)) == 0
+    text = (tmp_path / "p/PKGBUILD").read_text()
+    digest = _sha((tmp_path / "p/main.go").read_bytes())
+    assert f"sha256sums=('{digest}')" in text
+
+
+def test_updpkgsums_subcommand(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    d = tmp_path / "pkg"
+    d.mkdir()
+    (d / "local.patch").write_text("patch")
+    (d / "PKGBUILD").write_text(
+        "pkgname=pkg\n"
+        "source=('local.patch' 'https://e/x.tar.gz' 'pkg::git+https://e/x.git')\n"
+        "sha256sums=('SKIP' 'abc' 'SKIP')\n"
+    )
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    assert aur_init.main(["updpkgsums", str(d), str(tmp_path / "nope")]) == 1
+    text = (d / "PKGBUILD").read_text()
+    assert f"sha256sums=('{_sha(b'patch')}' 'abc' 'SKIP')" in text
+    assert f"updated {d / 'PKGBUILD'}" in out.getvalue()
+    assert (tmp_path / "cache/aur-init/sha256.json").exists()
+    assert aur_init.main(["updpkgsums", str(d)]) == 0
+    assert f"unchanged {d / 'PKGBUILD'}" in out.getvalue()
@@ -0,0 +1,78 @@
+import shutil
+import subprocess
+
+import pytest
+
+import aur_init
+import cli
+import completions
+
+
+def _option(desc, flag):
+    return next(o for _, options in desc["groups"] for o in options if flag in o["flags"])
+
+
+def test_every_subcommand_has_a_parser():
+    assert list(cli.SUBCOMMAND_PARSERS) == list(aur_init.SUBCOMMANDS)
+
+
+def test_describe_main_parser_keeps_groups_and_choices():
+    desc = completions.describe(cli._build_parser())
+    titles = [title for title, _ in desc["groups"]]
+    assert titles[1:] == ["Project metadata", "Source/VCS", "Features", "Modes & UX", "Profiles & Config"]
+    t = _option(desc, "--type")
+    assert t["flags"] == ["-t", "--type"] and t["kind"] == "choices"
+    assert "python" in t["choices"] and "" not in t["choices"]
+    assert _option(desc, "--vcs")["choices"] == ["git"]
+    assert _option(desc, "--strict")["excludes"] == ["--no-strict"]
+    assert _option(desc, "--source-url")["repeat"] is True
+    assert _option(desc, "--from-file")["kind"] == "file"
+    assert _option(desc, "--dry-run")["kind"] == "flag"
+
+
+def test_scripts_do_not_embed_machine_defaults():
+    socket = cli._build_serve_parser().get_default("socket")
+    for shell in completions.SHELLS:
+        script = completions.generate(shell)
+        assert socket not in script
+        if shell != "bash":  # bash shows no descriptions
+            assert "[Unix socket path]" in script or "'Unix socket path'" in script
+
+
+def _bash_complete(tmp_path, *words):
+    script = tmp_path / "aur-init.bash"
+    script.write_text(completions.generate("bash"))
+    cmd = (f'source "{script}"; COMP_WORDS=(aur-init {" ".join(repr(w) for w in words)}); '
+           f'COMP_CWORD={len(words)}; _aur_init; printf "%s\\n" "${{COMPREPLY[@]}}"')
+    cp = subprocess.run(["bash", "-c", cmd], cwd=tmp_path, capture_output=True, text=True, check=True)
+    return cp.stdout.split()
+
+
+def test_bash_completion(tmp_path):
+    (tmp_path / "pkgs").mkdir()
+    assert "batch" in _bash_complete(tmp_path, "b")
+    assert _bash_complete(tmp_path, "--vcs-") == ["--vcs-url", "--vcs-mirror"]
+    assert "rust" in _bash_complete(tmp_path, "-t", "")
+    assert _bash_complete(tmp_path, "--maintainer", "") == []
+    assert _bash_complete(tmp_path, "lint", "--j") == ["--jobs", "--json"]
+    assert _bash_complete(tmp_path, "lint", "p") == ["pkgs"]
+    assert _bash_complete(tmp_path, "completions", "") == ["bash", "zsh", "fish"]
+    # A package name is free text: no subcommands after the first word
+    assert _bash_complete(tmp_path, "mypkg", "b") == []
+
+
+@pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+def test_scripts_parse(shell, tmp_path):
+    if shutil.which(shell) is None:
+        pytest.skip(f"{shell} not installed")
+    script = tmp_path / f"aur-init.{shell}"
+    script.write_text(completions.generate(shell))
+    subprocess.run([shell, "-n", str(script)], check=True)
+
+
+def test_completions_subcommand_prints_script(capsys):
+    assert aur_init.main(["completions", "zsh"]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("#compdef aur-init\n")
+    assert "'(-t --type)'{-t,--type}" in out
+    assert "'lint:Check PKGBUILDs statically'" in out
@@ -0,0 +1,152 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import client
+import daemon
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def server(tmp_path: Path):
+    sock = str(tmp_path / "d.sock")
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "lib/aur_init.py"), "serve", "--socket", sock],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # The socket file exists once bound, before the server accepts: wait for a ping
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            client.request(sock, {"op": "ping"}, timeout=1.0)
+            break
+        except (OSError, ValueError):
+            pass
+        if time.monotonic() > deadline or proc.poll() is not None:
+            proc.kill()
+            pytest.fail("daemon did not start")
+        time.sleep(0.02)
+    yield sock
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not os.path.exists(sock)
+
+
+def test_parent_keeps_the_parsed_profile(server, tmp_path: Path):
+    cfg = tmp_path / "p.toml"
+    cfg.write_text('license = "BSD"\n')
+    assert client.request(server, {"op": "ping"})["profiles"] == 0
+    resp = client.request(server, {"op": "scaffold", "argv": ["--from-file", str(cfg), "kept"], "cwd": str(tmp_path)})
+    assert resp["rc"] == 0, resp
+    assert "license=('BSD')" in (tmp_path / "kept/PKGBUILD").read_text()
+    # Each ping runs in a fresh child forked from the parent: the profile is in its cache now
+    assert client.request(server, {"op": "ping"})["profiles"] == 1
+    again = client.request(server, {"op": "dry-run", "argv": ["--from-file", str(cfg), "again"], "cwd": str(tmp_path)})
+    assert "license=('BSD')" in again["stdout"]
+    assert client.request(server, {"op": "ping"})["profiles"] == 1
+
+
+def test_relative_profile_resolves_against_request_cwd(server, tmp_path: Path):
+    for name, lic in (("a", "BSD"), ("b", "ISC")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "p.toml").write_text(f'license = "{lic}"\n')
+        resp = client.request(server, {"op": "dry-run", "argv": ["--from-file", "p.toml", "rel"], "cwd": str(tmp_path / name)})
+        assert f"license=('{lic}')" in resp["stdout"], resp
+    assert client.request(server, {"op": "ping"})["profiles"] == 2
+
+
+def test_client_forwards_environment(server, tmp_path: Path):
+    cfg = tmp_path / "cfg/aur-init"
+    cfg.mkdir(parents=True)
+    (cfg / "config.toml").write_text('license = "MPL-2.0"\n')
+    env = dict(os.environ, AUR_INIT_SOCKET=server, XDG_CONFIG_HOME=str(tmp_path / "cfg"))
+    cp = subprocess.run([sys.executable, str(ROOT / "lib/client.py"), "--dry-run", "--srcinfo", "envy"],
+                        cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert "license=('MPL-2.0')" in cp.stdout
+    # Served by the daemon (not the local fallback), which loaded the client's profile
+    assert client.request(server, {"op": "ping"})["profiles"] == 1
+
+
+def test_ping_and_scaffold(server, tmp_path: Path):
+    assert client.request(server, {"op": "ping"})["rc"] == 0
+    resp = client.request(server, {"op": "scaffold", "argv": ["-t", "go", "hello"], "cwd": str(tmp_path)})
+    assert resp["rc"] == 0, resp
+    assert "initialized in hello/" in resp["stdout"]
+    assert "[aur-init] Scaffolding hello" in resp["stderr"]
+    assert "makedepends=('go')" in (tmp_path / "hello/PKGBUILD").read_text()
+
+
+def test_dry_run_and_errors(server, tmp_path: Path):
+    resp = client.request(server, {"op": "dry-run", "argv": ["p", "--srcinfo"], "cwd": str(tmp_path)})
+    assert resp["rc"] == 0
+    assert "pkgname=p" in resp["stdout"] and "pkgbase = p" in resp["stdout"]
+    bad = client.request(server, {"op": "scaffold", "argv": ["Bad"], "cwd": str(tmp_path)})
+    assert bad["rc"] == 2 and "Invalid pkgname" in bad["stderr"]
+    assert client.request(server, {"op": "nope"})["rc"] == 2
+
+
+def test_concurrent_clients(server, tmp_path: Path):
+    def one(i):
+        return client.request(server, {"op": "scaffold", "argv": ["-t", "rust", f"c{i}"], "cwd": str(tmp_path)})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(one, range(8)))
+    assert all(r["rc"] == 0 for r in results)
+    assert all((tmp_path / f"c{i}/Cargo.toml").exists() for i in range(8))
+
+
+def test_render_reloads_changed_templates(tmp_path: Path, monkeypatch):
+    (tmp_path / "common").mkdir()
+    tmpl = tmp_path / "common/PKGBUILD.tmpl"
+    tmpl.write_text("v1 @PKGNAME@\n")
+    monkeypatch.setattr(daemon, "find_templates_dir", lambda: tmp_path)
+    state = daemon.DaemonState()
+    resp = daemon.handle_request(state, {"op": "render", "values": {"PKGNAME": "x"}})
+    assert resp == {"rc": 0, "text": "v1 x\n", "stderr": ""}
+    tmpl.write_text("version 2 @PKGNAME@\n")
+    assert daemon.handle_request(state, {"op": "render", "values": {"PKGNAME": "x"}})["text"] == "version 2 x\n"
+    escape = daemon.handle_request(state, {"op": "render", "template": "../../etc/passwd"})
+    assert escape["rc"] == 1
+
+
+def test_profile_cached_until_changed(tmp_path: Path, monkeypatch):
+    cfg = tmp_path / "p.json"
+    cfg.write_text('{"license": "GPL"}')
+    state = daemon.DaemonState()
+    calls = []
+    real = daemon.aur_init._load_profile
+    monkeypatch.setattr(daemon.aur_init, "_load_profile", lambda *a: calls.append(a) or real(*a))
+    assert state.profile(str(cfg))[1] == {"license": "GPL"}
+    assert state.profile(str(cfg))[1] == {"license": "GPL"}
+    assert len(calls) == 1
+    cfg.write_text('{"license": "BSD"}')
+    os.utime(cfg, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    assert state.profile(str(cfg))[1] == {"license": "BSD"}
+    assert len(calls) == 2
+
+
+def test_client_falls_back_without_daemon(tmp_path: Path):
+    env = dict(os.environ, AUR_INIT_SOCKET=str(tmp_path / "missing.sock"))
+    cp = subprocess.run(
+        [sys.executable, str(ROOT / "lib/client.py"), "--dry-run", "fallback"],
+        cwd=tmp_path, env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    assert "pkgname=fallback" in cp.stdout
+
+
+def test_malformed_request(server):
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(server)
+        s.sendall(b"[1, 2]\n")
+        resp = s.makefile("rb").readline()
+    assert b"bad request: request must be a JSON object" in resp
+    assert client.request(server, {"op": "ping"})["rc"] == 0
@@ -0,0 +1,101 @@
+import hashlib
+import http.server
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import core
+import downloads
+from test_core import _args
+
+
+def _blob(tmp_path: Path, name: str, data: bytes) -> str:
+    p = tmp_path / "upstream" / name
+    p.parent.mkdir(exist_ok=True)
+    p.write_bytes(data)
+    return p.as_uri()
+
+
+def test_parse_size():
+    assert downloads.parse_size("1024") == 1024
+    assert downloads.parse_size("500M") == 500 << 20
+    assert downloads.parse_size("1.5GiB") == 3 << 29
+    with pytest.raises(ValueError):
+        downloads.parse_size("lots")
+
+
+def test_fetch_hashes_and_caches(tmp_path: Path):
+    url = _blob(tmp_path, "a.tar.gz", b"release")
+    root = tmp_path / "cache"
+    digest, path = downloads.fetch(url, root=root)
+    assert digest == hashlib.sha256(b"release").hexdigest()
+    assert path == root / "blobs" / digest and path.read_bytes() == b"release"
+    # Served from the cache even after upstream disappears
+    (tmp_path / "upstream/a.tar.gz").unlink()
+    assert downloads.fetch(url, root=root) == (digest, path)
+    assert not list((root / "blobs").glob(".part-*"))
+
+
+def test_fetch_evicts_least_recently_used(tmp_path: Path):
+    root = tmp_path / "cache"
+    a = _blob(tmp_path, "a", b"a" * 100)
+    b = _blob(tmp_path, "b", b"b" * 100)
+    c = _blob(tmp_path, "c", b"c" * 100)
+    da, _ = downloads.fetch(a, max_bytes=250, root=root)
+    db, _ = downloads.fetch(b, max_bytes=250, root=root)
+    downloads.fetch(a, max_bytes=250, root=root)  # a is now more recent than b
+    dc, _ = downloads.fetch(c, max_bytes=250, root=root)
+    assert sorted(p.name for p in (root / "blobs").iterdir()) == sorted([da, dc])
+    assert set(downloads._read_index(root)) == {a, c}
+
+
+def test_fetch_missing_url_raises(tmp_path: Path):
+    with pytest.raises(OSError):
+        downloads.fetch((tmp_path / "nope.tar.gz").as_uri(), root=tmp_path / "cache")
+
+
+@pytest.fixture
+def http_upstream(tmp_path: Path):
+    served = tmp_path / "www"
+    served.mkdir()
+    hits = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, directory=str(served), **kw)
+
+        def log_message(self, *a):
+            hits.append(self.path)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield served, f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_source_url_fills_sha256sums(tmp_path: Path, monkeypatch, http_upstream):
+    served, base, hits = http_upstream
+    (served / "demo-1.0.tar.gz").write_bytes(b"tarball")
+    url = f"{base}/demo-1.0.tar.gz"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    for _ in range(2):
+        rc, plan = core.build_plan(_args(pkgname="demo", type="python", source_url=[url]))
+        assert rc == 0
+    text = plan.text("PKGBUILD")
+    assert f"'{url}'" in text
+    assert hashlib.sha256(b"tarball").hexdigest() in text
+    assert len(hits) == 1  # second scaffold served from the cache
+
+
+def test_source_url_errors(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    missing = (tmp_path / "missing.tar.gz").as_uri()
+    assert core.build_plan(_args(pkgname="demo", source_url=[missing]))[0] == 1
+    assert core.build_plan(_args(pkgname="demo", source_url=["git+https://x/y"]))[0] == 2
+    assert core.build_plan(_args(pkgname="demo", source_url=[missing], source_cache_size="big"))[0] == 2
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+import executables
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    executables.invalidate()
+    yield
+    executables.invalidate()
+
+
+def _tool(d, name, mode=0o755):
+    p = d / name
+    p.write_text("#!/bin/sh\n")
+    p.chmod(mode)
+    return str(p)
+
+
+def test_which_finds_first_executable_in_path_order(tmp_path, monkeypatch):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    _tool(a, "tool", 0o644)  # not executable: skipped
+    expected = _tool(b, "tool")
+    monkeypatch.setenv("PATH", f"{a}{os.pathsep}{b}")
+    assert executables.which("tool") == expected
+    assert executables.which("missing") is None
+
+
+def test_which_rescans_when_path_changes(tmp_path, monkeypatch):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    _tool(b, "tool")
+    monkeypatch.setenv("PATH", str(a))
+    assert executables.which("tool") is None
+    monkeypatch.setenv("PATH", str(b))
+    assert executables.which("tool") == str(b / "tool")
+
+
+def test_which_sees_tools_installed_after_the_scan(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert executables.which("late") is None
+    st = os.stat(tmp_path)
+    expected = _tool(tmp_path, "late")
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert executables.which("late") == expected
+
+
+def test_which_drops_removed_tools(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    path = _tool(tmp_path, "gone")
+    assert executables.which("gone") == path
+    os.unlink(path)
+    assert executables.which("gone") is None
+
+
+def test_which_survives_a_concurrent_invalidate(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    _tool(tmp_path, "busy", 0o644)
+    real = executables._is_exe
+
+    def racing(path):
+        executables.invalidate()  # another thread drops the index mid-lookup
+        return real(path)
+
+    monkeypatch.setattr(executables, "_is_exe", racing)
+    assert executables.which("busy") is None
+
+
+def test_which_checks_explicit_paths_directly(tmp_path):
+    path = _tool(tmp_path, "tool")
+    assert executables.which(path) == path
+    assert executables.which(str(tmp_path / "nope")) is None
+
+
+def test_fake_replaces_lookups_and_restores(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    real = _tool(tmp_path, "git")
+    with executables.fake({"makepkg": "/fake/makepkg"}):
+        assert executables.which("makepkg") == "/fake/makepkg"
+        assert executables.which("git") is None
+    assert executables.which("git") == real
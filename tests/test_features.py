@@ -1,5 +1,7 @@
 from pathlib import Path
+import os
 import types
+import executables
 import features
 
 
@@ -9,20 +11,20 @@ class DummyRun:
 
     def __call__(self, *args, **kwargs):
         self.calls.append((args, kwargs))
-        return types.SimpleNamespace(returncode=0)
+        return types.SimpleNamespace(returncode=0, stdout="", stderr="")
 
 
 def test_maybe_git_init_skips_without_git(tmp_path, monkeypatch):
-    monkeypatch.setattr(features.shutil, "which", lambda _: None)
-    features.maybe_git_init(tmp_path, True, "p")
+    with executables.fake({}):
+        features.maybe_git_init(tmp_path, True, "p")
     # Should not raise, and no repo created
     assert not (tmp_path / ".git").exists()
 
 
 def test_maybe_git_init_runs_with_git(tmp_path, monkeypatch):
-    monkeypatch.setattr(features.shutil, "which", lambda _: "/usr/bin/git")
+    monkeypatch.setattr(executables, "_FAKE", {"git": "/usr/bin/git"})
     dummy = DummyRun()
-    monkeypatch.setattr(features, "subprocess", types.SimpleNamespace(run=dummy))
+    monkeypatch.setattr(features, "subprocess", types.SimpleNamespace(run=dummy, PIPE=-1))
     # create files to stage
     (tmp_path / "PKGBUILD").write_text("")
     (tmp_path / ".gitignore").write_text("")
@@ -34,14 +36,14 @@ def test_maybe_git_init_runs_with_git(tmp_path, monkeypatch):
 
 
 def test_maybe_gen_srcinfo_skips_without_makepkg(tmp_path, monkeypatch):
-    monkeypatch.setattr(features.shutil, "which", lambda _: None)
-    features.maybe_gen_srcinfo(tmp_path, True)
+    with executables.fake({}):
+        features.maybe_gen_srcinfo(tmp_path, True)
 
 
 def test_maybe_gen_srcinfo_runs_with_makepkg(tmp_path, monkeypatch):
-    monkeypatch.setattr(features.shutil, "which", lambda _: "/usr/bin/makepkg")
+    monkeypatch.setattr(executables, "_FAKE", {"makepkg": "/usr/bin/makepkg"})
     dummy = DummyRun()
-    monkeypatch.setattr(features, "subprocess", types.SimpleNamespace(run=dummy))
+    monkeypatch.setattr(features, "subprocess", types.SimpleNamespace(run=dummy, PIPE=-1))
     features.maybe_gen_srcinfo(tmp_path, True)
     assert dummy.calls, "should have invoked makepkg --printsrcinfo"
 
@@ -60,3 +62,74 @@ def test_maybe_add_ci_fallback(tmp_path, monkeypatch):
     monkeypatch.setattr(features, "find_templates_dir", lambda: tmp_path / "does-not-exist")
     features.maybe_add_ci(tmp_path, True)
     assert (tmp_path / ".github/workflows/aur.yml").exists()
+
+
+def test_maybe_gen_srcinfo_writes_native_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(executables, "_FAKE", {})
+    features.maybe_gen_srcinfo(tmp_path, True, "pkgbase = p\n")
+    assert (tmp_path / ".SRCINFO").read_text() == "pkgbase = p\n"
+
+
+def _fake_tools(bindir: Path, tools: dict):
+    bindir.mkdir(exist_ok=True)
+    for name, script in tools.items():
+        p = bindir / name
+        p.write_text("#!/bin/sh\n" + script + "\n")
+        p.chmod(0o755)
+
+
+def test_doctor_probes_versions_and_caches(tmp_path, monkeypatch, capsys):
+    import json
+
+    bindir = tmp_path / "bin"
+    _fake_tools(bindir, {
+        "makepkg": "echo 'makepkg (pacman) 6.1.0'",
+        "fakeroot": "echo 'fakeroot version 1.33'",
+        "git": "echo 'git version 2.45.1'",
+        "namcap": "exit 2",
+        "go": "echo 'go version go1.22.3 linux/amd64'",
+    })
+    monkeypatch.setenv("PATH", str(bindir))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    assert features.doctor(as_json=True) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["ok"] is True and report["cached"] is False
+    tools = report["tools"]
+    assert tools["makepkg"]["version"] == "6.1.0"
+    assert tools["go"]["version"] == "1.22.3"
+    assert tools["cargo"] == {"required": False, "found": False, "path": None, "version": None, "error": None}
+    assert tools["namcap"]["found"] and tools["namcap"]["error"] == "exit 2"
+    # A failed probe is not cached
+    assert not (tmp_path / "cache/aur-init/doctor.json").exists()
+
+    (bindir / "namcap").write_text("#!/bin/sh\necho namcap 3.5.2\n")
+    assert features.doctor(as_json=True) == 0
+    assert json.loads(capsys.readouterr().out)["cached"] is False
+    assert features.doctor(as_json=True) == 0
+    assert json.loads(capsys.readouterr().out)["cached"] is True
+
+    # Upgrading a binary in place invalidates the cached result
+    (bindir / "go").write_text("#!/bin/sh\necho 'go version go1.23.0 linux/amd64'\n")
+    os.utime(bindir / "go", ns=(10**18, 10**18))
+    features.doctor(as_json=True)
+    report = json.loads(capsys.readouterr().out)
+    assert report["cached"] is False and report["tools"]["go"]["version"] == "1.23.0"
+
+
+def test_doctor_probes_run_concurrently_with_timeout(tmp_path, monkeypatch, capsys):
+    import shutil
+    import time
+
+    sleep = shutil.which("sleep")
+    bindir = tmp_path / "bin"
+    _fake_tools(bindir, {name: f"{sleep} 0.5; echo 1.0" for name in ("makepkg", "fakeroot", "git", "namcap")})
+    _fake_tools(bindir, {"go": f"exec {sleep} 5"})
+    monkeypatch.setenv("PATH", str(bindir))
+    monkeypatch.setattr(features, "PROBE_TIMEOUT", 1.0)
+    start = time.monotonic()
+    assert features.doctor(use_cache=False) == 0
+    assert time.monotonic() - start < 2.5
+    out = capsys.readouterr().out
+    assert "  - git: OK (1.0)" in out
+    assert "  - go: OK (version unknown; probe failed: timeout after 1s)" in out
+    assert "  - cargo: missing" in out
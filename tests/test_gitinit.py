@@ -0,0 +1,50 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import features
+import gitinit
+
+
+def test_parse_author():
+    assert gitinit.parse_author("Jo Doe <jo@example.org>") == ("Jo Doe", "jo@example.org")
+    assert gitinit.parse_author("Jo Doe") == ("Jo Doe", "")
+    assert gitinit.parse_author("") == ("aur-init", "")
+
+
+def test_fast_import_stream(monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    files = {"bin/x": (b"#!/bin/sh\n", 0o755), "PKGBUILD": (b"pkgname=x\n", 0o600)}
+    stream = gitinit.fast_import_stream(files, "refs/heads/main", ("A", "a@b"), "init")
+    assert stream.startswith(b"blob\nmark :1\ndata 10\npkgname=x\n")
+    assert b"commit refs/heads/main\nauthor A <a@b> 1700000000 " in stream
+    assert b"M 100644 :1 PKGBUILD\nM 100755 :2 bin/x\n" in stream
+    assert stream.endswith(b"\ndone\n")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_git_init_single_commit_with_clean_index(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    files = {
+        "PKGBUILD": (b"pkgname=x\n", 0o600),
+        "Cargo.toml": (b"[package]\n", 0o644),
+        "man/x.1": (b".TH x 1\n", 0o644),
+        "completions/zsh/_x": (b"#compdef x\n", 0o644),
+        "bin/x": (b"#!/bin/sh\n", 0o755),
+    }
+    for rel, (data, mode) in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(data)
+        (tmp_path / rel).chmod(mode)
+    features.maybe_git_init(tmp_path, True, "x", files, "Jo Doe <jo@example.org>")
+
+    def git(*a):
+        return subprocess.run(["git", *a], cwd=tmp_path, check=True, stdout=subprocess.PIPE, text=True).stdout
+
+    assert git("log", "--format=%an <%ae> %at %s") == "Jo Doe <jo@example.org> 1700000000 chore: initialize AUR package x\n"
+    assert sorted(git("ls-files").split()) == sorted(files)
+    assert "100755" in git("ls-files", "-s", "bin/x")
+    assert git("status", "--porcelain") == ""
+    git("fsck", "--full")
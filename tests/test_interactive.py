@@ -2,9 +2,18 @@ from types import SimpleNamespace
 import builtins
 import io
 import sys
+
+import pytest
+
 import interactive
 
 
+@pytest.fixture(autouse=True)
+def _own_history(tmp_path, monkeypatch):
+    # Every test starts without a previous session's answers
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
 def _args(**kw):
     d = dict(
         pkgname="",
@@ -135,3 +144,123 @@ def test_interactive_eof_exit(monkeypatch):
     except SystemExit as e:
         assert e.code == 130
         assert "Aborted: input stream closed (EOF)" in err.getvalue()
+
+
+def _simple_inputs(monkeypatch, answers):
+    inputs = iter(answers)
+    monkeypatch.setattr(builtins, "input", lambda *a, **k: next(inputs))
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+
+
+def test_interactive_history_becomes_defaults(monkeypatch):
+    _simple_inputs(monkeypatch, [
+        "", "first", "2", "Jane <jane@example.org>", "", "", "GPL-3.0-or-later", "", "y", "",
+    ])
+    interactive.collect_interactive_inputs(_args())
+    assert interactive.load_history()["maintainer"] == "Jane <jane@example.org>"
+
+    # Second session: accept every default except the (never remembered) pkgname
+    _simple_inputs(monkeypatch, ["", "second", "", "", "", "", "", "", "", ""])
+    res = interactive.collect_interactive_inputs(_args())
+    assert res.pkgname == "second"
+    assert res.type == "python"
+    assert res.maintainer == "Jane <jane@example.org>"
+    assert res.license == "GPL-3.0-or-later"
+    assert res.git_init is True and res.with_tests is False
+    assert res.url == "https://example.com/second"
+
+
+def test_interactive_cli_values_beat_history(monkeypatch):
+    _simple_inputs(monkeypatch, ["", "first", "", "Jane <jane@example.org>", "", "", "", "", "", ""])
+    interactive.collect_interactive_inputs(_args())
+    _simple_inputs(monkeypatch, ["", "second", "", "", "", "", "", "", "", ""])
+    res = interactive.collect_interactive_inputs(_args(maintainer="Max <max@example.org>"))
+    assert res.maintainer == "Max <max@example.org>"
+
+
+def test_simple_mode_ignores_remembered_advanced_answers(monkeypatch):
+    remembered = {"maintainer": "Jane <jane@example.org>", "strict": False, "explain": True,
+                  "add_ci": True, "gen_srcinfo": True}
+    interactive.save_history(remembered)
+    _simple_inputs(monkeypatch, ["1", "pkg", "", "", "", "", "", "", "", ""])
+    res = interactive.collect_interactive_inputs(_args())
+    assert res.maintainer == "Jane <jane@example.org>"  # shown in Simple mode: prefilled
+    assert res.strict is True and res.explain is False
+    assert res.add_ci is False and res.gen_srcinfo is False
+    # Kept for the next Advanced session
+    history = interactive.load_history()
+    assert history["mode"] == "Simple"
+    assert {k: history[k] for k in ("strict", "explain", "add_ci", "gen_srcinfo")} == \
+        {"strict": False, "explain": True, "add_ci": True, "gen_srcinfo": True}
+
+
+def test_interactive_abort_keeps_history(monkeypatch):
+    interactive.save_history({"maintainer": "Jane <jane@example.org>", "pkgname": "never-saved"})
+    assert interactive.load_history() == {"maintainer": "Jane <jane@example.org>"}
+    monkeypatch.setattr(builtins, "input", lambda *a, **k: (_ for _ in ()).throw(KeyboardInterrupt))
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    with pytest.raises(SystemExit):
+        interactive.collect_interactive_inputs(_args())
+    assert interactive.load_history() == {"maintainer": "Jane <jane@example.org>"}
+
+
+def test_interactive_first_prompt_does_not_wait_for_questionary(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    asked = []
+
+    class Prompt:
+        def __init__(self, kind, message, default):
+            self.kind, self.message, self.default = kind, message, default
+
+        def ask(self):
+            asked.append(self.message)
+            return {"Package name (pkgname)": "qpkg"}.get(self.message, self.default)
+
+    class FakeQuestionary:
+        text = staticmethod(lambda message, default="": Prompt("text", message, default))
+        confirm = staticmethod(lambda message, default=False: Prompt("confirm", message, default))
+        select = staticmethod(lambda message, choices, default=None: Prompt("select", message, default))
+
+    def slow_import():
+        release.wait(5)  # still "importing" while the first prompt is shown
+        return FakeQuestionary
+
+    tasks = []
+
+    class RecordingTask(interactive.Task):
+        def __init__(self, fn, *args):
+            super().__init__(fn, *args)
+            tasks.append(self)
+
+    def first_input(*a, **k):
+        assert not tasks[0].done()
+        release.set()
+        tasks[0].wait(5)
+        return ""  # Mode -> Simple
+
+    monkeypatch.setattr(interactive, "_load_questionary", slow_import)
+    monkeypatch.setattr(interactive, "Task", RecordingTask)
+    monkeypatch.setattr(builtins, "input", first_input)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+
+    res = interactive.collect_interactive_inputs(_args())
+    assert res.pkgname == "qpkg"
+    assert asked[0] == "Package name (pkgname)" and "Mode" not in asked
+    assert all(t.done() for t in tasks[1:])
+
+
+def test_interactive_warms_up_in_background(monkeypatch):
+    import features
+    import render
+
+    probed = []
+    monkeypatch.setattr(features, "probe_tools", lambda use_cache=True: probed.append(use_cache) or ({}, False))
+    render._TEMPLATE_CACHE.clear()
+    _simple_inputs(monkeypatch, [
+        "2", "p", "", "", "", "", "", "", "", "", "", "", "", "", "", "", "", "", "",
+    ])
+    interactive.collect_interactive_inputs(_args(no_cache=True))
+    assert probed == [False]
+    assert any(p.name == "PKGBUILD.tmpl" for p in render._TEMPLATE_CACHE)
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import aur_init
+import core
+import lint
+from test_core import _args
+
+PKGBUILD = """pkgname=demo
+pkgver=1.0
+pkgrel=1
+pkgdesc="Demo"
+arch=('any')
+url="https://demo.org"
+license=('MIT')
+depends=('python')
+source=('demo.py' 'https://demo.org/demo.tar.gz' "git+https://demo.org/demo.git")
+sha256sums=('0000' 'SKIP' 'SKIP')
+"""
+
+
+def _rules(findings):
+    return sorted((f["rule"], f["severity"]) for f in findings)
+
+
+def test_clean_pkgbuild_has_no_findings(tmp_path: Path):
+    (tmp_path / "demo.py").write_text("")
+    text = PKGBUILD.replace("'SKIP' 'SKIP'", "'1111' 'SKIP'")
+    assert lint.lint_text(text, tmp_path) == []
+
+
+def test_lint_flags_sources_checksums_and_placeholders(tmp_path: Path):
+    text = PKGBUILD.replace('pkgdesc="Demo"', 'pkgdesc="TODO: describe"').replace("pkgrel=1", "pkgrel=@PKGREL@")
+    text += "md5sums=('x')\n"
+    findings = lint.lint_text(text, tmp_path)
+    assert _rules(findings) == [
+        ("checksum-count", "error"),
+        ("missing-source", "error"),
+        ("placeholder", "error"),
+        ("placeholder", "warning"),
+        ("skip-checksum", "error"),
+    ]
+    skip = next(f for f in findings if f["rule"] == "skip-checksum")
+    assert skip["line"] == 10 and "https://demo.org/demo.tar.gz" in skip["message"]
+
+
+def test_lint_checks_arch_against_type(tmp_path: Path):
+    (tmp_path / "demo.py").write_text("")
+    base = PKGBUILD.replace("'SKIP' 'SKIP'", "'1111' 'SKIP'")
+    rust = base.replace("depends=('python')", "makedepends=('rust' 'cargo')")
+    assert lint.infer_type(lint.parse_pkgbuild(rust)) == "rust"
+    assert _rules(lint.lint_text(rust, tmp_path)) == [("arch", "error")]
+    assert _rules(lint.lint_text(base.replace("('any')", "('x86_64')"), tmp_path)) == [("arch", "warning")]
+    assert _rules(lint.lint_text(base, tmp_path, type_name="go")) == [("arch", "error")]
+    assert lint.lint_text(base.replace("depends=('python')", ""), tmp_path) == []
+
+
+def test_generated_projects_lint_clean(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    for t in ("", "python", "node", "go", "cmake", "rust"):
+        for vcs in ("", "git"):
+            name = f"p-{t or 'min'}-{vcs or 'local'}"
+            args = _args(pkgname=name, type=t, vcs=vcs, vcs_url="https://x.org/x.git" if vcs else "",
+                         url="https://x.org", description="Real", dry_run=False, with_tests=True, with_man=True)
+            assert core.execute(args) == 0
+    capsys.readouterr()
+    assert aur_init.main(["lint", "--json", "--jobs", "2", str(tmp_path)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report == {"packages": 12, "errors": 0, "warnings": 0, "findings": []}
+
+
+def test_lint_subcommand_reports_errors(tmp_path: Path, capsys):
+    pkg = tmp_path / "tree/demo"
+    pkg.mkdir(parents=True)
+    (pkg / "PKGBUILD").write_text(PKGBUILD + "<<<<<<< local\n")
+    assert aur_init.main(["lint", "-j", "1", str(tmp_path / "tree")]) == 1
+    out = capsys.readouterr().out
+    assert f"{pkg / 'PKGBUILD'}:11: error: unresolved merge conflict marker" in out
+    assert "[missing-source]" in out
+    assert aur_init.main(["lint", str(tmp_path / "nothing")]) == 2
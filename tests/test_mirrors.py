@@ -0,0 +1,110 @@
+import io
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import core
+import mirrors
+from test_core import _args
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "Test")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "test@example.org")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _upstream(tmp_path: Path, name: str = "up") -> Path:
+    repo = tmp_path / name
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "one")
+    _git(repo, "tag", "-a", "-m", "release", "v1.2.0")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "two")
+    return repo
+
+
+def _objects(repo: Path) -> int:
+    stats = dict(line.split(": ") for line in _git(repo, "count-objects", "-v").splitlines())
+    return int(stats["count"]) + int(stats["in-pack"])
+
+
+def test_mirror_pkgver_follows_git_describe(tmp_path: Path):
+    up = _upstream(tmp_path)
+    root = tmp_path / "mirrors"
+    head = _git(up, "rev-parse", "--short", "HEAD")
+    assert mirrors.mirror_pkgver(str(up), root) == f"1.2.0.1.g{head}"
+    _git(up, "commit", "-q", "--allow-empty", "-m", "three")
+    _git(up, "tag", "light")
+    assert mirrors.mirror_pkgver(str(up), root) == f"light.0.g{_git(up, 'rev-parse', '--short', 'HEAD')}"
+
+
+def test_mirror_pkgver_without_tags(tmp_path: Path):
+    up = tmp_path / "notags"
+    up.mkdir()
+    _git(up, "init", "-q")
+    for msg in ("a", "b", "c"):
+        _git(up, "commit", "-q", "--allow-empty", "-m", msg)
+    assert mirrors.mirror_pkgver(str(up), tmp_path / "m") == f"r3.{_git(up, 'rev-parse', '--short', 'HEAD')}"
+
+
+def test_forks_share_one_mirror(tmp_path: Path):
+    up = _upstream(tmp_path)
+    fork = tmp_path / "fork"
+    _git(tmp_path, "clone", "-q", str(up), str(fork))
+    _git(fork, "commit", "-q", "--allow-empty", "-m", "fork only")
+    root = tmp_path / "mirrors"
+    mirrors.mirror_pkgver(str(up), root)
+    shared = root / "shared.git"
+    before = _objects(shared)
+    assert mirrors.mirror_pkgver(str(fork), root).startswith("1.2.0.2.g")
+    assert _objects(shared) == before + 1  # only the fork's own commit was fetched
+    refs = _git(shared, "for-each-ref", "--format=%(refname)")
+    assert f"refs/remotes/{mirrors.url_key(str(up))}/HEAD" in refs
+    assert f"refs/remotes/{mirrors.url_key(str(fork))}/HEAD" in refs
+
+
+def test_vcs_mirror_fills_pkgver(tmp_path: Path, monkeypatch):
+    up = _upstream(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    rc, plan = core.build_plan(_args(pkgname="demo-git", type="python", vcs="git", vcs_url=str(up),
+                                     vcs_mirror=True, gen_srcinfo=True))
+    assert rc == 0
+    pkgver = f"1.2.0.1.g{_git(up, 'rev-parse', '--short', 'HEAD')}"
+    assert f"pkgver={pkgver}\n" in plan.text("PKGBUILD")
+    assert f"\tpkgver = {pkgver}\n" in plan.text(".SRCINFO")
+
+
+def test_vcs_mirror_failure_keeps_default(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    rc, plan = core.build_plan(_args(pkgname="demo-git", vcs="git", vcs_url=str(tmp_path / "missing"), vcs_mirror=True))
+    assert rc == 0
+    assert "pkgver=0.3.0\n" in plan.text("PKGBUILD")
+    assert "cannot mirror" in capsys.readouterr().err
+
+
+def test_unusable_mirror_keeps_default(tmp_path: Path, monkeypatch, capsys):
+    up = _upstream(tmp_path)
+    cache = tmp_path / "cache"
+    (cache / "aur-init/mirrors").mkdir(parents=True)
+    (cache / "aur-init/mirrors/shared.git").write_text("not a repository")  # git init fails here
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    with pytest.raises(RuntimeError):
+        mirrors.update_mirror(str(up))
+    monkeypatch.chdir(tmp_path)
+    rc, plan = core.build_plan(_args(pkgname="demo-git", vcs="git", vcs_url=str(up), vcs_mirror=True))
+    assert rc == 0
+    assert "pkgver=0.3.0\n" in plan.text("PKGBUILD")
+    assert "cannot mirror" in capsys.readouterr().err
@@ -0,0 +1,75 @@
+import pkgbuild
+
+
+SAMPLE = """# Maintainer: A <a@example.com>
+pkgname=demo
+pkgver=1.2.3
+pkgdesc="Demo ${pkgname} package"
+arch=('x86_64')
+depends=('glibc') # runtime
+source=(
+  "$pkgname-$pkgver.tar.gz::https://example.com/$pkgname/v$pkgver.tar.gz"
+  'local.patch'
+  "${pkgname}::git+https://example.com/${pkgname}.git"
+)
+sha256sums=('aaa'
+            'SKIP'
+            'SKIP')
+
+build() {
+  pkgname=inside-function
+  source=('ignored')
+}
+
+package()
+{
+  depends=('nope')
+}
+"""
+
+
+def test_parse_pkgbuild_arrays_scalars_and_expansion():
+    d = pkgbuild.parse_pkgbuild(SAMPLE)
+    assert d["pkgname"] == "demo"
+    assert d["pkgdesc"] == "Demo demo package"
+    assert d["arch"] == ["x86_64"]
+    assert d["depends"] == ["glibc"]
+    assert d["source"] == [
+        "demo-1.2.3.tar.gz::https://example.com/demo/v1.2.3.tar.gz",
+        "local.patch",
+        "demo::git+https://example.com/demo.git",
+    ]
+    assert d["sha256sums"] == ["aaa", "SKIP", "SKIP"]
+
+
+def test_single_quotes_are_not_expanded():
+    assert pkgbuild.parse_pkgbuild("a=x\nb=('$a' \"$a\")\n")["b"] == ["$a", "x"]
+
+
+def test_replace_array_keeps_layout():
+    out = pkgbuild.replace_array(SAMPLE, "sha256sums", ["1", "2", "SKIP"])
+    assert "sha256sums=(\n  '1'\n  '2'\n  'SKIP'\n)\n\nbuild()" in out
+    assert pkgbuild.parse_pkgbuild(out)["sha256sums"] == ["1", "2", "SKIP"]
+    one_line = pkgbuild.replace_array("source=('a')\nsha256sums=('SKIP')\n", "sha256sums", ["x"])
+    assert one_line == "source=('a')\nsha256sums=('x')\n"
+
+
+def test_replace_array_inserts_after_source():
+    out = pkgbuild.replace_array("pkgname=a\nsource=('f')\npackage() {\n:\n}\n", "sha256sums", ["d"])
+    assert out == "pkgname=a\nsource=('f')\nsha256sums=('d')\npackage() {\n:\n}\n"
+
+
+def test_source_classification():
+    assert pkgbuild.is_local_source("local.patch")
+    assert not pkgbuild.is_local_source("x::https://e/x.tar.gz")
+    assert not pkgbuild.is_local_source("x::git+https://e/x.git")
+    assert pkgbuild.is_vcs_source("x::git+https://e/x.git")
+    assert pkgbuild.is_vcs_source("git://e/x.git")
+    assert not pkgbuild.is_vcs_source("https://e/x.tar.gz")
+
+
+def test_iter_statements_kinds():
+    text = "# c\na=1\nb=(x\n  y)\nf() {\n  a=2\n}\n\n[[ -n $a ]] && b+=(z)\n"
+    assert [(k, n, start, end) for k, n, _, _, start, end in pkgbuild.iter_statements(text)] == [
+        ("assign", "a", 1, 1), ("assign", "b", 2, 3), ("function", "f", 4, 6), ("other", "", 8, 8),
+    ]
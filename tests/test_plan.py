@@ -0,0 +1,86 @@
+import io
+import subprocess
+import sys
+import tarfile
+from pathlib import Path
+
+import pytest
+
+import core
+import plan
+import scaffold
+from test_core import _args
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_build_plan_in_memory(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rc, files = core.build_plan(_args(pkgname="mem", type="python", gen_srcinfo=True, add_ci=True, with_tests=True))
+    assert rc == 0
+    assert list(tmp_path.iterdir()) == []
+    assert {"PKGBUILD", ".SRCINFO", ".gitignore", "README.md", "bin/mem", "src/mem/main.py",
+            "scripts/tests/test.sh", ".github/workflows/aur.yml"} <= set(files.files)
+    assert files.files["bin/mem"][1] == 0o755
+    assert files.files["PKGBUILD"][1] == 0o600
+    # Checksums come from the planned contents
+    assert files.sha256("bin/mem") in files.text("PKGBUILD")
+    assert files.sha256("bin/mem") in files.text(".SRCINFO")
+
+
+def test_build_plan_errors_return_no_plan(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert core.build_plan(_args(pkgname="Bad")) == (2, None)
+    assert core.build_plan(_args(pkgname="p", type="python", license="")) == (2, None)
+
+
+def test_plan_validate_rejects_unsafe_entries(tmp_path: Path):
+    for rel in ("../x", "/abs", "a/../b", "a//b"):
+        p = plan.Plan(tmp_path)
+        p.add_file(rel, "x")
+        with pytest.raises(ValueError):
+            p.validate()
+    p = plan.Plan(tmp_path)
+    p.add_file("a", "x")
+    p.add_file("a/b", "y")
+    with pytest.raises(ValueError, match="both a file and a directory"):
+        p.validate()
+
+
+def test_write_file_records_into_active_plan(tmp_path: Path):
+    with plan.Plan(tmp_path / "p") as p:
+        scaffold.write_file(tmp_path / "p/x/y.txt", "data", 0o640)
+        scaffold.ensure_dir(tmp_path / "p/empty")
+    assert p.files == {"x/y.txt": (b"data", 0o640)}
+    assert p.all_dirs() == ["empty", "x"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_tar_is_reproducible(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    p = plan.Plan(tmp_path)
+    p.add_file("src/main.rs", "fn main() {}", 0o644)
+    p.add_file("bin/run", "#!/bin/sh\n", 0o755)
+    plan.write_tar(p, str(tmp_path / "a.tar"), "pkg")
+    plan.write_tar(p, str(tmp_path / "b.tar"), "pkg")
+    assert (tmp_path / "a.tar").read_bytes() == (tmp_path / "b.tar").read_bytes()
+    with tarfile.open(tmp_path / "a.tar") as tar:
+        members = {m.name: m for m in tar.getmembers()}
+        assert list(members) == ["pkg", "pkg/bin", "pkg/src", "pkg/bin/run", "pkg/src/main.rs"]
+        assert members["pkg/bin/run"].mode == 0o755
+        assert members["pkg/bin/run"].mtime == 1700000000
+        assert tar.extractfile("pkg/src/main.rs").read() == b"fn main() {}"
+
+
+def test_output_tar_to_stdout(tmp_path: Path):
+    cp = subprocess.run(
+        [sys.executable, str(ROOT / "lib/aur_init.py"), "-t", "go", "--srcinfo", "--explain", "--output-tar", "-", "tarred"],
+        cwd=tmp_path, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    assert list(tmp_path.iterdir()) == []
+    with tarfile.open(fileobj=io.BytesIO(cp.stdout)) as tar:
+        names = tar.getnames()
+        assert {"tarred/PKGBUILD", "tarred/.SRCINFO", "tarred/main.go"} <= set(names)
+        assert b"makedepends=('go')" in tar.extractfile("tarred/PKGBUILD").read()
+    # --explain goes to stderr: stdout is the archive alone
+    assert b"# Explain: Key PKGBUILD fields" in cp.stderr
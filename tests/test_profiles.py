@@ -3,6 +3,8 @@ import os
 import subprocess
 from pathlib import Path
 
+import profiles
+
 
 def run(cmd, cwd, env=None):
     return subprocess.run(
@@ -105,3 +107,88 @@ def test_no_summary_on_dry_run(tmp_path: Path):
     assert "[aur-init]" not in cp.stderr
     # Dry-run still prints content to stdout; ensure command succeeded
     assert cp.stdout
+
+
+def test_profile_cache_hit_skips_parsing(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "cfg"))
+    cfg = tmp_path / "cfg/aur-init/config.json"
+    cfg.parent.mkdir(parents=True)
+    cfg.write_text(json.dumps({"license": "GPL"}))
+    assert profiles.load() == (str(cfg), {"license": "GPL", "presets": {}})
+    assert Path(profiles.cache_path()).is_file()
+
+    monkeypatch.setattr(profiles, "_parse", lambda p: (_ for _ in ()).throw(AssertionError("re-parsed")))
+    assert profiles.load()[1]["license"] == "GPL"
+    monkeypatch.undo()
+
+    # A higher-priority candidate appearing changes the directory mtime
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "cfg"))
+    toml = cfg.with_name("config.toml")
+    toml.write_text('license = "BSD"\n')
+    os.utime(cfg.parent, ns=(10**18, 10**18))
+    assert profiles.load() == (str(toml), {"license": "BSD", "presets": {}})
+    # Editing the profile in place changes its size/mtime
+    toml.write_text('license = "Apache-2.0"\n')
+    assert profiles.load()[1]["license"] == "Apache-2.0"
+
+
+def test_absent_profile_cached_by_directory_mtime(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "cfg"))
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "cfg/aur-init").mkdir(parents=True)
+    assert profiles.load() == (None, {})
+    isfile = []
+    monkeypatch.setattr(profiles.os.path, "isfile", lambda p: isfile.append(p) or False)
+    assert profiles.load() == (None, {})
+    assert isfile == []
+
+
+def test_relative_from_file_resolved_per_cwd(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    (a / "prof.json").write_text(json.dumps({"license": "GPL"}))
+    monkeypatch.chdir(a)
+    assert profiles.load("prof.json") == (str(a / "prof.json"), {"license": "GPL", "presets": {}})
+    # Same string, other directory: not the cached entry of a/prof.json
+    monkeypatch.chdir(b)
+    assert profiles.load("prof.json") == (None, {})
+    # A missing explicit profile is not remembered as absent
+    (b / "prof.json").write_text(json.dumps({"license": "BSD"}))
+    assert profiles.load("prof.json") == (str(b / "prof.json"), {"license": "BSD", "presets": {}})
+
+
+def test_presets_resolved_with_inheritance(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    cfg = tmp_path / "p.toml"
+    cfg.write_text(
+        'license = "MIT"\n'
+        "[rust]\nrust_lock = false\n"
+        '[presets.cli]\ntype = "rust"\nwith_man = true\n'
+        '[presets.full]\ninherit = "cli"\ngen_srcinfo = true\n[presets.full.rust]\nrust_lock = true\n'
+        '[presets.loop]\ninherit = "loop"\n'
+    )
+    path, settings = profiles.load(str(cfg))
+    assert "cycle" in capsys.readouterr().err
+    full = profiles.select(settings, "full")
+    assert full == {"license": "MIT", "type": "rust", "with_man": True, "gen_srcinfo": True, "rust": {"rust_lock": True}}
+    assert profiles.select(settings, None) == {"license": "MIT", "rust": {"rust_lock": False}}
+    assert profiles.select(settings, "loop") is None
+    assert "Unknown preset 'loop'" in capsys.readouterr().err
+
+
+def test_preset_flag_end_to_end(tmp_path: Path):
+    root = Path(__file__).resolve().parents[1]
+    cfg = tmp_path / "p.toml"
+    cfg.write_text('[presets.go]\ntype = "go"\ngen_srcinfo = true\n')
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "cache"))
+    cp = run([str(root / "aur-init"), "--from-file", str(cfg), "--preset", "go", "pp"], cwd=tmp_path, env=env)
+    assert "type=go" in cp.stderr and "srcinfo" in cp.stderr
+    assert (tmp_path / "pp/.SRCINFO").is_file()
+    bad = subprocess.run([str(root / "aur-init"), "--from-file", str(cfg), "--preset", "nope", "pq"],
+                         cwd=tmp_path, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    assert bad.returncode == 2 and "Unknown preset 'nope'" in bad.stderr
@@ -5,6 +5,12 @@ import render
 def test_join_single_quoted():
     assert render.join_single_quoted(["a", "b"]) == "'a' 'b'"
     assert render.join_single_quoted([]) == ""
+    assert render.join_single_quoted(["it's"]) == "'it'\\''s'"
+
+
+def test_escape_double_quoted():
+    assert render.escape_double_quoted('Tool for $HOME and "quotes"') == 'Tool for \\$HOME and \\"quotes\\"'
+    assert render.escape_double_quoted("`id` \\n") == "\\`id\\` \\\\n"
 
 
 def test_compute_arch_line():
@@ -29,3 +35,32 @@ def test_render_template(tmp_path: Path):
     t.write_text("Hello @NAME@ @NUM@!")
     out = render.render_template(t, {"NAME": "World", "NUM": "42"})
     assert out == "Hello World 42!"
+
+
+def test_render_template_single_pass_does_not_rescan_values(tmp_path: Path):
+    t = tmp_path / "tmpl.txt"
+    t.write_text("@A@ @B@")
+    # A value that looks like a placeholder must not be substituted again
+    assert render.render_template(t, {"A": "@B@", "B": "x"}) == "@B@ x"
+
+
+def test_load_template_cached_until_file_changes(tmp_path: Path, monkeypatch):
+    t = tmp_path / "tmpl.txt"
+    t.write_text("v1 @X@")
+    first = render.load_template(t)
+    assert render.load_template(t) is first
+    t.write_text("version2 @X@")
+    second = render.load_template(t)
+    assert second is not first
+    assert second.render({"X": "!"}) == "version2 !"
+
+
+def test_render_template_warns_unknown_and_unused_once(tmp_path: Path, capsys):
+    t = tmp_path / "tmpl.txt"
+    t.write_text("a @KNOWN@ b @MISSING@")
+    for _ in range(3):
+        out = render.render_template(t, {"KNOWN": "k", "EXTRA": "e"})
+    assert out == "a k b @MISSING@"
+    err = capsys.readouterr().err
+    assert err.count("placeholder @MISSING@ has no value") == 1
+    assert err.count("value for EXTRA is not used") == 1
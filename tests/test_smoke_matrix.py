@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts/smoke/matrix.py"
+
+
+def test_matrix_subset_passes(tmp_path: Path):
+    out = tmp_path / "out"
+    cp = subprocess.run([sys.executable, str(SCRIPT), "-k", "python-git", "-j", "2", "--out", str(out)],
+                        capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stdout + cp.stderr
+    assert "32/32 cases ok" in cp.stdout
+    assert (out / "python-git-tests-man-compl-ci-srcinfo/smoke-python/.SRCINFO").is_file()
+
+
+def test_matrix_reports_unknown_filter(tmp_path: Path):
+    cp = subprocess.run([sys.executable, str(SCRIPT), "-k", "nope", "--out", str(tmp_path)], capture_output=True, text=True)
+    assert cp.returncode == 2
+
+
+def test_matrix_refuses_a_used_out_dir(tmp_path: Path):
+    out = tmp_path / "out"
+    argv = [sys.executable, str(SCRIPT), "-k", "cmake-local-tests-man-compl-ci-srcinfo", "--out", str(out)]
+    assert subprocess.run(argv, capture_output=True, text=True).returncode == 0
+    cp = subprocess.run(argv, capture_output=True, text=True)
+    assert cp.returncode == 2
+    assert "is not empty; pass a new or empty --out directory" in cp.stderr
+    assert "Traceback" not in cp.stderr
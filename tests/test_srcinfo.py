@@ -0,0 +1,218 @@
+import io
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import core
+import executables
+import srcinfo
+from test_core import _args
+
+
+def test_render_srcinfo_field_order_and_sections():
+    out = srcinfo.render_srcinfo(
+        "p",
+        {
+            "sha256sums": ["SKIP"],
+            "source": ["main.go"],
+            "depends": [],
+            "makedepends": ["go"],
+            "license": ["MIT"],
+            "arch": ["x86_64"],
+            "url": "https://example.com/p",
+            "pkgrel": "1",
+            "pkgver": "0.3.0",
+            "pkgdesc": "desc",
+        },
+    )
+    assert out == (
+        "pkgbase = p\n"
+        "\tpkgdesc = desc\n"
+        "\tpkgver = 0.3.0\n"
+        "\tpkgrel = 1\n"
+        "\turl = https://example.com/p\n"
+        "\tarch = x86_64\n"
+        "\tlicense = MIT\n"
+        "\tmakedepends = go\n"
+        "\tsource = main.go\n"
+        "\tsha256sums = SKIP\n"
+        "\n"
+        "pkgname = p\n"
+        "\n"
+    )
+
+
+def test_diff_srcinfo():
+    assert srcinfo.diff_srcinfo("a\n", "a\n") == ""
+    d = srcinfo.diff_srcinfo("a\nb\n", "a\nc\n")
+    assert "-c" in d and "+b" in d
+
+
+def test_dry_run_prints_native_srcinfo_without_makepkg(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(executables, "_FAKE", {})
+    cap = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", cap)
+    rc = core.execute(_args(pkgname="p", type="rust", vcs="git", vcs_url="https://x.git", gen_srcinfo=True))
+    assert rc == 0
+    out = cap.getvalue()
+    assert "# .SRCINFO\npkgbase = p\n" in out
+    assert "\tsource = p::git+https://x.git\n" in out
+    assert "\tmakedepends = rust\n\tmakedepends = cargo\n" in out
+
+
+def test_execute_writes_srcinfo(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    rc = core.execute(_args(pkgname="p", type="python", dry_run=False, gen_srcinfo=True))
+    assert rc == 0
+    text = (tmp_path / "p/.SRCINFO").read_text()
+    assert "\tdepends = python\n" in text
+    assert "\tsource = bin/p\n\tsource = src/p/main.py\n" in text
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash not available")
+def test_pkgbuild_values_read_back_like_the_native_srcinfo(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    desc = 'Tool for $HOME and "quotes", `id` and a \\ backslash'
+    rc = core.execute(_args(pkgname="p", description=desc, url="https://x.org/?a=$b", license="Custom's",
+                            dry_run=False, gen_srcinfo=True))
+    assert rc == 0
+    # Source the PKGBUILD the way makepkg does and print what bash sees
+    cp = subprocess.run(["bash", "-c", 'source PKGBUILD; printf "%s\\n" "$pkgdesc" "$url" "${license[@]}"'],
+                        cwd=tmp_path / "p", capture_output=True, text=True, check=True)
+    assert cp.stdout.splitlines() == [desc, "https://x.org/?a=$b", "Custom's"]
+    text = (tmp_path / "p/.SRCINFO").read_text()
+    assert f"\tpkgdesc = {desc}\n" in text
+    assert "\turl = https://x.org/?a=$b\n" in text and "\tlicense = Custom's\n" in text
+
+
+@pytest.mark.skipif(shutil.which("makepkg") is None, reason="makepkg not available")
+@pytest.mark.parametrize("t", ["", "python", "node", "go", "cmake", "rust"])
+@pytest.mark.parametrize("vcs", ["", "git"])
+def test_native_matches_makepkg(tmp_path: Path, monkeypatch, t, vcs):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    err = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", err)
+    args = _args(pkgname="p", type=t, vcs=vcs, vcs_url="https://x.git" if vcs else "",
+                 with_tests=True, gen_srcinfo=True, verify_srcinfo=True)
+    assert core.execute(args) == 0, err.getvalue()
+
+
+@pytest.mark.parametrize("t", ["", "python", "node", "go", "cmake", "rust"])
+@pytest.mark.parametrize("vcs", ["", "git"])
+def test_native_srcinfo_reads_back_generated_pkgbuilds(tmp_path: Path, monkeypatch, t, vcs):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    args = _args(pkgname="p", type=t, vcs=vcs, vcs_url="https://x.git" if vcs else "",
+                 with_tests=True, dry_run=False, gen_srcinfo=True)
+    assert core.execute(args) == 0
+    text = (tmp_path / "p/PKGBUILD").read_text()
+    assert srcinfo.native_srcinfo(text) == (tmp_path / "p/.SRCINFO").read_text()
+
+
+@pytest.mark.parametrize("extra", [
+    "pkgver=$(date +%Y)\n",
+    "pkgdesc=\"a \\\"quoted\\\" word\"\n",
+    "url=\"https://x/$_unset\"\n",
+    "source_x86_64=('a')\n",
+    "pkgbase=base\n",
+    "package_p() {\n  :\n}\n",
+    "[[ $CARCH == x86_64 ]] && depends+=('b')\n",
+    "pkgrel+=1\n",
+])
+def test_native_srcinfo_leaves_dynamic_pkgbuilds_to_makepkg(extra):
+    base = "pkgname=p\npkgver=1\npkgrel=1\narch=('any')\n"
+    assert srcinfo.native_srcinfo(base) is not None
+    assert srcinfo.native_srcinfo(base + extra) is None
+    assert srcinfo.native_srcinfo("pkgname=p\npkgver=1\n") is None
+
+
+def _fake_makepkg(tmp_path: Path) -> tuple[str, Path]:
+    """A makepkg that prints its PKGBUILD as .SRCINFO and logs every run."""
+    log = tmp_path / "makepkg.log"
+    script = tmp_path / "makepkg"
+    script.write_text(f'#!/bin/sh\necho "$PWD" >> {log}\nprintf "pkgbase = x\\n"\ncat PKGBUILD\n')
+    script.chmod(0o755)
+    return str(script), log
+
+
+def _runs(log: Path) -> int:
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_find_package_dirs_skips_build_and_hidden_dirs(tmp_path: Path):
+    for d in ("a", "b/c", "a/src/inner", ".git/x"):
+        (tmp_path / d).mkdir(parents=True)
+        (tmp_path / d / "PKGBUILD").write_text("")
+    assert srcinfo.find_package_dirs(tmp_path) == [tmp_path / "a", tmp_path / "b/c"]
+
+
+def test_srcinfo_all_regenerates_only_changed_packages(tmp_path: Path, monkeypatch, capsys):
+    import aur_init
+
+    makepkg, log = _fake_makepkg(tmp_path)
+    monkeypatch.setattr(executables, "_FAKE", {"makepkg": makepkg})
+    root = tmp_path / "repo"
+    for name in ("one", "two", "three"):
+        (root / name).mkdir(parents=True)
+        (root / name / "PKGBUILD").write_text(f"pkgname={name}\n")
+
+    assert aur_init.main(["srcinfo", "--all", str(root), "--jobs", "2"]) == 0
+    assert (root / "two/.SRCINFO").read_text() == "pkgbase = x\npkgname=two\n"
+    assert _runs(log) == 3
+
+    # Nothing changed: no makepkg run at all
+    assert aur_init.main(["srcinfo", "--all", str(root), "--check"]) == 0
+    assert _runs(log) == 3
+
+    (root / "two/PKGBUILD").write_text("pkgname=two\npkgrel=2\n")
+    assert aur_init.main(["srcinfo", "--all", str(root), "--check"]) == 1
+    assert _runs(log) == 4
+    assert f"stale {root / 'two/.SRCINFO'}" in capsys.readouterr().out
+    assert "pkgrel" not in (root / "two/.SRCINFO").read_text()
+
+    assert aur_init.main(["srcinfo", "--all", str(root)]) == 0
+    assert "pkgrel=2" in (root / "two/.SRCINFO").read_text()
+    assert _runs(log) == 5
+    assert aur_init.main(["srcinfo", "--all", str(root), "--check"]) == 0
+    assert _runs(log) == 5
+
+
+def test_srcinfo_subcommand_errors(tmp_path: Path, monkeypatch):
+    import aur_init
+
+    assert aur_init.main(["srcinfo", str(tmp_path)]) == 1
+    (tmp_path / "PKGBUILD").write_text("")
+    monkeypatch.setattr(executables, "_FAKE", {})
+    assert aur_init.main(["srcinfo", str(tmp_path)]) == 1
+
+
+def test_srcinfo_subcommand_renders_natively_and_checks_against_makepkg(tmp_path: Path, monkeypatch, capsys):
+    import aur_init
+
+    monkeypatch.chdir(tmp_path)
+    assert core.execute(_args(pkgname="p", type="go", dry_run=False, gen_srcinfo=True)) == 0
+    pkg = tmp_path / "p"
+    expected = (pkg / ".SRCINFO").read_text()
+    (pkg / ".SRCINFO").unlink()
+
+    monkeypatch.setattr(executables, "_FAKE", {})
+    assert aur_init.main(["srcinfo", "--no-cache", str(pkg)]) == 0
+    assert (pkg / ".SRCINFO").read_text() == expected
+
+    # --check asks makepkg, whose (fake) output differs from the native rendering
+    makepkg, log = _fake_makepkg(tmp_path)
+    monkeypatch.setattr(executables, "_FAKE", {"makepkg": makepkg})
+    capsys.readouterr()
+    assert aur_init.main(["srcinfo", "--no-cache", "--check", str(pkg)]) == 1
+    assert _runs(log) == 1
+    assert f"stale {pkg / '.SRCINFO'}" in capsys.readouterr().out
+    assert aur_init.main(["srcinfo", "--no-cache", str(pkg)]) == 0
+    assert _runs(log) == 1
@@ -0,0 +1,93 @@
+import os
+import stat
+from pathlib import Path
+
+import core
+import scaffold
+import staging
+from test_core import _args
+
+
+def _mode(p: Path) -> int:
+    return stat.S_IMODE(p.stat().st_mode)
+
+
+def test_stage_publishes_with_modes(tmp_path: Path):
+    target = tmp_path / "pkg"
+    with staging.Stage(target) as stage:
+        stage.write("bin/tool", "#!/bin/sh\n", 0o755)
+        stage.write("PKGBUILD", b"pkgname=pkg\n", 0o600)
+        stage.dir_fd("empty/dir")
+        assert not target.exists()
+        stage.publish()
+    assert (target / "bin/tool").read_text() == "#!/bin/sh\n"
+    assert _mode(target / "bin/tool") == 0o755
+    assert _mode(target / "PKGBUILD") == 0o600
+    assert (target / "empty/dir").is_dir()
+    assert _mode(target) == 0o777 & ~staging.umask()
+    assert [p.name for p in tmp_path.iterdir()] == ["pkg"]
+
+
+def test_stage_discarded_on_error(tmp_path: Path):
+    target = tmp_path / "pkg"
+    try:
+        with staging.Stage(target) as stage:
+            stage.write("a.txt", "x")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_publish_merges_into_non_empty_target(tmp_path: Path):
+    target = tmp_path / "pkg"
+    (target / "src").mkdir(parents=True)
+    (target / "keep.txt").write_text("mine")
+    (target / "src/old.rs").write_text("old")
+    (target / "PKGBUILD").write_text("old")
+    with staging.Stage(target) as stage:
+        stage.write("PKGBUILD", "new")
+        stage.write("src/main.rs", "fn main() {}")
+        stage.publish()
+    assert (target / "PKGBUILD").read_text() == "new"
+    assert (target / "keep.txt").read_text() == "mine"
+    assert sorted(p.name for p in (target / "src").iterdir()) == ["main.rs", "old.rs"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pkg"]
+
+
+def test_publish_never_merges_a_staged_git_dir(tmp_path: Path):
+    target = tmp_path / "pkg"
+    (target / ".git/refs/heads").mkdir(parents=True)
+    (target / ".git/HEAD").write_text("ref: refs/heads/mine\n")
+    (target / ".git/refs/heads/mine").write_text("abc\n")
+    with staging.Stage(target) as stage:
+        stage.write("PKGBUILD", "new")
+        stage.write(".git/HEAD", "ref: refs/heads/main\n")
+        stage.write(".git/refs/heads/main", "def\n")
+        stage.publish()
+    assert (target / "PKGBUILD").read_text() == "new"
+    assert (target / ".git/HEAD").read_text() == "ref: refs/heads/mine\n"
+    assert sorted(p.name for p in (target / ".git/refs/heads").iterdir()) == ["mine"]
+
+
+def test_execute_failure_leaves_nothing(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Strict mode fails after the project has been scaffolded into the stage
+    rc = core.execute(_args(pkgname="half", type="python", license="", dry_run=False))
+    assert rc == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_execute_dry_run_writes_nothing(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert core.execute(_args(pkgname="dry", type="go")) == 0
+    assert "pkgname=dry" in capsys.readouterr().out
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_file_outside_stage_creates_with_mode(tmp_path: Path):
+    p = tmp_path / "x/y.sh"
+    scaffold.write_file(p, "echo", 0o750)
+    assert p.read_text() == "echo"
+    assert _mode(p) == 0o750
+    assert os.path.isdir(tmp_path / "x")
@@ -0,0 +1,116 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import aur_init
+import startup
+
+ROOT = Path(__file__).resolve().parents[1]
+ENTRY = ROOT / "lib" / "aur_init.py"
+
+# Cold-start budget for `aur-init -h`, in ms over a bare `python -c pass`.
+# Measured at ~20 ms after lazy imports (was ~38 ms); the slack absorbs CI noise.
+HELP_OVERHEAD_BUDGET_MS = 60
+
+HEAVY_MODULES = {"core", "render", "scaffold", "features", "interactive", "srcinfo", "subprocess", "pathlib"}
+
+
+def _imported_modules(argv):
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import aur_init\n"
+        "try:\n    aur_init.main(sys.argv[2:])\nexcept SystemExit:\n    pass\n"
+        "sys.stdout = sys.__stdout__; print(' '.join(sorted(sys.modules)))\n"
+    )
+    cp = subprocess.run(
+        [sys.executable, "-c", code, str(ENTRY.parent), *argv],
+        check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    return set(cp.stdout.strip().splitlines()[-1].split())
+
+
+def test_help_imports_no_heavy_modules():
+    mods = _imported_modules(["-h"])
+    assert "cli" in mods
+    assert not (HEAVY_MODULES & mods), sorted(HEAVY_MODULES & mods)
+
+
+def test_doctor_skips_scaffolding_modules():
+    mods = _imported_modules(["--doctor"])
+    assert "features" in mods
+    assert not ({"core", "interactive", "srcinfo", "batch", "checksums"} & mods)
+
+
+def test_help_cold_start_budget():
+    bare = startup.measure_wall_ms([sys.executable, "-c", "pass"], runs=5)
+    wall = startup.measure_wall_ms([sys.executable, str(ENTRY), "-h"], runs=5)
+    assert wall - bare < HELP_OVERHEAD_BUDGET_MS, f"-h took {wall:.1f} ms (interpreter {bare:.1f} ms)"
+
+
+def test_parse_importtime():
+    rows = startup.parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      2000 |       5000 | cli\n"
+        "unrelated line\n"
+    )
+    assert rows == [("_io", 120, 120), ("cli", 2000, 5000)]
+
+
+def test_startup_report_via_main(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    monkeypatch.setattr(startup, "measure_wall_ms", lambda cmd, runs=5: 1.0)
+    rc = aur_init.main(["--startup-report", "-h"])
+    assert rc == 0
+    text = out.getvalue()
+    assert "aur-init start-up report: aur-init -h" in text
+    assert "cli  *" in text
+
+
+def test_startup_report_never_writes(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert startup.startup_report(["-t", "go", "reported"], runs=1) == 0
+    assert "aur-init start-up report: aur-init -t go reported --dry-run" in capsys.readouterr().out
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_startup_report_fails_on_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert startup.startup_report(["-t", "no-such-type", "x"], runs=1) == 1
+    captured = capsys.readouterr()
+    assert "exited with status 2; no report" in captured.err
+    assert "start-up report" not in captured.out
+
+
+def test_startup_report_fails_when_a_timed_run_fails(monkeypatch, capsys):
+    def flaky(cmd, runs=5):
+        raise subprocess.CalledProcessError(3, cmd)
+
+    monkeypatch.setattr(startup, "measure_wall_ms", flaky)
+    assert startup.startup_report(["-h"]) == 1
+    assert "exited with status 3; no report" in capsys.readouterr().err
+
+
+def test_startup_report_argv_for_subcommands(capsys):
+    assert startup.report_argv(["lint", "."]) == ["lint", "."]
+    assert startup.report_argv(["srcinfo", "--check"]) == ["srcinfo", "--check"]
+    assert startup.report_argv(["batch", "-h"]) == ["batch", "-h"]
+    assert startup.report_argv(["-t", "go", "x", "--output-tar=-"]) == ["-t", "go", "x", "--output-tar=-"]
+    assert startup.report_argv(["lint"]) == ["lint"]
+    assert startup.report_argv(["srcinfo", "."]) is None
+    assert "profile `aur-init srcinfo` with -h, --check" in capsys.readouterr().err
+    assert startup.report_argv(["updpkgsums"]) is None
+    assert "with -h" in capsys.readouterr().err
+
+
+def test_startup_report_profiles_a_subcommand(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert aur_init.main(["-t", "go", "-d", "Linted", "-u", "https://example.org/linted", "linted"]) == 0
+    before = sorted(p.name for p in (tmp_path / "linted").iterdir())
+    capsys.readouterr()
+    assert aur_init.main(["--startup-report", "lint", "linted"]) == 0
+    out = capsys.readouterr().out
+    assert "aur-init start-up report: aur-init lint linted\n" in out
+    assert "lint  *" in out
+    assert sorted(p.name for p in (tmp_path / "linted").iterdir()) == before
@@ -0,0 +1,100 @@
+import io
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import core
+import executables
+import steps
+from test_core import _args
+
+
+def test_independent_steps_overlap_and_order_is_kept():
+    log = []
+    lock = threading.Lock()
+
+    def work(name, delay):
+        def run(timeout):
+            time.sleep(delay)
+            with lock:
+                log.append(name)
+        return run
+
+    graph = [
+        steps.Step("commit", work("commit", 0), after=("init", "lock")),
+        steps.Step("lock", work("lock", 0.2)),
+        steps.Step("init", work("init", 0.2)),
+    ]
+    start = time.perf_counter()
+    assert steps.run_steps(graph) == []
+    assert time.perf_counter() - start < 0.35
+    assert log[-1] == "commit" and sorted(log[:2]) == ["init", "lock"]
+
+
+def test_failures_are_collected_and_dependents_skipped():
+    def boom(timeout):
+        subprocess.run([sys.executable, "-c", "import sys; sys.exit('bad lock')"], check=True, stderr=subprocess.PIPE)
+
+    def slow(timeout):
+        subprocess.run([sys.executable, "-c", "import time; time.sleep(5)"], check=True, timeout=timeout)
+
+    ran = []
+    graph = [
+        steps.Step("lock", boom),
+        steps.Step("slow", slow, timeout=0.2),
+        steps.Step("commit", lambda t: ran.append("commit"), after=("slow",)),
+        steps.Step("other", lambda t: ran.append("other")),
+    ]
+    failures = dict(steps.run_steps(graph))
+    assert failures == {
+        "lock": "exit status 1: bad lock",
+        "slow": "timed out after 0.2s",
+        "commit": "skipped: slow failed",
+    }
+    assert ran == ["other"]
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        steps.run_steps([steps.Step("a", lambda t: None, after=("b",))])
+
+
+def test_execute_reports_failed_post_steps(tmp_path: Path, monkeypatch, capsys):
+    cargo = tmp_path / "cargo"
+    cargo.write_text("#!/bin/sh\necho 'no registry' >&2\nexit 101\n")
+    cargo.chmod(0o755)
+    monkeypatch.setattr(executables, "_FAKE", {"cargo": str(cargo)})
+    monkeypatch.chdir(tmp_path)
+    rc = core.execute(_args(pkgname="r", type="rust", rust_lock=True, dry_run=False))
+    assert rc == 1
+    err = capsys.readouterr().err
+    assert "Post-scaffold step rust-lock failed: exit status 101: no registry" in err
+    assert (tmp_path / "r/PKGBUILD").is_file()  # the project is still published
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_force_git_init_keeps_existing_history(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert core.execute(_args(pkgname="g", git_init=True, dry_run=False)) == 0
+    repo = tmp_path / "g"
+
+    def git(*a):
+        return subprocess.run(["git", "-c", "user.name=U", "-c", "user.email=u@x", *a], cwd=repo, check=True,
+                              stdout=subprocess.PIPE, text=True).stdout
+
+    (repo / "notes.txt").write_text("mine\n")
+    git("add", "notes.txt")
+    git("commit", "-q", "-m", "user work")
+    before = git("log", "--format=%H %s")
+    capsys.readouterr()
+    assert core.execute(_args(pkgname="g", git_init=True, force=True, dry_run=False)) == 0
+    assert "g/ is already a git repository; skipping repo initialization" in capsys.readouterr().err
+    assert git("log", "--format=%H %s") == before
+    assert before.splitlines()[0].endswith(" user work") and len(before.splitlines()) == 2
+    assert (repo / "notes.txt").read_text() == "mine\n"
+    git("fsck", "--full")
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import core
+import timings
+from test_core import _args
+
+
+def test_phases_and_counters_only_recorded_when_active():
+    with timings.phase("ignored"):
+        timings.count("ignored")
+    with timings.recording() as rec:
+        with timings.phase("outer"):
+            with timings.phase("inner"):
+                timings.count("files_written", 2)
+    assert [e[0] for e in rec.events] == ["inner", "outer"]
+    assert [e[3] for e in rec.events] == [1, 0]
+    assert rec.counters == {"files_written": 2}
+    assert timings._ACTIVE is None
+
+
+def test_traced_keeps_name_and_records_calls():
+    @timings.traced
+    def work(x):
+        """doc"""
+        return x * 2
+
+    assert work.__name__ == "work" and work.__doc__ == "doc"
+    assert work(2) == 4
+    with timings.recording() as rec:
+        work(3)
+    assert rec.events[0][0].endswith(".work")
+
+
+def test_summary_table(capsys):
+    with timings.recording() as rec:
+        with rec.phase("render"):
+            rec.count("subprocesses")
+    rec.summary()
+    err = capsys.readouterr().err
+    assert "aur-init timings:" in err
+    assert "render" in err
+    assert "subprocesses=1" in err
+
+
+def test_execute_writes_trace_and_timings(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    trace = tmp_path / "trace.json"
+    rc = core.execute(_args(pkgname="tp", type="go", dry_run=False, gen_srcinfo=True, timings=True, trace=str(trace)))
+    assert rc == 0
+    err = capsys.readouterr().err
+    for name in ("core.execute", "validate", "scaffold", "render", "checksums", "write", "features"):
+        assert name in err
+    data = json.loads(trace.read_text())
+    events = data["traceEvents"]
+    names = {e["name"] for e in events if e["ph"] == "X"}
+    assert {"core.execute", "render", "scaffold.scaffold_template", "features.maybe_gen_srcinfo"} <= names
+    assert all(e["dur"] >= 0 for e in events if e["ph"] == "X")
+    counters = [e["args"] for e in events if e["ph"] == "C"]
+    assert counters[-1]["files_written"] >= 3
+    assert counters[-1]["dirs_created"] >= 1
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import core
+import typedefs
+from test_core import _args
+
+ZIG = """
+description = "Zig program"
+arch = ["x86_64", "aarch64"]
+makedepends = ["zig"]
+sources = ["build.zig", "src/@PKGNAME@.zig"]
+build = ['  cd "$srcdir"; zig build -Doptimize=ReleaseSafe']
+package = ['  install -Dm755 "$srcdir/zig-out/bin/$pkgname" "$pkgdir/usr/bin/$pkgname"']
+
+[[files]]
+path = "build.zig"
+content = '''
+// build script for @PKGNAME@
+'''
+
+[[files]]
+path = "src/@PKGNAME@.zig"
+mode = 0o600
+content = '''
+pub fn main() void {}
+'''
+"""
+
+
+@pytest.fixture
+def zig_dir(tmp_path: Path, monkeypatch):
+    d = tmp_path / "types"
+    d.mkdir()
+    (d / "zig.toml").write_text(ZIG)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(typedefs, "_REGISTRIES", {})
+    return d
+
+
+def test_builtin_types_registered():
+    reg = typedefs.load_registry()
+    assert set(typedefs.type_names()) == set(reg)
+    assert typedefs.type_names()[:6] == ["", "python", "node", "go", "cmake", "rust"]
+    assert reg["go"].arch == ["x86_64"] and reg[""].arch == ["any"]
+    assert reg["python"].local_sources("x") == ["bin/x", "src/x/main.py"]
+    assert sorted(n for n, t in reg.items() if t.require_depends) == ["node", "python"]
+    assert [n for n, t in reg.items() if t.lockfile] == ["rust"]
+    with pytest.raises(KeyError):
+        typedefs.get_type("cobol")
+
+
+def test_new_type_without_code_changes(zig_dir: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(typedefs, "types_dir", lambda: str(zig_dir))
+    monkeypatch.chdir(tmp_path)
+    rc, files = core.build_plan(_args(pkgname="zz", type="zig", gen_srcinfo=True))
+    assert rc == 0
+    assert files.text("build.zig") == "// build script for zz\n"
+    assert files.files["src/zz.zig"][1] == 0o600
+    pkgbuild = files.text("PKGBUILD")
+    assert "arch=('x86_64' 'aarch64')" in pkgbuild
+    assert "makedepends=('zig')" in pkgbuild
+    assert "zig build" in pkgbuild and "zig-out/bin" in pkgbuild
+    assert files.sha256("src/zz.zig") in pkgbuild
+
+
+def test_type_behaviour_comes_from_the_type_file(zig_dir: Path, tmp_path: Path, monkeypatch, capsys):
+    (zig_dir / "zig.toml").write_text('require_depends = true\nlockfile = "cargo"\n' + ZIG)
+    monkeypatch.setattr(typedefs, "types_dir", lambda: str(zig_dir))
+    monkeypatch.chdir(tmp_path)
+    rc, _ = core.build_plan(_args(pkgname="zz", type="zig", strict=True))
+    assert rc == 2
+    assert "missing required metadata: depends" in capsys.readouterr().err
+    names = [s.name for s in core.post_steps(_args(pkgname="zz", type="zig", rust_lock=True), tmp_path, None)]
+    assert names == ["rust-lock"]
+    assert core.post_steps(_args(pkgname="zz", type="", rust_lock=True), tmp_path, None) == []
+
+
+def test_snapshot_reused_and_invalidated(zig_dir: Path, monkeypatch):
+    reg = typedefs.load_registry(str(zig_dir))
+    snap = typedefs.snapshot_path(str(zig_dir))
+    assert os.path.exists(snap)
+    # A fresh process (empty in-memory cache) loads the snapshot without parsing TOML
+    monkeypatch.setattr(typedefs, "_REGISTRIES", {})
+    monkeypatch.setattr(typedefs, "_parse", lambda *a: pytest.fail("TOML parsed despite snapshot"))
+    again = typedefs.load_registry(str(zig_dir))
+    assert again["zig"].render_files("a") == reg["zig"].render_files("a")
+    monkeypatch.undo()
+    # Editing a type file changes the fingerprint and triggers a re-parse
+    monkeypatch.setenv("XDG_CACHE_HOME", str(zig_dir.parent / "cache"))
+    (zig_dir / "zig.toml").write_text(ZIG.replace('"zig"]', '"zig", "git"]'))
+    os.utime(zig_dir / "zig.toml", ns=(1, 1))
+    assert typedefs.load_registry(str(zig_dir))["zig"].makedepends == ["zig", "git"]
+
+
+def test_broken_type_file_is_skipped(zig_dir: Path, capsys):
+    (zig_dir / "bad.toml").write_text('arch = "any"\n')
+    (zig_dir / "typo.toml").write_text('archs = ["any"]\n')
+    (zig_dir / "lock.toml").write_text('lockfile = "npm"\n')
+    reg = typedefs.load_registry(str(zig_dir))
+    assert "zig" in reg and "bad" not in reg and "typo" not in reg
+    err = capsys.readouterr().err
+    assert "bad.toml: arch must be a list of strings" in err
+    assert "typo.toml: unknown key(s): archs" in err
+    assert "lock.toml: lockfile must be one of: cargo" in err
+    assert not os.path.exists(typedefs.snapshot_path(str(zig_dir)))
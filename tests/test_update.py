@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+
+import core
+import update
+from test_core import _args
+
+
+def _generate(tmp_path, monkeypatch, **kw):
+    monkeypatch.chdir(tmp_path)
+    base = dict(pkgname="up", type="python", dry_run=False)
+    base.update(kw)
+    return core.execute(_args(**base))
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+def test_merge3_takes_non_overlapping_edits_from_both_sides():
+    base = _lines("a\nb\nc\nd\n")
+    local = _lines("a\nB\nc\nd\n")
+    new = _lines("a\nb\nc\nD\n")
+    assert update.merge3(base, local, new) == (_lines("a\nB\nc\nD\n"), 0)
+
+
+def test_merge3_marks_overlapping_edits():
+    merged, conflicts = update.merge3(_lines("x\n"), _lines("mine\n"), _lines("theirs"))
+    assert conflicts == 1
+    assert "".join(merged) == "<<<<<<< local\nmine\n||||||| base\nx\n=======\ntheirs\n>>>>>>> aur-init\n"
+
+
+def test_resolve_without_base_uses_common_lines():
+    status, data = update.resolve("f", b"a\nnew\nc\n", b"a\nold\nc\nlocal\n", None)
+    assert status == "conflict"
+    assert data == b"a\n<<<<<<< local\nold\n=======\nnew\n>>>>>>> aur-init\nc\nlocal\n"
+
+
+def test_update_rewrites_only_changed_files(tmp_path: Path, monkeypatch, capsys):
+    assert _generate(tmp_path, monkeypatch, description="first") == 0
+    root = tmp_path / "up"
+    old = {p: os.stat(p).st_mtime_ns for p in root.rglob("*") if p.is_file()}
+    for p in old:
+        os.utime(p, ns=(0, 0))
+    capsys.readouterr()
+
+    assert _generate(tmp_path, monkeypatch, description="second", update=True) == 0
+    out = capsys.readouterr().out
+    assert "changed   up/PKGBUILD" in out
+    assert "0 added, 1 changed, 0 merged, 0 conflict, 0 kept" in out
+    assert 'pkgdesc="second"' in (root / "PKGBUILD").read_text()
+    touched = [p.relative_to(root).as_posix() for p in old if os.stat(p).st_mtime_ns != 0]
+    assert touched == ["PKGBUILD"]
+
+
+def test_update_keeps_and_merges_local_edits(tmp_path: Path, monkeypatch, capsys):
+    assert _generate(tmp_path, monkeypatch, description="first") == 0
+    root = tmp_path / "up"
+    readme = root / "README.md"
+    readme.write_text(readme.read_text() + "local note\n")
+    pkgbuild = root / "PKGBUILD"
+    pkgbuild.write_text("# local header\n" + pkgbuild.read_text())
+    (root / "bin/up").unlink()
+
+    assert _generate(tmp_path, monkeypatch, description="second", update=True) == 0
+    out = capsys.readouterr().out
+    assert "added     up/bin/up" in out
+    assert "merged    up/PKGBUILD" in out
+    assert "kept      up/README.md" in out
+    text = pkgbuild.read_text()
+    assert text.startswith("# local header\n") and 'pkgdesc="second"' in text
+    assert readme.read_text().endswith("local note\n")
+    assert os.stat(root / "bin/up").st_mode & 0o777 == 0o755
+
+
+def test_update_reports_conflicts(tmp_path: Path, monkeypatch, capsys):
+    assert _generate(tmp_path, monkeypatch, description="first") == 0
+    pkgbuild = tmp_path / "up/PKGBUILD"
+    pkgbuild.write_text(pkgbuild.read_text().replace('pkgdesc="first"', 'pkgdesc="mine"'))
+
+    assert _generate(tmp_path, monkeypatch, description="second", update=True) == 1
+    captured = capsys.readouterr()
+    assert "conflict  up/PKGBUILD" in captured.out
+    assert "PKGBUILD" in captured.err
+    text = pkgbuild.read_text()
+    assert '<<<<<<< local\npkgdesc="mine"\n||||||| base\npkgdesc="first"\n=======\npkgdesc="second"\n>>>>>>> aur-init\n' in text
+
+
+def test_bases_are_pruned_by_age_and_count(tmp_path: Path):
+    d = tmp_path / "base"
+    d.mkdir()
+    for i in range(5):
+        p = d / f"{i}.marshal"
+        p.write_bytes(b"")
+        os.utime(p, (1_000_000 + i, 1_000_000 + i) if i == 0 else (2_000_000_000 + i, 2_000_000_000 + i))
+    update.prune_bases(str(d), 3, 180)
+    # 0 is older than the age limit; of the rest the three newest stay
+    assert sorted(p.name for p in d.iterdir()) == ["2.marshal", "3.marshal", "4.marshal"]
+
+
+def test_record_base_prunes(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(update, "MAX_BASES", 2)
+    for i in range(4):
+        update.record_base(tmp_path / f"p{i}", {"PKGBUILD": (b"x", 0o644)})
+    assert update.load_base(tmp_path / "p3") == {"PKGBUILD": b"x"}
+    assert len(os.listdir(os.path.dirname(update.base_path(tmp_path / "p0")))) == 2
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import zipbuild
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def pyz(tmp_path_factory):
+    out = tmp_path_factory.mktemp("dist") / "aur-init.pyz"
+    zipbuild.build_zipapp(out, interpreter=sys.executable)
+    (out.parent / "templates").symlink_to(ROOT / "templates")
+    return out
+
+
+def _run(pyz, *argv, cwd=None):
+    env = dict(os.environ, AUR_INIT_NO_DAEMON="1")
+    return subprocess.run([str(pyz), *argv], cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def test_archive_holds_every_module_precompiled(pyz):
+    with open(pyz, "rb") as f:
+        assert f.readline() == f"#!{sys.executable}\n".encode()
+    with zipfile.ZipFile(pyz) as zf:
+        names = set(zf.namelist())
+        assert all(i.compress_type == zipfile.ZIP_STORED for i in zf.infolist())
+        header = zf.read("cli.pyc")[:8]
+    modules = {p.stem for p in (ROOT / "lib").glob("*.py")}
+    assert {f"{m}.pyc" for m in modules} | {f"{m}.py" for m in modules} | {"__main__.py", "__main__.pyc"} == names
+    # Unchecked hash-based pyc: flags word == 1 (hash-based, source not checked)
+    assert int.from_bytes(header[4:8], "little") == 1
+    assert os.access(pyz, os.X_OK)
+
+
+def test_zipapp_runs_help_and_dry_run(pyz, tmp_path):
+    cp = _run(pyz, "-h")
+    assert cp.returncode == 0 and cp.stdout.startswith("usage: aur-init")
+    cp = _run(pyz, "--dry-run", "-t", "go", "zipped", cwd=tmp_path)
+    assert cp.returncode == 0, cp.stderr
+    assert "pkgname=zipped" in cp.stdout
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_zipapp_subcommands_and_startup_report(pyz):
+    cp = _run(pyz, "completions", "bash")
+    assert cp.returncode == 0 and "complete -F _aur_init aur-init" in cp.stdout
+    cp = _run(pyz, "--startup-report", "-h")
+    assert cp.returncode == 0, cp.stderr
+    assert "cli  *" in cp.stdout
+
+
+def test_zipapp_falls_back_without_daemon(pyz, tmp_path):
+    sock = tmp_path / "stale.sock"
+    import socket
+
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.bind(str(sock))  # exists but nobody is listening
+    try:
+        env = dict(os.environ, AUR_INIT_SOCKET=str(sock))
+        cp = subprocess.run([str(pyz), "--dry-run", "fallback"], cwd=tmp_path, env=env, capture_output=True, text=True)
+    finally:
+        s.close()
+    assert cp.returncode == 0, cp.stderr
+    assert "pkgname=fallback" in cp.stdout
+
+
+def test_build_script(tmp_path):
+    out = tmp_path / "x.pyz"
+    cp = subprocess.run([sys.executable, str(ROOT / "scripts/dist/build-zipapp.py"), "-o", str(out), "-p", sys.executable],
+                        capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stderr
+    assert cp.stdout.startswith(f"Wrote {out}")
+    assert zipfile.is_zipfile(out)
+    assert not list(tmp_path.glob(".*.tmp"))